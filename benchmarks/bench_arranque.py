@@ -0,0 +1,82 @@
+import sys, os, time, resource, tempfile
+import multiprocessing
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Uso: python bench_arranque.py [numero_de_tareas]
+TAREAS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+FORMATOS = [('json', 'tareas.json'), ('csv', 'tareas.csv'), ('binaria', 'tareas.bin')]
+
+
+def generar(cantidad):
+    from models.tarea import Tarea, EstadoTarea, Prioridad
+    base = datetime(2025, 1, 1)
+    categorias = ['universidad', 'trabajo', 'personal', 'hogar']
+    for i in range(1, cantidad + 1):
+        fecha = base + timedelta(minutes=i)
+        yield Tarea.desde_campos(i, f"Tarea {i}", "Descripcion de prueba", categorias[i % 4],
+                                 fecha if i % 3 else None, EstadoTarea.PENDIENTE, Prioridad.MEDIA,
+                                 fecha, fecha)
+
+
+def memoria_pico_mb():
+    # ru_maxrss se hereda a traves de exec en Linux; VmHWM es solo de este proceso
+    try:
+        with open('/proc/self/status') as f:
+            for linea in f:
+                if linea.startswith('VmHWM:'):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def arrancar(formato, archivo, solo_lectura, cola):
+    # Proceso nuevo: incluye importar el gestor y cargar el archivo; con
+    # solo_lectura se decodifican las tareas sin indexarlas en el almacen
+    inicio = time.perf_counter()
+    from models.gestor_tareas import GestorTareas
+    gestor = GestorTareas()
+    gestor.establecer_persistencia(formato)
+    if solo_lectura:
+        cantidad = len(list(gestor.iterar_tareas_archivo(archivo)))
+    else:
+        gestor.cargar_tareas(archivo)
+        cantidad = len(gestor.almacen)
+    cola.put((time.perf_counter() - inicio, memoria_pico_mb(), cantidad))
+
+
+def en_proceso_nuevo(contexto, *argumentos):
+    cola = contexto.Queue()
+    proceso = contexto.Process(target=arrancar, args=argumentos + (cola,))
+    proceso.start()
+    resultado = cola.get()
+    proceso.join()
+    return resultado
+
+
+def main():
+    from models.gestor_tareas import GestorTareas
+    print(f"BENCHMARK ARRANQUE EN FRIO ({TAREAS} tareas)")
+    print("=" * 50)
+    with tempfile.TemporaryDirectory() as directorio:
+        gestor = GestorTareas()
+        gestor.tareas = list(generar(TAREAS))
+        contexto = multiprocessing.get_context('spawn')
+        for formato, nombre in FORMATOS:
+            archivo = os.path.join(directorio, nombre)
+            gestor.establecer_persistencia(formato)
+            inicio = time.perf_counter()
+            gestor.guardar_tareas(archivo)
+            guardado = time.perf_counter() - inicio
+            lectura, pico_lectura, _ = en_proceso_nuevo(contexto, formato, archivo, True)
+            total, pico_mb, cantidad = en_proceso_nuevo(contexto, formato, archivo, False)
+            print(f"{formato:>8}: lectura {lectura:6.2f} s ({pico_lectura:6.0f} MB)"
+                  f"  arranque con indices {total:6.2f} s ({pico_mb:6.0f} MB)"
+                  f"  archivo {os.path.getsize(archivo) / 1e6:6.1f} MB  guardado {guardado:5.2f} s"
+                  f"  ({cantidad} tareas)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+import sys, os, gc, time, random, asyncio, tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.gestor_tareas import GestorTareas
+from models.gestor_concurrente import GestorTareasConcurrente
+from models.gestor_async import AsyncGestorTareas
+from models.tarea import Prioridad
+
+TAREAS = 50_000
+DURACION = 3.0
+CLIENTES = 20
+PAUSA_CLIENTE = 0.005
+PAUSA_GUARDADO = 0.5
+PALABRAS = ['informe', 'examen', 'calculo', 'fisica', 'proyecto', 'reunion', 'compras']
+
+
+def preparar(clase):
+    random.seed(1)
+    gestor = clase()
+    gestor.crear_tareas_lote({'titulo': f"{random.choice(PALABRAS)} {i}",
+                              'descripcion': f"Detalle {random.choice(PALABRAS)}",
+                              'prioridad': random.choice(list(Prioridad))}
+                             for i in range(TAREAS))
+    # JSON reescribe el archivo completo en cada guardado
+    gestor.establecer_persistencia('json')
+    # Como un servicio de larga duracion: las tareas ya cargadas no se
+    # vuelven a recorrer en cada recoleccion completa, que si no para todos
+    # los hilos (el bucle incluido) cientos de ms
+    gc.collect()
+    gc.freeze()
+    return gestor
+
+
+class Directo:
+    # Las mismas llamadas, hechas dentro del bucle de eventos
+    def __init__(self, gestor):
+        self.gestor = gestor
+
+    async def consultar(self, **filtros):
+        return self.gestor.consultar(**filtros)
+
+    async def crear_tarea(self, titulo):
+        return self.gestor.crear_tarea(titulo)
+
+    async def guardar_tareas(self, archivo):
+        return self.gestor.guardar_tareas(archivo)
+
+
+def percentil(tiempos, fraccion):
+    if not tiempos:
+        return 0.0
+    tiempos = sorted(tiempos)
+    return tiempos[min(len(tiempos) - 1, int(len(tiempos) * fraccion))] * 1e3
+
+
+async def ejecutar(api, archivo):
+    latencias = []
+    huecos = []
+    guardados = 0
+    fin = time.perf_counter() + DURACION
+
+    async def cliente(semilla):
+        azar = random.Random(semilla)
+        while time.perf_counter() < fin:
+            inicio = time.perf_counter()
+            if azar.random() < 0.1:
+                await api.crear_tarea(f"{azar.choice(PALABRAS)} nueva")
+            else:
+                await api.consultar(texto=azar.choice(PALABRAS), orden='titulo', limite=20)
+            latencias.append(time.perf_counter() - inicio)
+            await asyncio.sleep(PAUSA_CLIENTE)
+
+    async def guardador():
+        nonlocal guardados
+        while time.perf_counter() < fin:
+            await asyncio.sleep(PAUSA_GUARDADO)
+            await api.guardar_tareas(archivo)
+            guardados += 1
+
+    async def latido():
+        # Cuanto tarda el bucle en atender un temporizador de 10 ms
+        while time.perf_counter() < fin:
+            inicio = time.perf_counter()
+            await asyncio.sleep(0.01)
+            huecos.append(time.perf_counter() - inicio - 0.01)
+
+    await asyncio.gather(latido(), guardador(), *(cliente(n) for n in range(CLIENTES)))
+    return latencias, huecos, guardados
+
+
+async def main_async(directorio):
+    print(f"{'modo':<10} {'peticiones/s':>13} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'bucle p99 ms':>13} {'bucle max ms':>13} {'guardados':>10}")
+    for modo in ('directo', 'async'):
+        archivo = os.path.join(directorio, f"{modo}.json")
+        if modo == 'directo':
+            api = Directo(preparar(GestorTareas))
+        else:
+            api = AsyncGestorTareas(preparar(GestorTareasConcurrente))
+        latencias, huecos, guardados = await ejecutar(api, archivo)
+        if modo == 'async':
+            await api.cerrar()
+        gc.unfreeze()
+        print(f"{modo:<10} {len(latencias) / DURACION:13.0f} {percentil(latencias, 0.5):8.2f} "
+              f"{percentil(latencias, 0.99):8.2f} {percentil(huecos, 0.99):13.1f} "
+              f"{max(huecos) * 1e3:13.1f} {guardados:10d}")
+
+
+def main():
+    global DURACION
+    if len(sys.argv) > 1:
+        DURACION = float(sys.argv[1])
+    print(f"BENCHMARK ASYNCIO ({TAREAS} tareas, {CLIENTES} clientes, "
+          f"guardado cada {PAUSA_GUARDADO} s, {DURACION:.0f} s)")
+    print("=" * 50)
+    with tempfile.TemporaryDirectory() as directorio:
+        asyncio.run(main_async(directorio))
+
+
+if __name__ == '__main__':
+    main()
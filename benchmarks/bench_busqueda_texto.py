@@ -0,0 +1,40 @@
+import sys, os, time, random
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.gestor_tareas import GestorTareas
+
+TAREAS = 500_000
+PALABRAS = ['informe', 'examen', 'calculo', 'fisica', 'proyecto', 'reunion', 'compras',
+            'lectura', 'ensayo', 'laboratorio', 'presentacion', 'entrega', 'revisar']
+CONSULTA = "laboratorio fisica"
+
+
+def teclear(gestor, modo):
+    latencias = []
+    for i in range(1, len(CONSULTA) + 1):
+        inicio = time.perf_counter()
+        gestor.buscar_por_texto(CONSULTA[:i], modo=modo)
+        latencias.append((time.perf_counter() - inicio) * 1e3)
+    return latencias
+
+
+def main():
+    print(f"BENCHMARK BUSQUEDA POR TEXTO ({TAREAS} tareas, ms por pulsacion)")
+    print("=" * 50)
+    random.seed(1)
+    gestor = GestorTareas()
+    inicio = time.perf_counter()
+    for i in range(TAREAS):
+        titulo = f"{random.choice(PALABRAS)} {random.choice(PALABRAS)} {i}"
+        gestor.crear_tarea(titulo, f"Detalle {random.choice(PALABRAS)}", "general")
+    print(f"Carga con indexado: {time.perf_counter() - inicio:.1f} s")
+    
+    for modo in ('indice', 'subcadena'):
+        latencias = teclear(gestor, modo)
+        print(f"{modo:>10}: media {sum(latencias) / len(latencias):8.2f}  maxima {max(latencias):8.2f}"
+              f"  ultima pulsacion {latencias[-1]:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
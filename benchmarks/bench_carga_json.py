@@ -0,0 +1,76 @@
+import sys, os, time, json, resource, tempfile
+import multiprocessing
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from persistence.json_persistence import JSONPersistence, tarea_desde_dict
+
+# Uso: python bench_carga_json.py [megabytes] [json.load|incremental ...]
+# Por defecto un archivo de 2 GB y los dos modos. json.load necesita varias
+# veces el tamano del archivo en memoria; en una maquina con poca se puede
+# medir solo el modo incremental, p. ej. con 8 GB:
+#   python bench_carga_json.py 8000 incremental
+MEGABYTES = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+MODOS = sys.argv[2:] or ['json.load', 'incremental']
+
+
+def generar_archivo(archivo, megabytes):
+    # Tareas hasta llegar al tamano pedido; devuelve cuantas se escribieron
+    base = datetime(2025, 1, 1)
+    limite = megabytes * 1_000_000
+    i = 0
+    with open(archivo, 'w', encoding='utf-8') as f:
+        f.write('[\n')
+        while i == 0 or f.tell() < limite:
+            fecha = (base + timedelta(minutes=i)).isoformat()
+            datos = {'id': i + 1, 'titulo': f"Tarea {i}", 'descripcion': "Descripcion de prueba " * 3,
+                     'categoria': 'universidad', 'fecha_limite': fecha, 'estado': 'pendiente',
+                     'prioridad': 'media', 'fecha_creacion': fecha, 'fecha_actualizacion': fecha}
+            f.write(('' if i == 0 else ',\n') + json.dumps(datos, indent=2, ensure_ascii=False))
+            i += 1
+        f.write('\n]')
+    return i
+
+
+def cargar_completo(archivo):
+    # Camino anterior: json.load de todo el archivo y despues construir tareas
+    with open(archivo, 'r', encoding='utf-8') as f:
+        datos_tareas = json.load(f)
+    for datos in datos_tareas:
+        yield tarea_desde_dict(datos)
+
+
+def medir(modo, archivo, cola):
+    inicio = time.perf_counter()
+    iterador = cargar_completo(archivo) if modo == 'json.load' else JSONPersistence().iterar_tareas(archivo)
+    next(iterador)
+    primera = time.perf_counter() - inicio
+    # Las tareas se cuentan y se sueltan: el pico de RSS es el de la lectura,
+    # no el de tenerlas todas en memoria
+    cantidad = 1 + sum(1 for _ in iterador)
+    total = time.perf_counter() - inicio
+    pico_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    cola.put((primera, total, pico_mb, cantidad))
+
+
+def main():
+    print(f"BENCHMARK CARGA JSON ({MEGABYTES} MB)")
+    print("=" * 50)
+    with tempfile.TemporaryDirectory() as directorio:
+        archivo = os.path.join(directorio, 'tareas.json')
+        tareas = generar_archivo(archivo, MEGABYTES)
+        print(f"Archivo: {os.path.getsize(archivo) / 1e6:.1f} MB, {tareas} tareas")
+        contexto = multiprocessing.get_context('spawn')
+        for modo in MODOS:
+            cola = contexto.Queue()
+            proceso = contexto.Process(target=medir, args=(modo, archivo, cola))
+            proceso.start()
+            primera, total, pico_mb, cantidad = cola.get()
+            proceso.join()
+            print(f"{modo:>12}: primera tarea {primera * 1e3:9.1f} ms  total {total:6.2f} s"
+                  f"  RSS pico {pico_mb:8.1f} MB  ({cantidad} tareas)")
+
+
+if __name__ == '__main__':
+    main()
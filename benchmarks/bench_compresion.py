@@ -0,0 +1,47 @@
+import sys, os, time, tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.tarea import Tarea, EstadoTarea, Prioridad
+from persistence.json_persistence import JSONPersistence
+from persistence.csv_persistence import CSVPersistence
+from persistence.compresion import CODECS
+
+# Uso: python bench_compresion.py [numero_de_tareas]
+TAREAS = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+
+def generar(cantidad):
+    base = datetime(2025, 1, 1)
+    categorias = ['universidad', 'trabajo', 'personal', 'hogar']
+    for i in range(1, cantidad + 1):
+        fecha = base + timedelta(minutes=i)
+        yield Tarea.desde_campos(i, f"Tarea {i}", "Descripcion de prueba", categorias[i % 4],
+                                 fecha if i % 3 else None, EstadoTarea.PENDIENTE, Prioridad.MEDIA,
+                                 fecha, fecha)
+
+
+def main():
+    print(f"BENCHMARK COMPRESION ({TAREAS} tareas)")
+    print("=" * 50)
+    tareas = list(generar(TAREAS))
+    with tempfile.TemporaryDirectory() as directorio:
+        for formato, clase in (('json', JSONPersistence), ('csv', CSVPersistence)):
+            print(f"{formato.upper()}:")
+            for codec in [None] + list(CODECS):
+                extension = '' if codec is None else CODECS[codec][0]
+                archivo = os.path.join(directorio, f"tareas.{formato}{extension}")
+                persistencia = clase()
+                inicio = time.perf_counter()
+                persistencia.guardar_tareas(tareas, archivo)
+                guardado = time.perf_counter() - inicio
+                inicio = time.perf_counter()
+                cantidad = sum(1 for _ in persistencia.iterar_tareas(archivo))
+                carga = time.perf_counter() - inicio
+                print(f"{codec or 'sin comprimir':>14}: {os.path.getsize(archivo) / 1e6:7.1f} MB"
+                      f"  guardado {guardado:6.2f} s  carga {carga:6.2f} s  ({cantidad} tareas)")
+
+
+if __name__ == '__main__':
+    main()
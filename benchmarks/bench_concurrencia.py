@@ -0,0 +1,126 @@
+import sys, os, time, random, threading, tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.gestor_tareas import GestorTareas
+from models.gestor_concurrente import GestorTareasConcurrente
+from models.tarea import EstadoTarea, Prioridad
+
+TAREAS = 20_000
+DURACION = 3.0
+LECTORES = 4
+ESCRITORES = 2
+PAUSA_GUARDADO = 0.1
+PALABRAS = ['informe', 'examen', 'calculo', 'fisica', 'proyecto', 'reunion', 'compras']
+
+
+def preparar(clase):
+    random.seed(1)
+    gestor = clase()
+    gestor.crear_tareas_lote({'titulo': f"{random.choice(PALABRAS)} {i}",
+                              'prioridad': random.choice(list(Prioridad))}
+                             for i in range(TAREAS))
+    gestor.establecer_persistencia('jsonl')
+    return gestor
+
+
+def comprobar(gestor):
+    # Invariantes que una lectura a medio cambio rompe
+    estadisticas = gestor.obtener_estadisticas()
+    if estadisticas['total'] != (estadisticas['completadas'] + estadisticas['pendientes'] +
+                                 estadisticas['en_progreso']):
+        raise AssertionError("los conteos por estado no suman el total")
+    foto = gestor.obtener_todas_tareas()
+    if len({tarea.id for tarea in foto}) != len(foto):
+        raise AssertionError("ids repetidos")
+
+
+def ejecutar(clase, archivo):
+    gestor = preparar(clase)
+    parar = threading.Event()
+    contadores = {'lecturas': 0, 'escrituras': 0, 'guardados': 0, 'errores': 0}
+    esperas = {'lectura': [], 'escritura': []}
+    cerrojo = threading.Lock()
+
+    def sumar(clave, cantidad=1):
+        with cerrojo:
+            contadores[clave] += cantidad
+
+    def lector(semilla):
+        azar = random.Random(semilla)
+        while not parar.is_set():
+            try:
+                inicio = time.perf_counter()
+                gestor.consultar(texto=azar.choice(PALABRAS), orden='titulo', limite=50)
+                gestor.filtrar_por_estado(EstadoTarea.PENDIENTE)
+                comprobar(gestor)
+                esperas['lectura'].append(time.perf_counter() - inicio)
+                sumar('lecturas', 3)
+            except Exception:
+                sumar('errores')
+
+    def escritor(semilla):
+        azar = random.Random(semilla)
+        while not parar.is_set():
+            try:
+                inicio = time.perf_counter()
+                tarea = gestor.crear_tarea(f"{azar.choice(PALABRAS)} nueva")
+                gestor.actualizar_tarea(tarea.id, estado=azar.choice(list(EstadoTarea)))
+                gestor.eliminar_tarea(azar.randrange(1, TAREAS))
+                esperas['escritura'].append(time.perf_counter() - inicio)
+                sumar('escrituras', 3)
+            except Exception:
+                sumar('errores')
+
+    def guardador():
+        # Autoguardado periodico
+        while not parar.wait(PAUSA_GUARDADO):
+            try:
+                if gestor.guardar_tareas(archivo):
+                    sumar('guardados')
+            except Exception:
+                sumar('errores')
+
+    hilos = ([threading.Thread(target=lector, args=(n,)) for n in range(LECTORES)] +
+             [threading.Thread(target=escritor, args=(n,)) for n in range(ESCRITORES)] +
+             [threading.Thread(target=guardador)])
+    for hilo in hilos:
+        hilo.start()
+    time.sleep(DURACION)
+    parar.set()
+    for hilo in hilos:
+        hilo.join()
+    try:
+        comprobar(gestor)
+    except Exception:
+        contadores['errores'] += 1
+    return contadores, p99(esperas['lectura']), p99(esperas['escritura'])
+
+
+def p99(tiempos):
+    # Milisegundos por iteracion (tres operaciones)
+    if not tiempos:
+        return 0.0
+    tiempos.sort()
+    return tiempos[int(len(tiempos) * 0.99)] * 1e3
+
+
+def main():
+    global DURACION
+    if len(sys.argv) > 1:
+        DURACION = float(sys.argv[1])
+    print(f"BENCHMARK CONCURRENCIA ({TAREAS} tareas, {LECTORES} lectores, "
+          f"{ESCRITORES} escritores, 1 guardador, {DURACION:.0f} s)")
+    print("=" * 50)
+    print(f"{'gestor':<12} {'lecturas/s':>11} {'escrituras/s':>13} {'guardados':>10} "
+          f"{'p99 lect. ms':>13} {'p99 escr. ms':>13} {'errores':>8}")
+    with tempfile.TemporaryDirectory() as directorio:
+        for nombre, clase in (('sin cerrojo', GestorTareas), ('concurrente', GestorTareasConcurrente)):
+            contadores, lectura, escritura = ejecutar(clase, os.path.join(directorio, f"{nombre}.jsonl"))
+            print(f"{nombre:<12} {contadores['lecturas'] / DURACION:11.0f} "
+                  f"{contadores['escrituras'] / DURACION:13.0f} {contadores['guardados']:10d} "
+                  f"{lectura:13.2f} {escritura:13.2f} {contadores['errores']:8d}")
+
+
+if __name__ == '__main__':
+    main()
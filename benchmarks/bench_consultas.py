@@ -0,0 +1,92 @@
+import sys, os, time, random
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import datetime, timedelta
+from models.gestor_tareas import GestorTareas
+from models.tarea import EstadoTarea, Prioridad
+
+TAREAS = 200_000
+REPETICIONES = 5
+PALABRAS = ['informe', 'examen', 'calculo', 'fisica', 'proyecto', 'reunion', 'compras',
+            'lectura', 'ensayo', 'laboratorio', 'presentacion', 'entrega', 'revisar']
+ORDEN_GUI = {Prioridad.ALTA: 1, Prioridad.MEDIA: 2, Prioridad.BAJA: 3}
+
+# (texto, estado, orden) como los combina la ventana
+CONSULTAS = [
+    ('', None, 'titulo'),
+    ('', EstadoTarea.PENDIENTE, 'prioridad'),
+    ('fisica', None, 'fecha_creacion'),
+    ('laboratorio fis', EstadoTarea.COMPLETADA, 'titulo'),
+    ('', None, 'fecha_limite'),
+    ('', EstadoTarea.PENDIENTE, 'fecha_limite'),
+    ('fisica', None, 'fecha_limite'),
+]
+
+
+def componer(gestor, texto, estado, orden):
+    # Lo que hacia refresh_tree: buscar, filtrar y ordenar en pasos separados
+    if orden == 'fecha_limite':
+        # el orden por fecha limite ya lo mantiene el gestor: solo filtrar
+        tareas = gestor.ordenar_por_fecha_limite()
+        if texto:
+            encontradas = {t.id for t in gestor.buscar_por_texto(texto)}
+            tareas = [t for t in tareas if t.id in encontradas]
+    elif texto:
+        tareas = gestor.buscar_por_texto(texto)
+    else:
+        tareas = gestor.obtener_todas_tareas()
+    if estado is not None:
+        tareas = [t for t in tareas if t.estado.value == estado.value]
+    if orden == 'fecha_creacion':
+        tareas = sorted(tareas, key=lambda x: x.fecha_creacion)
+    elif orden == 'prioridad':
+        tareas = sorted(tareas, key=lambda x: ORDEN_GUI.get(x.prioridad, 4))
+    elif orden == 'titulo':
+        tareas = sorted(tareas, key=lambda x: x.titulo.lower())
+    return tareas
+
+
+def medir(funcion):
+    inicio = time.perf_counter()
+    for _ in range(REPETICIONES):
+        funcion()
+    return (time.perf_counter() - inicio) / REPETICIONES * 1e3
+
+
+def main():
+    tareas = int(sys.argv[1]) if len(sys.argv) > 1 else TAREAS
+    print(f"BENCHMARK CONSULTAS COMBINADAS ({tareas} tareas, ms por consulta)")
+    print("=" * 50)
+    random.seed(1)
+    gestor = GestorTareas()
+    base = datetime(2024, 1, 1)
+    estados = list(EstadoTarea)
+    for i in range(tareas):
+        tarea = gestor.crear_tarea(
+            f"{random.choice(PALABRAS)} {random.choice(PALABRAS)} {i}",
+            f"Detalle {random.choice(PALABRAS)}", "general",
+            base + timedelta(minutes=random.randint(0, 500_000)),
+            random.choice(list(Prioridad)))
+        tarea.estado = random.choice(estados)
+
+    print(f"{'consulta':<44} {'pasos':>8} {'consultar':>10} {'pagina 50':>10} {'en cache':>9}")
+    for texto, estado, orden in CONSULTAS:
+        filtros = dict(texto=texto, estado=estado, orden=orden)
+        referencia = componer(gestor, texto, estado, orden)
+        resultado = gestor.consultar(**filtros)
+        assert len(resultado) == len(referencia)
+        pasos = medir(lambda: componer(gestor, texto, estado, orden))
+        gestor.configurar_cache_consultas(0)
+        completa = medir(lambda: gestor.consultar(**filtros))
+        pagina = medir(lambda: gestor.consultar(limite=50, **filtros))
+        # Refresco repetido sin cambios en las tareas
+        gestor.configurar_cache_consultas(64)
+        gestor.consultar(**filtros)
+        cache = medir(lambda: gestor.consultar(**filtros))
+        nombre = f"{texto or '-'} / {estado.value if estado else 'todos'} / {orden}"
+        print(f"{nombre:<44} {pasos:8.1f} {completa:10.1f} {pagina:10.1f} {cache:9.2f}")
+
+
+if __name__ == '__main__':
+    main()
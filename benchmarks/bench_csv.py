@@ -0,0 +1,77 @@
+import sys, os, time, csv, tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.tarea import Tarea, EstadoTarea, Prioridad
+from persistence.csv_persistence import CSVPersistence
+
+# Uso: python bench_csv.py [numero_de_tareas]
+TAREAS = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+
+
+def generar(cantidad):
+    base = datetime(2025, 1, 1)
+    for i in range(1, cantidad + 1):
+        fecha = base + timedelta(minutes=i)
+        yield Tarea.desde_campos(i, f"Tarea {i}", "Descripcion, de prueba", 'universidad',
+                                 fecha if i % 3 else None, EstadoTarea.PENDIENTE, Prioridad.MEDIA,
+                                 fecha, fecha)
+
+
+# Camino anterior: writerow por fila, DictReader y Tarea.__init__
+def guardar_anterior(tareas, archivo):
+    with open(archivo, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'titulo', 'descripcion', 'categoria', 'fecha_limite', 'estado',
+                         'prioridad', 'fecha_creacion', 'fecha_actualizacion'])
+        for tarea in tareas:
+            writer.writerow([
+                tarea.id, tarea.titulo, tarea.descripcion, tarea.categoria,
+                tarea.fecha_limite.isoformat() if tarea.fecha_limite else '',
+                tarea.estado.value, tarea.prioridad.value,
+                tarea.fecha_creacion.isoformat(), tarea.fecha_actualizacion.isoformat()
+            ])
+
+
+def cargar_anterior(archivo):
+    with open(archivo, 'r', newline='', encoding='utf-8') as f:
+        for fila in csv.DictReader(f):
+            tarea = Tarea(
+                titulo=fila['titulo'],
+                descripcion=fila['descripcion'],
+                categoria=fila['categoria'],
+                fecha_limite=datetime.fromisoformat(fila['fecha_limite']) if fila['fecha_limite'] else None,
+                estado=EstadoTarea(fila['estado']),
+                prioridad=Prioridad(fila['prioridad'])
+            )
+            tarea.id = int(fila['id'])
+            tarea.fecha_creacion = datetime.fromisoformat(fila['fecha_creacion'])
+            tarea.fecha_actualizacion = datetime.fromisoformat(fila['fecha_actualizacion'])
+            yield tarea
+
+
+def filas_por_segundo(funcion):
+    inicio = time.perf_counter()
+    funcion()
+    return TAREAS / (time.perf_counter() - inicio)
+
+
+def main():
+    print(f"BENCHMARK CSV ({TAREAS} tareas, filas/s)")
+    print("=" * 50)
+    tareas = list(generar(TAREAS))
+    persistencia = CSVPersistence()
+    with tempfile.TemporaryDirectory() as directorio:
+        archivo = os.path.join(directorio, 'tareas.csv')
+        escritura_anterior = filas_por_segundo(lambda: guardar_anterior(tareas, archivo))
+        lectura_anterior = filas_por_segundo(lambda: list(cargar_anterior(archivo)))
+        escritura = filas_por_segundo(lambda: persistencia.guardar_tareas(tareas, archivo))
+        lectura = filas_por_segundo(lambda: list(persistencia.iterar_tareas(archivo)))
+    print(f"{'':>10}  {'anterior':>10}  {'actual':>10}  mejora")
+    print(f"{'escritura':>10}  {escritura_anterior:10.0f}  {escritura:10.0f}  {escritura / escritura_anterior:5.2f}x")
+    print(f"{'lectura':>10}  {lectura_anterior:10.0f}  {lectura:10.0f}  {lectura / lectura_anterior:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import sys, os, time, random
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.gestor_tareas import GestorTareas
+
+TAMANOS = [10_000, 100_000, 300_000]
+REPETICIONES = 200
+
+
+def medir(tamano):
+    gestor = GestorTareas()
+    ahora = datetime.now()
+    for i in range(tamano):
+        fecha = ahora + timedelta(hours=random.randint(-24 * 30, 24 * 365))
+        gestor.crear_tarea(f"Tarea {i}", "Desc", "general", fecha)
+    
+    inicio = time.perf_counter()
+    for _ in range(REPETICIONES):
+        gestor.obtener_tareas_vencidas()
+    t_vencidas = (time.perf_counter() - inicio) / REPETICIONES
+    
+    inicio = time.perf_counter()
+    for _ in range(REPETICIONES):
+        gestor.filtrar_por_fecha_limite(ahora, ahora + timedelta(days=1))
+    t_rango = (time.perf_counter() - inicio) / REPETICIONES
+    
+    inicio = time.perf_counter()
+    for _ in range(20):
+        gestor.ordenar_por_fecha_limite()
+    t_orden = (time.perf_counter() - inicio) / 20
+    
+    return [t * 1e3 for t in (t_vencidas, t_rango, t_orden)]
+
+
+def main():
+    print("BENCHMARK INDICE FECHA LIMITE (ms por consulta)")
+    print("=" * 50)
+    print(f"{'tareas':>10} {'vencidas':>10} {'rango 1 dia':>12} {'orden':>10}")
+    for tamano in TAMANOS:
+        vencidas, rango, orden = medir(tamano)
+        print(f"{tamano:>10} {vencidas:>10.3f} {rango:>12.3f} {orden:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import sys, os, time, tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.gestor_tareas import GestorTareas
+from models.tarea import Tarea, EstadoTarea, Prioridad
+
+# Uso: python bench_guardado_asincrono.py [numero_de_tareas]
+TAREAS = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+PETICIONES = 20
+
+
+def main():
+    print(f"BENCHMARK GUARDADO ASINCRONO ({TAREAS} tareas, {PETICIONES} guardados seguidos)")
+    print("=" * 50)
+    base = datetime(2025, 1, 1)
+    tareas = [Tarea.desde_campos(i, f"Tarea {i}", "Descripcion", 'general', None,
+                                 EstadoTarea.PENDIENTE, Prioridad.MEDIA, base, base)
+              for i in range(1, TAREAS + 1)]
+    with tempfile.TemporaryDirectory() as directorio:
+        archivo = os.path.join(directorio, 'tareas.json')
+        for asincrono in (False, True):
+            gestor = GestorTareas()
+            gestor.tareas = tareas
+            gestor.persistence_manager.establecer_asincrono(asincrono)
+            escrituras = []
+            gestor.persistence_manager.al_terminar_guardado = lambda archivo, ok: escrituras.append(ok)
+            bloqueos = []
+            inicio = time.perf_counter()
+            for i in range(PETICIONES):
+                # Cada peticion cambia algo, como al editar desde la ventana
+                gestor.actualizar_tarea(1, titulo=f"Editada {i}")
+                antes = time.perf_counter()
+                gestor.guardar_tareas(archivo)
+                bloqueos.append((time.perf_counter() - antes) * 1e3)
+            gestor.persistence_manager.esperar_guardados()
+            total = time.perf_counter() - inicio
+            modo = 'asincrono' if asincrono else 'sincrono'
+            print(f"{modo:>10}: bloqueo por guardado medio {sum(bloqueos) / len(bloqueos):8.1f} ms"
+                  f"  maximo {max(bloqueos):8.1f} ms  escrituras {len(escrituras) if asincrono else PETICIONES:3}"
+                  f"  total {total:6.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+import sys, os, time, tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.gestor_tareas import GestorTareas
+from models.tarea import EstadoTarea
+
+TAMANOS = [10_000, 50_000, 200_000]
+GUARDADOS = 20
+
+
+def medir(tamano, formato, directorio):
+    gestor = GestorTareas()
+    gestor.establecer_persistencia(formato)
+    tareas = [gestor.crear_tarea(f"Tarea {i}", "Descripcion", "general") for i in range(tamano)]
+    archivo = os.path.join(directorio, f"tareas_{tamano}.{formato}")
+    gestor.guardar_tareas(archivo)
+    
+    inicio = time.perf_counter()
+    for i in range(GUARDADOS):
+        tareas[i].actualizar_estado(EstadoTarea.COMPLETADA)
+        gestor.guardar_tareas(archivo)
+    return (time.perf_counter() - inicio) / GUARDADOS * 1e3
+
+
+def main():
+    print("BENCHMARK GUARDADO CON UNA TAREA CAMBIADA (ms por guardado)")
+    print("=" * 50)
+    print(f"{'tareas':>10} {'json':>10} {'jsonl':>10}")
+    with tempfile.TemporaryDirectory() as directorio:
+        for tamano in TAMANOS:
+            json_ms = medir(tamano, 'json', directorio)
+            jsonl_ms = medir(tamano, 'jsonl', directorio)
+            print(f"{tamano:>10} {json_ms:>10.1f} {jsonl_ms:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
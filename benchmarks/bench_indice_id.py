@@ -0,0 +1,47 @@
+import sys, os, time, random
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.gestor_tareas import GestorTareas
+from models.tarea import EstadoTarea
+
+TAMANOS = [5_000, 10_000, 100_000, 300_000]
+OPERACIONES = 2_000
+
+
+def medir(tamano):
+    gestor = GestorTareas()
+    for i in range(tamano):
+        gestor.crear_tarea(f"Tarea {i}", "Desc", "general")
+    
+    ids = random.sample(range(1, tamano + 1), OPERACIONES)
+    
+    inicio = time.perf_counter()
+    for id_tarea in ids:
+        gestor.obtener_tarea_por_id(id_tarea)
+    t_obtener = time.perf_counter() - inicio
+    
+    inicio = time.perf_counter()
+    for id_tarea in ids:
+        gestor.actualizar_tarea(id_tarea, estado=EstadoTarea.EN_PROGRESO)
+    t_actualizar = time.perf_counter() - inicio
+    
+    inicio = time.perf_counter()
+    for id_tarea in ids:
+        gestor.eliminar_tarea(id_tarea)
+    t_eliminar = time.perf_counter() - inicio
+    
+    return [t / OPERACIONES * 1e6 for t in (t_obtener, t_actualizar, t_eliminar)]
+
+
+def main():
+    print("BENCHMARK INDICE POR ID (us por operacion)")
+    print("=" * 50)
+    print(f"{'tareas':>10} {'obtener':>10} {'actualizar':>12} {'eliminar':>10}")
+    for tamano in TAMANOS:
+        obtener, actualizar, eliminar = medir(tamano)
+        print(f"{tamano:>10} {obtener:>10.2f} {actualizar:>12.2f} {eliminar:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
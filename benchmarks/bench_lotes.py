@@ -0,0 +1,72 @@
+import sys, os, time, random
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import datetime, timedelta
+from models.gestor_tareas import GestorTareas
+from models.almacen_sqlite import AlmacenSQLite
+from models.tarea import EstadoTarea, Prioridad
+
+TAREAS = 50_000
+PALABRAS = ['informe', 'examen', 'calculo', 'fisica', 'proyecto', 'reunion', 'compras']
+ALMACENES = {
+    'memoria': lambda: 'memoria',
+    'columnar': lambda: 'columnar',
+    'sqlite': lambda: AlmacenSQLite(),
+}
+
+
+def generar_datos(tareas):
+    random.seed(1)
+    base = datetime.now()
+    return [{'titulo': f"{random.choice(PALABRAS)} {i}",
+             'descripcion': f"Detalle {random.choice(PALABRAS)}",
+             'categoria': random.choice(['trabajo', 'personal', 'universidad']),
+             'fecha_limite': base + timedelta(minutes=random.randint(-50_000, 50_000)),
+             'prioridad': random.choice(list(Prioridad))}
+            for i in range(tareas)]
+
+
+def cronometrar(funcion):
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+def por_tarea(almacen, datos):
+    gestor = GestorTareas(almacen=ALMACENES[almacen]())
+    crear = cronometrar(lambda: [gestor.crear_tarea(**campos) for campos in datos])
+    ids = [t.id for t in gestor.obtener_todas_tareas()]
+    # Completar la mitad y eliminar la otra mitad
+    actualizar = cronometrar(lambda: [gestor.actualizar_tarea(id_tarea, estado=EstadoTarea.COMPLETADA)
+                                      for id_tarea in ids[::2]])
+    eliminar = cronometrar(lambda: [gestor.eliminar_tarea(id_tarea) for id_tarea in ids[1::2]])
+    return crear, actualizar, eliminar, len(gestor.almacen)
+
+
+def por_lotes(almacen, datos):
+    gestor = GestorTareas(almacen=ALMACENES[almacen]())
+    crear = cronometrar(lambda: gestor.crear_tareas_lote(datos))
+    ids = [t.id for t in gestor.obtener_todas_tareas()]
+    actualizar = cronometrar(lambda: gestor.actualizar_lote(
+        (id_tarea, {'estado': EstadoTarea.COMPLETADA}) for id_tarea in ids[::2]))
+    eliminar = cronometrar(lambda: gestor.eliminar_lote(ids[1::2]))
+    return crear, actualizar, eliminar, len(gestor.almacen)
+
+
+def main():
+    tareas = int(sys.argv[1]) if len(sys.argv) > 1 else TAREAS
+    print(f"BENCHMARK OPERACIONES POR LOTES ({tareas} tareas, segundos)")
+    print("=" * 50)
+    datos = generar_datos(tareas)
+    print(f"{'almacen':<10} {'modo':<10} {'crear':>8} {'completar':>10} {'eliminar':>9}")
+    for almacen in ALMACENES:
+        uno, lote = por_tarea(almacen, datos), por_lotes(almacen, datos)
+        assert uno[3] == lote[3]
+        for modo, tiempos in (('por tarea', uno), ('lote', lote)):
+            crear, actualizar, eliminar, _ = tiempos
+            print(f"{almacen:<10} {modo:<10} {crear:8.2f} {actualizar:10.2f} {eliminar:9.2f}")
+
+
+if __name__ == '__main__':
+    main()
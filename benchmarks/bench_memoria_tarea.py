@@ -0,0 +1,52 @@
+import sys, os, gc, tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.tarea import Tarea, EstadoTarea, Prioridad
+
+TAREAS = 200_000
+CATEGORIAS = ['universidad', 'trabajo', 'personal', 'estudio', 'general']
+
+
+class TareaAnterior:
+    # Copia de la Tarea original (con __dict__) como referencia
+    def __init__(self, titulo, descripcion="", categoria="general", 
+                 fecha_limite=None, estado=EstadoTarea.PENDIENTE, prioridad=Prioridad.MEDIA):
+        self.id = id(self)
+        self.titulo = titulo
+        self.descripcion = descripcion
+        self.categoria = categoria
+        self.fecha_limite = fecha_limite
+        self.estado = estado
+        self.prioridad = prioridad
+        self.fecha_creacion = datetime.now()
+        self.fecha_actualizacion = datetime.now()
+
+
+def bytes_por_tarea(clase):
+    base = datetime(2025, 1, 1)
+    gc.collect()
+    tracemalloc.start()
+    # las categorias se construyen por tarea, como al leer un archivo
+    tareas = [clase(f"Tarea {i}", "", CATEGORIAS[i % len(CATEGORIAS)].encode().decode(),
+                    base + timedelta(days=i % 365))
+              for i in range(TAREAS)]
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tareas
+    return actual / TAREAS
+
+
+def main():
+    print(f"BENCHMARK MEMORIA POR TAREA ({TAREAS} tareas)")
+    print("=" * 50)
+    anterior = bytes_por_tarea(TareaAnterior)
+    actual = bytes_por_tarea(Tarea)
+    print(f"Tarea con __dict__: {anterior:8.1f} bytes/tarea")
+    print(f"Tarea con __slots__: {actual:7.1f} bytes/tarea")
+    print(f"Ahorro: {(1 - actual / anterior) * 100:.1f}%")
+
+
+if __name__ == '__main__':
+    main()
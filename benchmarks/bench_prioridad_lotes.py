@@ -0,0 +1,40 @@
+import sys, os, time, random
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.gestor_tareas import GestorTareas
+from strategies.prioridad_fecha import PrioridadFechaStrategy
+from strategies.prioridad_categoria import PrioridadCategoriaStrategy
+
+TAREAS = 200_000
+CATEGORIAS = ['universidad', 'trabajo', 'personal', 'estudio', 'general', 'hogar', 'Examen final']
+
+
+def main():
+    print(f"BENCHMARK PRIORIZACION POR LOTES ({TAREAS} tareas)")
+    print("=" * 50)
+    random.seed(1)
+    gestor = GestorTareas()
+    ahora = datetime.now()
+    for i in range(TAREAS):
+        fecha = ahora + timedelta(hours=random.randint(-48, 24 * 10)) if i % 4 else None
+        gestor.crear_tarea(f"Tarea {i}", "", random.choice(CATEGORIAS), fecha)
+    tareas = gestor.obtener_todas_tareas()
+    
+    for estrategia in (PrioridadFechaStrategy(), PrioridadCategoriaStrategy()):
+        inicio = time.perf_counter()
+        for tarea in tareas:
+            estrategia.calcular_prioridad(tarea)
+        t_individual = time.perf_counter() - inicio
+        
+        inicio = time.perf_counter()
+        estrategia.calcular_prioridades(tareas)
+        t_lote = time.perf_counter() - inicio
+        
+        print(f"{estrategia.get_nombre():<26} por tarea {t_individual * 1e3:8.1f} ms"
+              f"  por lote {t_lote * 1e3:8.1f} ms  ({t_individual / t_lote:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
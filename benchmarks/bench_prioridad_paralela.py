@@ -0,0 +1,49 @@
+import sys, os, time, hashlib
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.gestor_tareas import GestorTareas
+from models.tarea import Tarea, Prioridad
+from strategies.prioridad_strategy import PrioridadStrategy
+
+TAREAS = 4_000
+PRIORIDADES = [Prioridad.ALTA, Prioridad.MEDIA, Prioridad.BAJA]
+
+
+class PrioridadCostosaStrategy(PrioridadStrategy):
+    # Simula una puntuacion costosa en CPU
+    def calcular_prioridad(self, tarea: Tarea) -> Prioridad:
+        resumen = tarea.titulo.encode()
+        for _ in range(300):
+            resumen = hashlib.sha256(resumen).digest()
+        return PRIORIDADES[resumen[0] % 3]
+    
+    def get_nombre(self) -> str:
+        return "Estrategia Costosa"
+
+
+def main():
+    print(f"BENCHMARK PRIORIZACION PARALELA ({TAREAS} tareas, {os.cpu_count()} nucleos)")
+    print("=" * 50)
+    gestor = GestorTareas()
+    for i in range(TAREAS):
+        gestor.crear_tarea(f"Tarea {i}")
+    gestor.establecer_estrategia_prioridad(PrioridadCostosaStrategy())
+    
+    referencia = None
+    for modo, trabajadores in [('serie', 1), ('hilos', 4), ('procesos', 1), ('procesos', 2),
+                               ('procesos', 4), ('procesos', 8)]:
+        gestor.establecer_ejecucion_prioridad(modo, trabajadores)
+        inicio = time.perf_counter()
+        gestor.aplicar_prioridad_inteligente()
+        duracion = time.perf_counter() - inicio
+        resultado = [t.prioridad for t in gestor.obtener_todas_tareas()]
+        referencia = referencia or resultado
+        if modo == 'serie':
+            base = duracion
+        print(f"{modo:>9} x{trabajadores}: {duracion:7.2f} s  aceleracion {base / duracion:4.2f}x"
+              f"  {'OK' if resultado == referencia else 'DISTINTO'}")
+
+
+if __name__ == '__main__':
+    main()
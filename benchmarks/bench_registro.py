@@ -0,0 +1,116 @@
+import sys, os, time, random, threading, tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.gestor_tareas import GestorTareas
+from models.gestor_concurrente import GestorTareasConcurrente
+from models.tarea import EstadoTarea, Prioridad
+
+TAREAS = 50_000
+MUTACIONES = 3_000
+HILOS = 4
+PALABRAS = ['informe', 'examen', 'calculo', 'fisica', 'proyecto', 'reunion', 'compras']
+PERSISTENCIA = 'binaria'
+
+
+def preparar_instantanea(directorio):
+    # Instantanea comun de la que parte cada politica
+    random.seed(1)
+    gestor = GestorTareas()
+    gestor.crear_tareas_lote({'titulo': f"{random.choice(PALABRAS)} {i}",
+                              'prioridad': random.choice(list(Prioridad))}
+                             for i in range(TAREAS))
+    gestor.establecer_persistencia(PERSISTENCIA)
+    archivo = os.path.join(directorio, 'base.bin')
+    gestor.guardar_tareas(archivo)
+    with open(archivo, 'rb') as f:
+        return f.read()
+
+
+def abrir(clase, directorio, nombre, base, politica):
+    instantanea = os.path.join(directorio, f"{nombre}.bin")
+    registro = os.path.join(directorio, f"{nombre}.wal")
+    with open(instantanea, 'wb') as f:
+        f.write(base)
+    gestor = clase()
+    gestor.establecer_persistencia(PERSISTENCIA)
+    if politica is None:
+        gestor.cargar_tareas(instantanea)
+    else:
+        gestor.activar_registro(registro, instantanea, politica)
+    return gestor, instantanea, registro
+
+
+def mutar(gestor, cantidad, semilla):
+    # Mezcla de crear, actualizar y eliminar, una operacion por llamada
+    azar = random.Random(semilla)
+    for i in range(cantidad):
+        operacion = i % 3
+        if operacion == 0:
+            gestor.crear_tarea(f"{azar.choice(PALABRAS)} nueva")
+        elif operacion == 1:
+            gestor.actualizar_tarea(azar.randrange(1, TAREAS), estado=azar.choice(list(EstadoTarea)))
+        else:
+            gestor.eliminar_tarea(azar.randrange(1, TAREAS))
+
+
+def recuperar(instantanea, registro):
+    gestor = GestorTareas()
+    gestor.establecer_persistencia(PERSISTENCIA)
+    inicio = time.perf_counter()
+    reproducidos = gestor.activar_registro(registro, instantanea)
+    segundos = time.perf_counter() - inicio
+    gestor.desactivar_registro()
+    return segundos, reproducidos, gestor
+
+
+def main():
+    global MUTACIONES
+    if len(sys.argv) > 1:
+        MUTACIONES = int(sys.argv[1])
+    print(f"BENCHMARK REGISTRO DE ESCRITURA ({TAREAS} tareas, {MUTACIONES} mutaciones)")
+    print("=" * 50)
+    with tempfile.TemporaryDirectory() as directorio:
+        base = preparar_instantanea(directorio)
+        print(f"{'politica':<14} {'1 hilo op/s':>12} {f'{HILOS} hilos op/s':>14} "
+              f"{'recuperar s':>12} {'registros':>10}")
+        for politica in (None, 'nunca', 'lote', 'siempre'):
+            nombre = politica or 'sin registro'
+            gestor, instantanea, registro = abrir(GestorTareas, directorio, nombre, base, politica)
+            inicio = time.perf_counter()
+            mutar(gestor, MUTACIONES, 1)
+            serie = MUTACIONES / (time.perf_counter() - inicio)
+            esperado = [tarea.__getstate__() for tarea in gestor.obtener_todas_tareas()]
+
+            concurrente, _, registro_hilos = abrir(GestorTareasConcurrente, directorio,
+                                                   nombre + ' hilos', base, politica)
+            hilos = [threading.Thread(target=mutar, args=(concurrente, MUTACIONES // HILOS, n))
+                     for n in range(HILOS)]
+            inicio = time.perf_counter()
+            for hilo in hilos:
+                hilo.start()
+            for hilo in hilos:
+                hilo.join()
+            paralelo = MUTACIONES // HILOS * HILOS / (time.perf_counter() - inicio)
+
+            if politica is None:
+                print(f"{nombre:<14} {serie:12.0f} {paralelo:14.0f} {'-':>12} {'-':>10}")
+                continue
+            # Caida simulada: se recupera sin cerrar el gestor
+            segundos, reproducidos, recuperado = recuperar(instantanea, registro)
+            assert [t.__getstate__() for t in recuperado.obtener_todas_tareas()] == esperado
+            print(f"{nombre:<14} {serie:12.0f} {paralelo:14.0f} {segundos:12.2f} {reproducidos:10d}")
+            gestor.desactivar_registro()
+            concurrente.desactivar_registro()
+
+        # Tras un punto de control solo queda la instantanea
+        gestor, instantanea, registro = abrir(GestorTareas, directorio, 'control', base, 'lote')
+        mutar(gestor, MUTACIONES, 1)
+        gestor.punto_control()
+        gestor.desactivar_registro()
+        segundos, reproducidos, _ = recuperar(instantanea, registro)
+        print(f"{'tras control':<14} {'-':>12} {'-':>14} {segundos:12.2f} {reproducidos:10d}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+import sys, os, time, random, json, threading, http.client, multiprocessing
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.gestor_concurrente import GestorTareasConcurrente
+from models.servidor import crear_servidor
+from models.tarea import Prioridad
+
+TAREAS = 20_000
+DURACION = 3.0
+CLIENTES = 8
+PROPORCION_ESCRITURAS = 0.05
+PALABRAS = ['informe', 'examen', 'calculo', 'fisica', 'proyecto', 'reunion', 'compras']
+
+
+def servir(cola):
+    # El servidor va en otro proceso para no compartir el GIL con los clientes
+    random.seed(1)
+    gestor = GestorTareasConcurrente()
+    gestor.crear_tareas_lote({'titulo': f"{random.choice(PALABRAS)} {i}",
+                              'prioridad': random.choice(list(Prioridad))}
+                             for i in range(TAREAS))
+    servidor = crear_servidor(gestor, puerto=0)
+    cola.put(servidor.server_address[1])
+    servidor.serve_forever()
+
+
+def cliente(puerto, modo, semilla, fin, resultados):
+    azar = random.Random(semilla)
+    conexion = None
+    etiquetas = {}
+    tiempos, no_modificadas = [], 0
+    while time.perf_counter() < fin:
+        if conexion is None or modo == 'nueva conexion':
+            conexion = http.client.HTTPConnection('127.0.0.1', puerto)
+        cabeceras = {'Connection': 'close'} if modo == 'nueva conexion' else {}
+        inicio = time.perf_counter()
+        if azar.random() < PROPORCION_ESCRITURAS:
+            cambios = {str(azar.randrange(1, TAREAS)): {'estado': 'completada'} for _ in range(5)}
+            conexion.request('POST', '/tareas/lote', json.dumps({'actualizar': cambios}),
+                             dict(cabeceras, **{'Content-Type': 'application/json'}))
+            ruta = None
+        else:
+            ruta = f"/tareas?texto={azar.choice(PALABRAS)}&orden=titulo&limite=20"
+            if modo == 'etag' and ruta in etiquetas:
+                cabeceras['If-None-Match'] = etiquetas[ruta]
+            conexion.request('GET', ruta, headers=cabeceras)
+        respuesta = conexion.getresponse()
+        respuesta.read()
+        tiempos.append(time.perf_counter() - inicio)
+        if respuesta.status == 304:
+            no_modificadas += 1
+        elif ruta is not None and respuesta.getheader('ETag'):
+            etiquetas[ruta] = respuesta.getheader('ETag')
+        if modo == 'nueva conexion':
+            conexion.close()
+    conexion.close()
+    resultados.append((tiempos, no_modificadas))
+
+
+def medir(puerto, modo):
+    resultados = []
+    fin = time.perf_counter() + DURACION
+    hilos = [threading.Thread(target=cliente, args=(puerto, modo, n, fin, resultados))
+             for n in range(CLIENTES)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    tiempos = sorted(t for parcial, _ in resultados for t in parcial)
+    no_modificadas = sum(n for _, n in resultados)
+    p50 = tiempos[len(tiempos) // 2] * 1e3
+    p99 = tiempos[int(len(tiempos) * 0.99)] * 1e3
+    return len(tiempos) / DURACION, p50, p99, no_modificadas / len(tiempos) * 100
+
+
+def main():
+    global DURACION
+    if len(sys.argv) > 1:
+        DURACION = float(sys.argv[1])
+    print(f"BENCHMARK SERVIDOR HTTP ({TAREAS} tareas, {CLIENTES} clientes, "
+          f"{PROPORCION_ESCRITURAS:.0%} escrituras, {DURACION:.0f} s por modo)")
+    print("=" * 50)
+    cola = multiprocessing.Queue()
+    proceso = multiprocessing.Process(target=servir, args=(cola,), daemon=True)
+    proceso.start()
+    try:
+        puerto = cola.get(timeout=60)
+        print(f"{'modo':<16} {'peticiones/s':>13} {'p50 ms':>8} {'p99 ms':>8} {'304 %':>7}")
+        for modo in ('nueva conexion', 'keep-alive', 'etag'):
+            por_segundo, p50, p99, no_modificadas = medir(puerto, modo)
+            print(f"{modo:<16} {por_segundo:13.0f} {p50:8.2f} {p99:8.2f} {no_modificadas:7.1f}")
+    finally:
+        proceso.terminate()
+        proceso.join()
+
+
+if __name__ == '__main__':
+    main()
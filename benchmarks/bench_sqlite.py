@@ -0,0 +1,71 @@
+import sys, os, time, random, resource, tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.gestor_tareas import GestorTareas
+from models.tarea import Tarea, EstadoTarea, Prioridad
+from models.almacen_sqlite import AlmacenSQLite
+from persistence.sqlite_persistence import SQLitePersistence
+
+PALABRAS = ['informe', 'examen', 'calculo', 'fisica', 'proyecto', 'reunion', 'compras',
+            'lectura', 'ensayo', 'laboratorio', 'presentacion', 'entrega', 'revisar']
+CATEGORIAS = ['universidad', 'trabajo', 'personal', 'hogar', 'salud']
+
+
+def generar(cantidad):
+    random.seed(1)
+    base = datetime(2025, 1, 1)
+    estados = list(EstadoTarea)
+    prioridades = list(Prioridad)
+    for i in range(1, cantidad + 1):
+        yield Tarea.desde_campos(
+            i, f"{random.choice(PALABRAS)} {random.choice(PALABRAS)} {i}",
+            f"Detalle {random.choice(PALABRAS)}", random.choice(CATEGORIAS),
+            base + timedelta(hours=random.randrange(24 * 365)) if i % 4 else None,
+            random.choice(estados), random.choice(prioridades), base, base)
+
+
+def medir(nombre, funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    print(f"{nombre:>28}: {(time.perf_counter() - inicio) * 1e3:9.2f} ms  ({len(resultado)} tareas)")
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"BENCHMARK SQLITE ({cantidad} tareas)")
+    print("=" * 50)
+    archivo = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+    inicio = time.perf_counter()
+    SQLitePersistence().guardar_tareas(generar(cantidad), archivo)
+    print(f"Guardado (una transaccion): {time.perf_counter() - inicio:.1f} s, "
+          f"{os.path.getsize(archivo) / 2**20:.0f} MiB")
+
+    inicio = time.perf_counter()
+    gestor = GestorTareas(almacen=AlmacenSQLite(archivo))
+    print(f"Apertura sin carga: {(time.perf_counter() - inicio) * 1e3:.1f} ms, "
+          f"RSS maximo {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+
+    ahora = datetime(2025, 3, 1)
+    medir("filtrar_por_categoria", lambda: gestor.filtrar_por_categoria('salud'))
+    medir("filtrar_por_fecha_limite",
+          lambda: gestor.filtrar_por_fecha_limite(ahora, ahora + timedelta(days=2)))
+    medir("vencidas", lambda: gestor.almacen.obtener_vencidas(ahora))
+    medir("buscar_por_texto", lambda: gestor.buscar_por_texto("laboratorio fisica 12"))
+    medir("contar_por_estado", lambda: [gestor.almacen.contar_por_estado(EstadoTarea.PENDIENTE)])
+    medir("actualizar 1000 tareas", lambda: [
+        gestor.actualizar_tarea(id_tarea, estado=EstadoTarea.COMPLETADA)
+        for id_tarea in range(1, 1001)])
+    medir("guardar (confirmar)", lambda: [gestor.guardar_tareas(archivo)])
+    print(f"RSS maximo final: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+
+    gestor.almacen.cerrar()
+    for sufijo in ("", "-wal", "-shm"):
+        if os.path.exists(archivo + sufijo):
+            os.remove(archivo + sufijo)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,10 @@
-from models.gui import main
+import sys
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # `python main.py servidor [--puerto N ...]` arranca la API HTTP sin ventana
+    if sys.argv[1:2] == ['servidor']:
+        from models.servidor import main
+        main(sys.argv[2:])
+    else:
+        from models.gui import main
+        main()
@@ -0,0 +1,523 @@
+import heapq
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from datetime import datetime
+from itertools import chain, dropwhile, islice
+from typing import Callable, Dict, Iterable, List, Optional
+from models.tarea import Tarea, EstadoTarea, Prioridad
+from models.indices import IndiceSecundario, IndiceFechas, IndiceTexto, normalizar_categoria, normalizar_texto
+
+ORDEN_PRIORIDAD = {Prioridad.ALTA: 1, Prioridad.MEDIA: 2, Prioridad.BAJA: 3}
+ORDEN_ESTADO = {EstadoTarea.COMPLETADA: 1, EstadoTarea.EN_PROGRESO: 2, EstadoTarea.PENDIENTE: 3}
+
+CLAVES_ORDEN = {
+    'id': lambda tarea: tarea.id,
+    'fecha_creacion': lambda tarea: tarea.fecha_creacion,
+    'fecha_limite': lambda tarea: tarea.fecha_limite or datetime.max,
+    'prioridad': lambda tarea: ORDEN_PRIORIDAD.get(tarea.prioridad, 4),
+    'titulo': lambda tarea: tarea.titulo.lower(),
+    'estado': lambda tarea: ORDEN_ESTADO.get(tarea.estado, 4)
+}
+
+
+class VistasTareas(weakref.WeakValueDictionary):
+    """Tareas entregadas por id mientras alguien las use.
+
+    Varios lectores pueden construir a la vez la vista de un mismo id bajo
+    el cerrojo compartido; `adoptar` se queda con la primera que llega y la
+    devuelve a todos, asi cada id tiene un solo objeto.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._cerrojo = threading.Lock()
+
+    def adoptar(self, tarea: Tarea) -> Tarea:
+        with self._cerrojo:
+            existente = self.get(tarea.id)
+            if existente is not None:
+                return existente
+            self[tarea.id] = tarea
+            return tarea
+
+
+class AlmacenTareas(ABC):
+    """Donde guarda GestorTareas sus tareas y como las consulta.
+
+    El almacen asigna `observador` a cada tarea que entrega, de modo que los
+    cambios hechos sobre la tarea le llegan al gestor y, a traves de el, a
+    `tarea_modificada`.
+    """
+
+    def __init__(self, observador=None):
+        self.observador = observador
+
+    @abstractmethod
+    def agregar(self, tarea: Tarea):
+        # Si ya hay una tarea con ese id, la nueva la sustituye
+        pass
+
+    @abstractmethod
+    def quitar(self, tarea: Tarea):
+        pass
+
+    @abstractmethod
+    def obtener(self, id_tarea: int) -> Optional[Tarea]:
+        pass
+
+    @abstractmethod
+    def todas(self) -> List[Tarea]:
+        pass
+
+    @abstractmethod
+    def reemplazar(self, tareas: Iterable[Tarea]):
+        # Todo o nada: si `tareas` falla a mitad, el almacen conserva su contenido
+        pass
+
+    def confirmar(self):
+        # Almacenes con escritura diferida (p. ej. en disco) vuelcan aqui sus cambios
+        pass
+
+    def guardado_en(self, archivo: str) -> bool:
+        # True si el almacen ya escribe directamente en `archivo`
+        return False
+
+    # Operaciones por lotes: por defecto tarea a tarea; los almacenes que
+    # pueden hacerlo de una vez (indices, executemany...) las redefinen
+    def obtener_lote(self, ids: Iterable[int]) -> Dict[int, Tarea]:
+        # Las tareas que existen de `ids`, por id
+        tareas = {}
+        for id_tarea in ids:
+            tarea = self.obtener(id_tarea)
+            if tarea is not None:
+                tareas[id_tarea] = tarea
+        return tareas
+
+    def agregar_lote(self, tareas: List[Tarea]):
+        for tarea in tareas:
+            self.agregar(tarea)
+
+    @staticmethod
+    def _ultimas_por_id(tareas: List[Tarea]) -> List[Tarea]:
+        # Un id repetido en el lote se queda con su ultima tarea, en la
+        # posicion de esta, igual que si se agregaran una a una
+        ultima = {tarea.id: posicion for posicion, tarea in enumerate(tareas)}
+        if len(ultima) == len(tareas):
+            return tareas
+        return [tarea for posicion, tarea in enumerate(tareas) if ultima[tarea.id] == posicion]
+
+    def quitar_lote(self, tareas: List[Tarea]):
+        for tarea in tareas:
+            self.quitar(tarea)
+
+    def modificadas_lote(self, cambios: List[tuple]):
+        # cambios: (tarea, campo, valor anterior), ya aplicados sobre las tareas
+        for tarea, campo, anterior in cambios:
+            self.tarea_modificada(tarea, campo, anterior)
+
+    def actualizar_lote(self, cambios: List[tuple], ahora: datetime) -> List[tuple]:
+        # cambios: (id, {campo: valor}) con campos ya validados. Los asigna en
+        # las tareas que existen, con `ahora` como fecha_actualizacion, y
+        # devuelve (id, campo, valor nuevo) de cada campo que cambio
+        tareas = self.obtener_lote(id_tarea for id_tarea, _ in cambios)
+        modificaciones = []
+        asignar = object.__setattr__
+        for id_tarea, campos in cambios:
+            tarea = tareas.get(id_tarea)
+            if tarea is None:
+                continue
+            # Sin observador la tarea no avisa campo a campo; se avisa de
+            # todo junto con modificadas_lote
+            observador = tarea._observador
+            asignar(tarea, '_observador', None)
+            try:
+                for campo, valor in campos.items():
+                    anterior = getattr(tarea, campo)
+                    setattr(tarea, campo, valor)
+                    if anterior != valor:
+                        modificaciones.append((tarea, campo, anterior))
+                modificaciones.append((tarea, 'fecha_actualizacion', tarea.fecha_actualizacion))
+                tarea.fecha_actualizacion = ahora
+            finally:
+                asignar(tarea, '_observador', observador)
+        self.modificadas_lote(modificaciones)
+        return [(tarea.id, campo, getattr(tarea, campo)) for tarea, campo, _ in modificaciones]
+
+    def _asignar_observador(self, observador):
+        pass
+
+    def _reemplazar_en_copia(self, tareas: Iterable[Tarea]):
+        # Llena un almacen vacio del mismo tipo y solo al terminar adopta su
+        # estado, de modo que un error de lectura no deja el actual a medias
+        self._asignar_observador(None)
+        nuevo = type(self)(self.observador)
+        try:
+            for tarea in tareas:
+                nuevo.agregar(tarea)
+        except Exception:
+            nuevo._asignar_observador(None)
+            self._asignar_observador(self.observador)
+            raise
+        self.__dict__.update(nuevo.__dict__)
+
+    @abstractmethod
+    def tarea_modificada(self, tarea: Tarea, campo: str, anterior):
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def max_id(self) -> int:
+        pass
+
+    @abstractmethod
+    def filtrar_por_estado(self, estado: EstadoTarea) -> List[Tarea]:
+        pass
+
+    @abstractmethod
+    def filtrar_por_categoria(self, categoria: str) -> List[Tarea]:
+        pass
+
+    @abstractmethod
+    def filtrar_por_prioridad(self, prioridad: Prioridad) -> List[Tarea]:
+        pass
+
+    @abstractmethod
+    def filtrar_por_fecha_limite(self, fecha_inicio: datetime, fecha_fin: datetime) -> List[Tarea]:
+        pass
+
+    @abstractmethod
+    def obtener_vencidas(self, ahora: datetime) -> List[Tarea]:
+        pass
+
+    @abstractmethod
+    def buscar_por_texto(self, texto: str) -> Optional[List[Tarea]]:
+        pass
+
+    @abstractmethod
+    def contar_por_estado(self, estado: EstadoTarea) -> int:
+        pass
+
+    @abstractmethod
+    def ordenar(self, campo: str, ascendente: bool = True) -> List[Tarea]:
+        pass
+
+    @abstractmethod
+    def get_nombre(self) -> str:
+        pass
+
+    # --- Consultas combinadas ---
+    def _estimar(self, campo: str, valor) -> Optional[int]:
+        # Cuantas tareas deja pasar un filtro de igualdad, si sale barato saberlo
+        if campo == 'estado':
+            return self.contar_por_estado(valor)
+        return None
+
+    def _candidatas(self, campo: str, valor) -> Iterable[Tarea]:
+        # Tareas que cumplen un filtro de igualdad, en cualquier orden
+        return getattr(self, 'filtrar_por_' + campo)(valor)
+
+    def _ids_texto(self, texto: str) -> Optional[List[int]]:
+        # Ids que encuentra el indice de texto; None si no lo resuelve
+        return None
+
+    def _por_ids(self, ids: Iterable[int]) -> Iterable[Tarea]:
+        return map(self.obtener, ids)
+
+    def _recorrer_ordenadas(self, orden: str, ascendente: bool) -> Optional[Iterable[Tarea]]:
+        # Todas las tareas en el orden de consultar (empates por id), si el
+        # almacen ya mantiene ese orden; None si habria que ordenar
+        return None
+
+    def _condicion(self, campo: str, valor) -> Callable[[Tarea], bool]:
+        if campo == 'categoria':
+            normalizada = normalizar_categoria(valor)
+            return lambda tarea: normalizar_categoria(tarea.categoria) == normalizada
+        return lambda tarea: getattr(tarea, campo) == valor
+
+    def consultar(self, texto: str = '', estado: Optional[EstadoTarea] = None,
+                  categoria: Optional[str] = None, prioridad: Optional[Prioridad] = None,
+                  orden: str = 'id', ascendente: bool = True,
+                  limite: Optional[int] = None, desplazamiento: int = 0,
+                  despues_de: Optional[tuple] = None) -> List[Tarea]:
+        """Filtra, busca y ordena en una sola pasada.
+
+        Parte del filtro mas selectivo (el indice de texto o el filtro de
+        igualdad con menos tareas) y comprueba los demas sobre la marcha, sin
+        listas intermedias. Con `limite` solo se seleccionan las primeras
+        `desplazamiento + limite` con un monticulo en vez de ordenar todo.
+        Si el almacen mantiene ya el orden pedido y los filtros dejan pasar
+        muchas tareas, se recorre ese orden filtrando y se para al llenar la
+        pagina. Los empates se deshacen por id.
+
+        `despues_de` es (clave, id) de la ultima tarea de la pagina anterior,
+        con la clave de CLAVES_ORDEN[orden]: la consulta sigue justo detras
+        de ella aunque entretanto se hayan creado o borrado tareas.
+        """
+        condiciones = []
+        accesos = []
+        total = len(self)
+        for campo, valor in (('estado', estado), ('categoria', categoria), ('prioridad', prioridad)):
+            if valor is None:
+                continue
+            estimacion = self._estimar(campo, valor)
+            if estimacion == 0:
+                return []
+            accesos.append((total if estimacion is None else estimacion, campo, valor))
+
+        ids = None
+        if texto:
+            ids = self._ids_texto(texto)
+            if ids is None:
+                # Sin indice (o sin palabras): subcadena sin distinguir
+                # mayusculas ni acentos, como el indice; asi el resultado solo
+                # depende de normalizar_texto(texto), que es la clave de la
+                # cache del gestor
+                subcadena = normalizar_texto(texto)
+                condiciones.append(lambda tarea: subcadena in normalizar_texto(tarea.titulo)
+                                   or subcadena in normalizar_texto(tarea.descripcion))
+            elif not ids:
+                return []
+
+        accesos.sort(key=lambda acceso: acceso[0])
+        estimacion = min(total, accesos[0][0] if accesos else total,
+                         total if ids is None else len(ids))
+        posterior = None if despues_de is None else self._posterior(orden, ascendente, despues_de)
+        en_orden = self._recorrer_ordenadas(orden, ascendente)
+        if en_orden is not None and self._conviene_recorrer(total, estimacion, limite, desplazamiento):
+            if posterior is not None:
+                # El recorrido va en orden: basta saltar hasta el cursor
+                en_orden = dropwhile(lambda tarea: not posterior(tarea), en_orden)
+            if ids is not None:
+                conjunto = set(ids)
+                condiciones.append(lambda tarea: tarea.id in conjunto)
+            condiciones.extend(self._condicion(campo, valor) for _, campo, valor in accesos)
+            for condicion in condiciones:
+                en_orden = filter(condicion, en_orden)
+            fin = None if limite is None else desplazamiento + limite
+            return list(islice(en_orden, desplazamiento, fin))
+
+        if ids is not None and (not accesos or len(ids) <= accesos[0][0]):
+            candidatas = self._por_ids(ids)
+        else:
+            if ids is not None:
+                conjunto = set(ids)
+                condiciones.append(lambda tarea: tarea.id in conjunto)
+            if accesos:
+                _, campo, valor = accesos.pop(0)
+                candidatas = self._candidatas(campo, valor)
+            else:
+                candidatas = self.todas()
+        condiciones.extend(self._condicion(campo, valor) for _, campo, valor in accesos)
+        if posterior is not None:
+            condiciones.append(posterior)
+        for condicion in condiciones:
+            candidatas = filter(condicion, candidatas)
+
+        clave = CLAVES_ORDEN[orden]
+        if limite is None:
+            # Dos ordenaciones estables: por id (casi gratis, las candidatas
+            # suelen llegar ya en ese orden) y por la clave, sin crear tuplas
+            resultado = sorted(candidatas, key=CLAVES_ORDEN['id'])
+            if orden != 'id':
+                resultado.sort(key=clave, reverse=not ascendente)
+            elif not ascendente:
+                resultado.reverse()
+            return resultado[desplazamiento:] if desplazamiento else resultado
+        if orden == 'id':
+            clave_total = clave
+        elif ascendente:
+            clave_total = lambda tarea: (clave(tarea), tarea.id)
+        else:
+            clave_total = lambda tarea: (clave(tarea), -tarea.id)
+        seleccionar = heapq.nsmallest if ascendente else heapq.nlargest
+        return seleccionar(desplazamiento + limite, candidatas, key=clave_total)[desplazamiento:]
+
+    @staticmethod
+    def _posterior(orden: str, ascendente: bool, despues_de: tuple) -> Callable[[Tarea], bool]:
+        # Si la tarea va detras de `despues_de` en el orden de consultar:
+        # clave en el sentido pedido y, a igual clave, id ascendente
+        clave = CLAVES_ORDEN[orden]
+        limite, id_limite = despues_de
+        if orden == 'id':
+            return (lambda tarea: tarea.id > id_limite) if ascendente else (lambda tarea: tarea.id < id_limite)
+        if ascendente:
+            return lambda tarea: (clave(tarea), tarea.id) > (limite, id_limite)
+
+        def posterior(tarea):
+            valor = clave(tarea)
+            return valor < limite or (valor == limite and tarea.id > id_limite)
+        return posterior
+
+    @staticmethod
+    def _conviene_recorrer(total: int, estimacion: int, limite: Optional[int],
+                           desplazamiento: int) -> bool:
+        # Recorrer el orden mantenido cuesta comprobar los filtros en cada
+        # tarea visitada; ordenar las candidatas, una clave y comparaciones
+        # por cada una, mas o menos el doble. Con `limite` el recorrido para
+        # al llenar la pagina, tras unas (desplazamiento + limite) * total /
+        # estimacion tareas
+        visitadas = total
+        if limite is not None:
+            visitadas = min(total, (desplazamiento + limite) * total // max(estimacion, 1))
+        return visitadas <= 2 * estimacion
+
+
+class AlmacenMemoria(AlmacenTareas):
+    """Tareas como objetos en un dict id -> Tarea con indices secundarios.
+
+    El dict conserva el orden de insercion y permite borrar en O(1); los
+    indices se mantienen de forma incremental cuando cambia una tarea.
+    """
+
+    def __init__(self, observador=None):
+        super().__init__(observador)
+        self._tareas: Dict[int, Tarea] = {}
+        self._indice_estado = IndiceSecundario('estado')
+        self._indice_categoria = IndiceSecundario('categoria', normalizar_categoria)
+        self._indice_prioridad = IndiceSecundario('prioridad')
+        self._indice_fecha_limite = IndiceFechas('fecha_limite')
+        # Solo las tareas no completadas: las vencidas son un prefijo
+        self._indice_vencimiento = IndiceFechas(
+            'fecha_limite', incluir=lambda tarea: tarea.estado != EstadoTarea.COMPLETADA)
+        self._indice_texto = IndiceTexto()
+        self._indices = [
+            self._indice_estado,
+            self._indice_categoria,
+            self._indice_prioridad,
+            self._indice_fecha_limite,
+            self._indice_vencimiento,
+            self._indice_texto
+        ]
+        self._indices_por_campo: Dict[str, list] = {}
+        for indice in self._indices:
+            for campo in indice.campos:
+                self._indices_por_campo.setdefault(campo, []).append(indice)
+
+    def agregar(self, tarea: Tarea):
+        anterior = self._tareas.get(tarea.id)
+        if anterior is not None:
+            self.quitar(anterior)
+        self._tareas[tarea.id] = tarea
+        for indice in self._indices:
+            indice.agregar(tarea)
+        tarea._observador = self.observador
+
+    def quitar(self, tarea: Tarea):
+        tarea._observador = None
+        del self._tareas[tarea.id]
+        for indice in self._indices:
+            indice.quitar(tarea)
+
+    def agregar_lote(self, tareas: List[Tarea]):
+        tareas = self._ultimas_por_id(tareas)
+        anteriores = [self._tareas[tarea.id] for tarea in tareas if tarea.id in self._tareas]
+        if anteriores:
+            self.quitar_lote(anteriores)
+        for tarea in tareas:
+            self._tareas[tarea.id] = tarea
+            tarea._observador = self.observador
+        for indice in self._indices:
+            indice.agregar_lote(tareas)
+
+    def quitar_lote(self, tareas: List[Tarea]):
+        for tarea in tareas:
+            tarea._observador = None
+            del self._tareas[tarea.id]
+        for indice in self._indices:
+            indice.quitar_lote(tareas)
+
+    def modificadas_lote(self, cambios: List[tuple]):
+        for indice in self._indices:
+            indice.modificadas_lote(cambios)
+
+    def obtener(self, id_tarea: int) -> Optional[Tarea]:
+        return self._tareas.get(id_tarea)
+
+    def todas(self) -> List[Tarea]:
+        return list(self._tareas.values())
+
+    def reemplazar(self, tareas: Iterable[Tarea]):
+        self._reemplazar_en_copia(tareas)
+
+    def _asignar_observador(self, observador):
+        for tarea in self._tareas.values():
+            tarea._observador = observador
+
+    def tarea_modificada(self, tarea: Tarea, campo: str, anterior):
+        for indice in self._indices_por_campo.get(campo, ()):
+            indice.tarea_modificada(tarea, campo, anterior)
+
+    def __len__(self) -> int:
+        return len(self._tareas)
+
+    def max_id(self) -> int:
+        return max(self._tareas, default=0)
+
+    def filtrar_por_estado(self, estado: EstadoTarea) -> List[Tarea]:
+        return self._indice_estado.obtener(estado)
+
+    def filtrar_por_categoria(self, categoria: str) -> List[Tarea]:
+        return self._indice_categoria.obtener(categoria)
+
+    def filtrar_por_prioridad(self, prioridad: Prioridad) -> List[Tarea]:
+        return self._indice_prioridad.obtener(prioridad)
+
+    def filtrar_por_fecha_limite(self, fecha_inicio: datetime, fecha_fin: datetime) -> List[Tarea]:
+        return self._indice_fecha_limite.rango(fecha_inicio, fecha_fin)
+
+    def obtener_vencidas(self, ahora: datetime) -> List[Tarea]:
+        return self._indice_vencimiento.anteriores_a(ahora)
+
+    def buscar_por_texto(self, texto: str) -> Optional[List[Tarea]]:
+        ids = self._indice_texto.buscar_ids(texto)
+        if ids is None:
+            return None
+        return [self._tareas[id_tarea] for id_tarea in ids]
+
+    def contar_por_estado(self, estado: EstadoTarea) -> int:
+        return self._indice_estado.contar(estado)
+
+    def _estimar(self, campo: str, valor) -> Optional[int]:
+        return getattr(self, '_indice_' + campo).contar(valor)
+
+    def _candidatas(self, campo: str, valor) -> Iterable[Tarea]:
+        return getattr(self, '_indice_' + campo).valores(valor)
+
+    def _ids_texto(self, texto: str) -> Optional[List[int]]:
+        return self._indice_texto.buscar_ids(texto)
+
+    def _por_ids(self, ids: Iterable[int]) -> Iterable[Tarea]:
+        return map(self._tareas.__getitem__, ids)
+
+    def _recorrer_ordenadas(self, orden: str, ascendente: bool) -> Optional[Iterable[Tarea]]:
+        if orden != 'fecha_limite':
+            return None
+        # Las tareas sin fecha van detras de todas, como datetime.max en
+        # CLAVES_ORDEN, y solo se buscan si el recorrido llega a ellas
+        con_fecha = self._indice_fecha_limite.recorrer(ascendente)
+
+        def partes():
+            if ascendente:
+                yield con_fecha
+            if len(self._indice_fecha_limite) < len(self._tareas):
+                yield sorted((tarea for tarea in self._tareas.values() if tarea.fecha_limite is None),
+                             key=CLAVES_ORDEN['id'])
+            if not ascendente:
+                yield con_fecha
+        return chain.from_iterable(partes())
+
+    def ordenar(self, campo: str, ascendente: bool = True) -> List[Tarea]:
+        if campo == 'fecha_limite':
+            sin_fecha = []
+            if len(self._indice_fecha_limite) < len(self._tareas):
+                sin_fecha = [tarea for tarea in self._tareas.values() if tarea.fecha_limite is None]
+            con_fecha = self._indice_fecha_limite.ordenadas(ascendente)
+            return con_fecha + sin_fecha if ascendente else sin_fecha + con_fecha
+        return sorted(self._tareas.values(), key=CLAVES_ORDEN[campo], reverse=not ascendente)
+
+    def get_nombre(self) -> str:
+        return "Memoria"
@@ -0,0 +1,431 @@
+import sys
+from array import array
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+from models.tarea import Tarea, EstadoTarea, Prioridad
+from models.indices import IndiceTexto
+from models.almacen import AlmacenTareas, VistasTareas
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Los codigos siguen el orden de ordenar_por_estado / ordenar_por_prioridad,
+# asi ordenar por la columna equivale a ordenar por el enum
+ESTADOS = [EstadoTarea.COMPLETADA, EstadoTarea.EN_PROGRESO, EstadoTarea.PENDIENTE]
+PRIORIDADES = [Prioridad.ALTA, Prioridad.MEDIA, Prioridad.BAJA]
+CODIGO_ESTADO = {estado: codigo for codigo, estado in enumerate(ESTADOS)}
+CODIGO_PRIORIDAD = {prioridad: codigo for codigo, prioridad in enumerate(PRIORIDADES)}
+
+# Columnas de array, en el orden en que se compactan
+COLUMNAS = ('_ids', '_estado', '_prioridad', '_categoria', '_fecha_limite',
+            '_fecha_creacion', '_fecha_actualizacion')
+CAMPOS_FECHA = ('fecha_limite', 'fecha_creacion', 'fecha_actualizacion')
+
+# Estado de las filas borradas; se descartan al compactar
+FILA_BORRADA = -1
+# Fecha limite ausente: ordena despues de cualquier fecha, como datetime.max
+SIN_FECHA = 2 ** 63 - 1
+
+EPOCA = datetime(1970, 1, 1)
+MICROSEGUNDO = timedelta(microseconds=1)
+
+
+def a_epoca(fecha: Optional[datetime], ausente: Optional[int] = SIN_FECHA) -> Optional[int]:
+    # Microsegundos desde la epoca; `ausente` representa la fecha que falta
+    # (SQLite usa NULL y la instantanea binaria su propia marca)
+    if fecha is None:
+        return ausente
+    return (fecha - EPOCA) // MICROSEGUNDO
+
+
+def desde_epoca(valor: Optional[int]) -> Optional[datetime]:
+    if valor is None or valor == SIN_FECHA:
+        return None
+    # timedelta posicional: la mitad de coste que con microseconds=
+    return EPOCA + timedelta(0, 0, valor)
+
+
+class AlmacenColumnar(AlmacenTareas):
+    """Tareas guardadas por columnas para colecciones muy grandes.
+
+    Estado y prioridad son codigos int8, las fechas microsegundos desde la
+    epoca en int64 y la categoria un codigo de diccionario. Los objetos Tarea
+    solo se construyen al acceder a ellos y se comparten mientras alguien los
+    use; sus cambios vuelven a las columnas via `tarea_modificada`. Filtros,
+    conteos y ordenaciones usan NumPy si esta instalado y recorren las
+    columnas en Python si no.
+    """
+
+    def __init__(self, observador=None):
+        super().__init__(observador)
+        self._texto = IndiceTexto()
+        self._vistas = VistasTareas()
+        self._limpiar_columnas()
+
+    def _limpiar_columnas(self):
+        self._ids = array('q')
+        self._estado = array('b')
+        self._prioridad = array('b')
+        self._categoria = array('i')
+        self._fecha_limite = array('q')
+        self._fecha_creacion = array('q')
+        self._fecha_actualizacion = array('q')
+        self._titulo: List[str] = []
+        self._descripcion: List[str] = []
+        self._fila_por_id: Dict[int, int] = {}
+        self._categorias: List[str] = []
+        self._codigo_categoria: Dict[str, int] = {}
+        self._borradas = 0
+
+    def _codificar_categoria(self, categoria: str) -> int:
+        codigo = self._codigo_categoria.get(categoria)
+        if codigo is None:
+            codigo = self._codigo_categoria[categoria] = len(self._categorias)
+            self._categorias.append(categoria)
+        return codigo
+
+    def _materializar(self, fila: int) -> Tarea:
+        id_tarea = self._ids[fila]
+        tarea = self._vistas.get(id_tarea)
+        if tarea is None:
+            tarea = Tarea.desde_campos(
+                id_tarea,
+                self._titulo[fila],
+                self._descripcion[fila],
+                self._categorias[self._categoria[fila]],
+                desde_epoca(self._fecha_limite[fila]),
+                ESTADOS[self._estado[fila]],
+                PRIORIDADES[self._prioridad[fila]],
+                desde_epoca(self._fecha_creacion[fila]),
+                desde_epoca(self._fecha_actualizacion[fila])
+            )
+            tarea._observador = self.observador
+            tarea = self._vistas.adoptar(tarea)
+        return tarea
+
+    def _materializar_filas(self, filas) -> List[Tarea]:
+        # Lo mismo que _materializar fila a fila, con las columnas en locales
+        ids, vistas, observador = self._ids, self._vistas, self.observador
+        titulo, descripcion, categorias = self._titulo, self._descripcion, self._categorias
+        categoria, estado, prioridad = self._categoria, self._estado, self._prioridad
+        limite, creacion, actualizacion = self._fecha_limite, self._fecha_creacion, self._fecha_actualizacion
+        desde_campos = Tarea.desde_campos
+        tareas = []
+        for fila in filas:
+            fila = int(fila)
+            id_tarea = ids[fila]
+            tarea = vistas.get(id_tarea)
+            if tarea is None:
+                tarea = desde_campos(
+                    id_tarea, titulo[fila], descripcion[fila], categorias[categoria[fila]],
+                    desde_epoca(limite[fila]), ESTADOS[estado[fila]], PRIORIDADES[prioridad[fila]],
+                    desde_epoca(creacion[fila]), desde_epoca(actualizacion[fila]))
+                tarea._observador = observador
+                tarea = vistas.adoptar(tarea)
+            tareas.append(tarea)
+        return tareas
+
+    def agregar(self, tarea: Tarea):
+        if tarea.id in self._fila_por_id:
+            self.quitar(self.obtener(tarea.id))
+        self._fila_por_id[tarea.id] = len(self._ids)
+        self._ids.append(tarea.id)
+        self._estado.append(CODIGO_ESTADO[tarea.estado])
+        self._prioridad.append(CODIGO_PRIORIDAD[tarea.prioridad])
+        self._categoria.append(self._codificar_categoria(tarea.categoria))
+        self._fecha_limite.append(a_epoca(tarea.fecha_limite))
+        self._fecha_creacion.append(a_epoca(tarea.fecha_creacion))
+        self._fecha_actualizacion.append(a_epoca(tarea.fecha_actualizacion))
+        self._titulo.append(tarea.titulo)
+        self._descripcion.append(tarea.descripcion)
+        self._texto.agregar(tarea)
+        self._vistas[tarea.id] = tarea
+        tarea._observador = self.observador
+
+    def quitar(self, tarea: Tarea):
+        tarea._observador = None
+        fila = self._fila_por_id.pop(tarea.id)
+        self._vistas.pop(tarea.id, None)
+        self._texto.quitar(tarea)
+        self._estado[fila] = FILA_BORRADA
+        self._titulo[fila] = self._descripcion[fila] = None
+        self._borradas += 1
+        self._compactar_si_conviene()
+
+    # --- Lotes: cada columna se escribe de una vez ---
+    def agregar_lote(self, tareas: List[Tarea]):
+        tareas = self._ultimas_por_id(tareas)
+        # Primero se codifica todo: si una tarea falla, ninguna columna cambia
+        ids = [tarea.id for tarea in tareas]
+        codificar = self._codificar_categoria
+        valores = {
+            '_ids': ids,
+            '_estado': [CODIGO_ESTADO[tarea.estado] for tarea in tareas],
+            '_prioridad': [CODIGO_PRIORIDAD[tarea.prioridad] for tarea in tareas],
+            '_categoria': [codificar(tarea.categoria) for tarea in tareas],
+        }
+        for campo in CAMPOS_FECHA:
+            valores['_' + campo] = [a_epoca(getattr(tarea, campo)) for tarea in tareas]
+        fila_por_id = self._fila_por_id
+        anteriores = [self.obtener(id_tarea) for id_tarea in ids if id_tarea in fila_por_id]
+        if anteriores:
+            self.quitar_lote(anteriores)
+        primera = len(self._ids)
+        for nombre, columna in valores.items():
+            getattr(self, nombre).extend(columna)
+        self._titulo.extend([tarea.titulo for tarea in tareas])
+        self._descripcion.extend([tarea.descripcion for tarea in tareas])
+        self._fila_por_id.update(zip(ids, range(primera, primera + len(ids))))
+        self._texto.agregar_lote(tareas)
+        vistas = self._vistas
+        observador = self.observador
+        for tarea in tareas:
+            vistas[tarea.id] = tarea
+            tarea._observador = observador
+
+    def quitar_lote(self, tareas: List[Tarea]):
+        fila_por_id = self._fila_por_id
+        vistas = self._vistas
+        filas = []
+        for tarea in tareas:
+            tarea._observador = None
+            filas.append(fila_por_id.pop(tarea.id))
+            vistas.pop(tarea.id, None)
+        self._texto.quitar_lote(tareas)
+        self._escribir_columna(self._estado, filas, [FILA_BORRADA] * len(filas))
+        for fila in filas:
+            self._titulo[fila] = self._descripcion[fila] = None
+        self._borradas += len(filas)
+        self._compactar_si_conviene()
+
+    def modificadas_lote(self, cambios: List[tuple]):
+        # Por campo, el valor final de cada tarea tocada
+        por_campo: Dict[str, Dict[int, Tarea]] = {}
+        for tarea, campo, _ in cambios:
+            por_campo.setdefault(campo, {})[tarea.id] = tarea
+        for campo, tareas in por_campo.items():
+            codificar = self._codificador(campo)
+            self._escribir_columna(
+                getattr(self, '_' + campo), [self._fila_por_id[id_tarea] for id_tarea in tareas],
+                [codificar(getattr(tarea, campo)) for tarea in tareas.values()])
+        self._texto.modificadas_lote(cambios)
+
+    def actualizar_lote(self, cambios: List[tuple], ahora: datetime) -> List[tuple]:
+        # Se compara y se escribe sobre los codigos de cada columna sin
+        # construir una vista por tarea; solo se ponen al dia las vistas que
+        # alguien mantiene vivas. Todo se codifica antes de escribir nada
+        fila_por_id, vistas = self._fila_por_id, self._vistas
+        codificadores = {}
+        escrituras: Dict[str, Dict[int, object]] = {}
+        modificaciones = []
+        en_vistas = []
+        reindexar = {}
+        fecha = a_epoca(ahora)
+        for id_tarea, campos in cambios:
+            fila = fila_por_id.get(id_tarea)
+            if fila is None:
+                continue
+            vista = vistas.get(id_tarea)
+            for campo, valor in campos.items():
+                codificar = codificadores.get(campo)
+                if codificar is None:
+                    codificar = codificadores[campo] = self._codificador(campo)
+                codigo = codificar(valor)
+                columna = escrituras.setdefault(campo, {})
+                if columna.get(fila, getattr(self, '_' + campo)[fila]) == codigo:
+                    continue
+                columna[fila] = codigo
+                modificaciones.append((id_tarea, campo, valor))
+                if vista is not None:
+                    en_vistas.append((vista, campo, valor))
+                if campo in IndiceTexto.campos:
+                    reindexar[id_tarea] = fila
+            escrituras.setdefault('fecha_actualizacion', {})[fila] = fecha
+            modificaciones.append((id_tarea, 'fecha_actualizacion', ahora))
+            if vista is not None:
+                en_vistas.append((vista, 'fecha_actualizacion', ahora))
+        for campo, columna in escrituras.items():
+            self._escribir_columna(getattr(self, '_' + campo), list(columna), list(columna.values()))
+        # Sin pasar por el observador: el gestor anota los cambios devueltos
+        asignar = object.__setattr__
+        for vista, campo, valor in en_vistas:
+            asignar(vista, campo, sys.intern(valor) if campo == 'categoria' else valor)
+        self._texto.modificadas_lote([(tarea, 'titulo', None)
+                                      for tarea in self._materializar_filas(reindexar.values())])
+        return modificaciones
+
+    def _codificador(self, campo: str) -> Callable[[object], object]:
+        # Del valor de la tarea al que se guarda en la columna de `campo`
+        if campo == 'estado':
+            return CODIGO_ESTADO.__getitem__
+        if campo == 'prioridad':
+            return CODIGO_PRIORIDAD.__getitem__
+        if campo == 'categoria':
+            return self._codificar_categoria
+        if campo in CAMPOS_FECHA:
+            return a_epoca
+        return lambda valor: valor
+
+    def _escribir_columna(self, columna, filas: list, valores: list):
+        if np is not None and isinstance(columna, array):
+            np.frombuffer(columna, dtype=columna.typecode)[filas] = valores
+            return
+        for fila, valor in zip(filas, valores):
+            columna[fila] = valor
+
+    def _compactar_si_conviene(self):
+        if self._borradas > 1024 and self._borradas > len(self._fila_por_id):
+            self._compactar()
+
+    def _compactar(self):
+        # Una seleccion por columna de las filas vivas
+        vivas = self._filas_vivas()
+        for nombre in COLUMNAS:
+            columna = getattr(self, nombre)
+            if np is not None:
+                compacta = array(columna.typecode)
+                compacta.frombytes(np.frombuffer(columna, dtype=columna.typecode)[vivas].tobytes())
+            else:
+                compacta = array(columna.typecode, (columna[fila] for fila in vivas))
+            setattr(self, nombre, compacta)
+        if np is not None:
+            vivas = vivas.tolist()
+        self._titulo = [self._titulo[fila] for fila in vivas]
+        self._descripcion = [self._descripcion[fila] for fila in vivas]
+        self._fila_por_id = dict(zip(self._ids, range(len(self._ids))))
+        self._borradas = 0
+
+    def obtener(self, id_tarea: int) -> Optional[Tarea]:
+        fila = self._fila_por_id.get(id_tarea)
+        return None if fila is None else self._materializar(fila)
+
+    def todas(self) -> List[Tarea]:
+        return self._materializar_filas(self._filas_vivas())
+
+    def reemplazar(self, tareas: Iterable[Tarea]):
+        self._reemplazar_en_copia(tareas)
+
+    def _asignar_observador(self, observador):
+        for tarea in list(self._vistas.values()):
+            tarea._observador = observador
+
+    def tarea_modificada(self, tarea: Tarea, campo: str, anterior):
+        fila = self._fila_por_id[tarea.id]
+        valor = getattr(tarea, campo)
+        if campo == 'estado':
+            self._estado[fila] = CODIGO_ESTADO[valor]
+        elif campo == 'prioridad':
+            self._prioridad[fila] = CODIGO_PRIORIDAD[valor]
+        elif campo == 'categoria':
+            self._categoria[fila] = self._codificar_categoria(valor)
+        elif campo in ('fecha_limite', 'fecha_creacion', 'fecha_actualizacion'):
+            getattr(self, '_' + campo)[fila] = a_epoca(valor)
+        elif campo in ('titulo', 'descripcion'):
+            getattr(self, '_' + campo)[fila] = valor
+            self._texto.tarea_modificada(tarea, campo, anterior)
+
+    def __len__(self) -> int:
+        return len(self._fila_por_id)
+
+    def max_id(self) -> int:
+        return max(self._fila_por_id, default=0)
+
+    # --- Operaciones sobre columnas ---
+    def _filas_vivas(self):
+        if np is not None:
+            return np.flatnonzero(np.frombuffer(self._estado, dtype=np.int8) != FILA_BORRADA)
+        return [fila for fila, codigo in enumerate(self._estado) if codigo != FILA_BORRADA]
+
+    def _filas_con_codigo(self, columna: array, codigos) -> list:
+        if np is not None:
+            valores = np.frombuffer(columna, dtype=columna.typecode)
+            mascara = np.isin(valores, list(codigos))
+            if columna is not self._estado:
+                mascara &= np.frombuffer(self._estado, dtype=np.int8) != FILA_BORRADA
+            return np.flatnonzero(mascara)
+        estado = self._estado
+        return [fila for fila, codigo in enumerate(columna)
+                if codigo in codigos and estado[fila] != FILA_BORRADA]
+
+    def _ordenar_filas(self, filas, columna: array, ascendente: bool = True):
+        # Ordenacion estable por la columna, desempatando por posicion
+        if np is not None:
+            filas = np.asarray(filas, dtype=np.int64)
+            valores = np.frombuffer(columna, dtype=columna.typecode)[filas]
+            orden = np.argsort(valores if ascendente else -valores.astype(np.int64), kind='stable')
+            return filas[orden]
+        return sorted(filas, key=columna.__getitem__, reverse=not ascendente)
+
+    def _filas_fecha_limite(self, desde: int, hasta: int, excluir_completadas: bool = False):
+        if np is not None:
+            fechas = np.frombuffer(self._fecha_limite, dtype=np.int64)
+            estado = np.frombuffer(self._estado, dtype=np.int8)
+            mascara = (fechas >= desde) & (fechas <= hasta) & (estado != FILA_BORRADA)
+            if excluir_completadas:
+                mascara &= estado != CODIGO_ESTADO[EstadoTarea.COMPLETADA]
+            filas = np.flatnonzero(mascara)
+        else:
+            completada = CODIGO_ESTADO[EstadoTarea.COMPLETADA] if excluir_completadas else FILA_BORRADA
+            estado = self._estado
+            filas = [fila for fila, fecha in enumerate(self._fecha_limite)
+                     if desde <= fecha <= hasta and estado[fila] not in (FILA_BORRADA, completada)]
+        return self._ordenar_filas(filas, self._fecha_limite)
+
+    def filtrar_por_estado(self, estado: EstadoTarea) -> List[Tarea]:
+        return self._materializar_filas(self._filas_con_codigo(self._estado, {CODIGO_ESTADO[estado]}))
+
+    def filtrar_por_categoria(self, categoria: str) -> List[Tarea]:
+        categoria = categoria.lower()
+        codigos = {codigo for codigo, valor in enumerate(self._categorias) if valor.lower() == categoria}
+        if not codigos:
+            return []
+        return self._materializar_filas(self._filas_con_codigo(self._categoria, codigos))
+
+    def filtrar_por_prioridad(self, prioridad: Prioridad) -> List[Tarea]:
+        return self._materializar_filas(
+            self._filas_con_codigo(self._prioridad, {CODIGO_PRIORIDAD[prioridad]}))
+
+    def filtrar_por_fecha_limite(self, fecha_inicio: datetime, fecha_fin: datetime) -> List[Tarea]:
+        return self._materializar_filas(
+            self._filas_fecha_limite(a_epoca(fecha_inicio), a_epoca(fecha_fin)))
+
+    def obtener_vencidas(self, ahora: datetime) -> List[Tarea]:
+        return self._materializar_filas(
+            self._filas_fecha_limite(-SIN_FECHA, a_epoca(ahora) - 1, excluir_completadas=True))
+
+    def buscar_por_texto(self, texto: str) -> Optional[List[Tarea]]:
+        ids = self._texto.buscar_ids(texto)
+        if ids is None:
+            return None
+        return [self._materializar(self._fila_por_id[id_tarea]) for id_tarea in ids]
+
+    def _ids_texto(self, texto: str) -> Optional[List[int]]:
+        return self._texto.buscar_ids(texto)
+
+    def _por_ids(self, ids: Iterable[int]) -> Iterable[Tarea]:
+        return (self._materializar(self._fila_por_id[id_tarea]) for id_tarea in ids)
+
+    def obtener_lote(self, ids: Iterable[int]) -> Dict[int, Tarea]:
+        fila_por_id = self._fila_por_id
+        filas = [fila for fila in map(fila_por_id.get, ids) if fila is not None]
+        return {tarea.id: tarea for tarea in self._materializar_filas(filas)}
+
+    def contar_por_estado(self, estado: EstadoTarea) -> int:
+        codigo = CODIGO_ESTADO[estado]
+        if np is not None:
+            return int(np.count_nonzero(np.frombuffer(self._estado, dtype=np.int8) == codigo))
+        return self._estado.count(codigo)
+
+    def ordenar(self, campo: str, ascendente: bool = True) -> List[Tarea]:
+        filas = self._filas_vivas()
+        if campo == 'titulo':
+            titulos = self._titulo
+            filas = sorted(filas, key=lambda fila: titulos[fila].lower(), reverse=not ascendente)
+        else:
+            filas = self._ordenar_filas(filas, getattr(self, '_' + campo), ascendente)
+        return self._materializar_filas(filas)
+
+    def get_nombre(self) -> str:
+        return "Columnar"
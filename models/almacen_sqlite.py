@@ -0,0 +1,329 @@
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from models.tarea import Tarea, EstadoTarea, Prioridad
+from models.almacen import AlmacenTareas, VistasTareas, ORDEN_ESTADO, ORDEN_PRIORIDAD
+from models.indices import tokenizar
+from models.almacen_columnar import a_epoca
+from persistence.sqlite_persistence import (
+    ACTUALIZAR_O_INSERTAR, COLUMNAS, INSERTAR, conectar, reescribir_tareas, tiene_indice_texto, tarea_a_fila, tarea_desde_fila)
+
+# Sentencias de tarea_modificada: cada campo con las columnas que deriva
+ACTUALIZACIONES = {
+    'titulo': ("UPDATE tareas SET titulo = ?, titulo_orden = ? WHERE id = ?",
+               lambda valor: (valor, valor.lower())),
+    'descripcion': ("UPDATE tareas SET descripcion = ? WHERE id = ?", lambda valor: (valor,)),
+    'categoria': ("UPDATE tareas SET categoria = ?, categoria_normalizada = ? WHERE id = ?",
+                  lambda valor: (valor, valor.lower())),
+    'estado': ("UPDATE tareas SET estado = ? WHERE id = ?", lambda valor: (ORDEN_ESTADO[valor],)),
+    'prioridad': ("UPDATE tareas SET prioridad = ? WHERE id = ?",
+                  lambda valor: (ORDEN_PRIORIDAD[valor],)),
+}
+ACTUALIZACIONES.update({
+    campo: (f"UPDATE tareas SET {campo} = ? WHERE id = ?", lambda valor: (a_epoca(valor, None),))
+    for campo in ('fecha_limite', 'fecha_creacion', 'fecha_actualizacion')
+})
+
+# Ids por sentencia en obtener_lote, por debajo del limite de parametros de SQLite
+BLOQUE_IDS = 500
+
+# ORDER BY de ordenar(); el id desempata igual que la ordenacion estable en memoria
+ORDENES = {
+    'id': ("id", "id DESC"),
+    'fecha_creacion': ("fecha_creacion, id", "fecha_creacion DESC, id"),
+    'fecha_limite': ("fecha_limite IS NULL, fecha_limite, id",
+                     "fecha_limite IS NULL DESC, fecha_limite DESC, id"),
+    'prioridad': ("prioridad, id", "prioridad DESC, id"),
+    'titulo': ("titulo_orden, id", "titulo_orden DESC, id"),
+    'estado': ("estado, id", "estado DESC, id"),
+}
+# Columna de cada orden y como se guarda en ella la clave de CLAVES_ORDEN
+COLUMNAS_ORDEN = {
+    'fecha_creacion': ("fecha_creacion", a_epoca),
+    'prioridad': ("prioridad", int),
+    'titulo': ("titulo_orden", str),
+    'estado': ("estado", int),
+}
+
+
+class AlmacenSQLite(AlmacenTareas):
+    """Tareas en una base SQLite consultada con SQL indexado.
+
+    Filtros, ordenaciones, conteos y busqueda de texto (FTS5) se resuelven en
+    la base y solo se construyen las tareas del resultado, asi la coleccion
+    puede ser mayor que la memoria. Como en AlmacenColumnar, las tareas
+    entregadas se comparten mientras alguien las use y sus cambios se
+    escriben con `tarea_modificada`. Las escrituras se confirman cada
+    `lote_confirmacion` cambios y en `confirmar()`.
+    """
+
+    def __init__(self, archivo: str = ':memory:', observador=None, lote_confirmacion: int = 1000):
+        super().__init__(observador)
+        self.archivo = archivo
+        self.lote_confirmacion = lote_confirmacion
+        # Compartida para poder usarlo detras de GestorTareasConcurrente
+        self._conexion = conectar(archivo, compartida=True)
+        self._texto = tiene_indice_texto(self._conexion)
+        self._vistas = VistasTareas()
+        self._total = self._conexion.execute("SELECT COUNT(*) FROM tareas").fetchone()[0]
+        self._pendientes = 0
+
+    def _escrito(self, cambios: int = 1):
+        self._pendientes += cambios
+        if self._pendientes >= self.lote_confirmacion:
+            self.confirmar()
+
+    def confirmar(self):
+        self._conexion.commit()
+        self._pendientes = 0
+
+    def guardado_en(self, archivo: str) -> bool:
+        return self.archivo != ':memory:' and os.path.abspath(archivo) == os.path.abspath(self.archivo)
+
+    def cerrar(self):
+        self.confirmar()
+        self._conexion.close()
+
+    def _materializar(self, fila) -> Tarea:
+        tarea = self._vistas.get(fila[0])
+        if tarea is None:
+            tarea = tarea_desde_fila(fila)
+            tarea._observador = self.observador
+            tarea = self._vistas.adoptar(tarea)
+        return tarea
+
+    def _consultar(self, condicion: str = "", parametros=(), orden: str = "id") -> List[Tarea]:
+        filas = self._conexion.execute(
+            f"SELECT {COLUMNAS} FROM tareas {condicion} ORDER BY {orden}", parametros)
+        return [self._materializar(fila) for fila in filas]
+
+    def agregar(self, tarea: Tarea):
+        anterior = self.obtener(tarea.id)
+        if anterior is not None:
+            self.quitar(anterior)
+        self._conexion.execute(INSERTAR, tarea_a_fila(tarea))
+        self._vistas[tarea.id] = tarea
+        tarea._observador = self.observador
+        self._total += 1
+        self._escrito()
+
+    def quitar(self, tarea: Tarea):
+        tarea._observador = None
+        self._conexion.execute("DELETE FROM tareas WHERE id = ?", (tarea.id,))
+        self._vistas.pop(tarea.id, None)
+        self._total -= 1
+        self._escrito()
+
+    def obtener_lote(self, ids: Iterable[int]) -> Dict[int, Tarea]:
+        # Las que no estan en memoria se leen con un SELECT ... IN por bloque
+        tareas = {}
+        faltan = []
+        for id_tarea in ids:
+            tarea = self._vistas.get(id_tarea)
+            if tarea is not None:
+                tareas[id_tarea] = tarea
+            else:
+                faltan.append(id_tarea)
+        for inicio in range(0, len(faltan), BLOQUE_IDS):
+            bloque = faltan[inicio:inicio + BLOQUE_IDS]
+            filas = self._conexion.execute(
+                f"SELECT {COLUMNAS} FROM tareas WHERE id IN ({', '.join('?' * len(bloque))})", bloque)
+            for fila in filas:
+                tareas[fila[0]] = self._materializar(fila)
+        return tareas
+
+    def agregar_lote(self, tareas: List[Tarea]):
+        tareas = self._ultimas_por_id(tareas)
+        anteriores = self.obtener_lote(tarea.id for tarea in tareas)
+        if anteriores:
+            self.quitar_lote(list(anteriores.values()))
+        self._conexion.executemany(INSERTAR, map(tarea_a_fila, tareas))
+        for tarea in tareas:
+            self._vistas[tarea.id] = tarea
+            tarea._observador = self.observador
+        self._total += len(tareas)
+        self._escrito(len(tareas))
+
+    def quitar_lote(self, tareas: List[Tarea]):
+        for tarea in tareas:
+            tarea._observador = None
+            self._vistas.pop(tarea.id, None)
+        self._conexion.executemany("DELETE FROM tareas WHERE id = ?", [(tarea.id,) for tarea in tareas])
+        self._total -= len(tareas)
+        self._escrito(len(tareas))
+
+    def modificadas_lote(self, cambios: List[tuple]):
+        # Un executemany por campo; cada tarea con su valor final
+        por_campo = {}
+        for tarea, campo, _ in cambios:
+            por_campo.setdefault(campo, {})[tarea.id] = tarea
+        for campo, tareas in por_campo.items():
+            sentencia, valores = ACTUALIZACIONES[campo]
+            self._conexion.executemany(
+                sentencia, [valores(getattr(tarea, campo)) + (id_tarea,) for id_tarea, tarea in tareas.items()])
+        self._escrito(len(cambios))
+
+    def obtener(self, id_tarea: int) -> Optional[Tarea]:
+        tarea = self._vistas.get(id_tarea)
+        if tarea is not None:
+            return tarea
+        fila = self._conexion.execute(
+            f"SELECT {COLUMNAS} FROM tareas WHERE id = ?", (id_tarea,)).fetchone()
+        return None if fila is None else self._materializar(fila)
+
+    def todas(self) -> List[Tarea]:
+        return self._consultar()
+
+    def _asignar_observador(self, observador):
+        for tarea in list(self._vistas.values()):
+            tarea._observador = observador
+
+    def reemplazar(self, tareas: Iterable[Tarea]):
+        # Una sola transaccion: si `tareas` falla a mitad se deshace entera
+        self.confirmar()
+        self._asignar_observador(None)
+        vistas = VistasTareas()
+
+        def filas():
+            for tarea in tareas:
+                vistas[tarea.id] = tarea
+                yield tarea_a_fila(tarea)
+
+        try:
+            reescribir_tareas(self._conexion, filas(), ACTUALIZAR_O_INSERTAR)
+            # Los ids repetidos no suman: se cuentan las filas que quedaron
+            total = self._conexion.execute("SELECT COUNT(*) FROM tareas").fetchone()[0]
+        except Exception:
+            self._conexion.rollback()
+            self._asignar_observador(self.observador)
+            raise
+        self.confirmar()
+        self._vistas = vistas
+        self._total = total
+        self._asignar_observador(self.observador)
+
+    def tarea_modificada(self, tarea: Tarea, campo: str, anterior):
+        sentencia, valores = ACTUALIZACIONES[campo]
+        self._conexion.execute(sentencia, valores(getattr(tarea, campo)) + (tarea.id,))
+        self._escrito()
+
+    def __len__(self) -> int:
+        return self._total
+
+    def max_id(self) -> int:
+        return self._conexion.execute("SELECT MAX(id) FROM tareas").fetchone()[0] or 0
+
+    def filtrar_por_estado(self, estado: EstadoTarea) -> List[Tarea]:
+        return self._consultar("WHERE estado = ?", (ORDEN_ESTADO[estado],))
+
+    def filtrar_por_categoria(self, categoria: str) -> List[Tarea]:
+        return self._consultar("WHERE categoria_normalizada = ?", (categoria.lower(),))
+
+    def filtrar_por_prioridad(self, prioridad: Prioridad) -> List[Tarea]:
+        return self._consultar("WHERE prioridad = ?", (ORDEN_PRIORIDAD[prioridad],))
+
+    def filtrar_por_fecha_limite(self, fecha_inicio: datetime, fecha_fin: datetime) -> List[Tarea]:
+        return self._consultar("WHERE fecha_limite BETWEEN ? AND ?",
+                               (a_epoca(fecha_inicio), a_epoca(fecha_fin)), "fecha_limite, id")
+
+    def obtener_vencidas(self, ahora: datetime) -> List[Tarea]:
+        return self._consultar("WHERE fecha_limite < ? AND estado != ?",
+                               (a_epoca(ahora), ORDEN_ESTADO[EstadoTarea.COMPLETADA]),
+                               "fecha_limite, id")
+
+    def _consulta_texto(self, texto: str) -> Optional[str]:
+        # Cada palabra como prefijo entre comillas; FTS5 exige todas (AND)
+        prefijos = tokenizar(texto)
+        if not prefijos or not self._texto:
+            return None
+        return ' '.join(f'"{prefijo}"*' for prefijo in prefijos)
+
+    def buscar_por_texto(self, texto: str) -> Optional[List[Tarea]]:
+        consulta = self._consulta_texto(texto)
+        if consulta is None:
+            return None
+        return self._consultar(
+            "WHERE id IN (SELECT rowid FROM tareas_fts WHERE tareas_fts MATCH ?)", (consulta,))
+
+    def consultar(self, texto: str = '', estado: Optional[EstadoTarea] = None,
+                  categoria: Optional[str] = None, prioridad: Optional[Prioridad] = None,
+                  orden: str = 'id', ascendente: bool = True,
+                  limite: Optional[int] = None, desplazamiento: int = 0,
+                  despues_de: Optional[tuple] = None) -> List[Tarea]:
+        # Todo en una sentencia: SQLite elige el indice y con LIMIT solo se
+        # construyen las tareas de la pagina
+        condiciones = []
+        parametros = []
+        if texto:
+            consulta = self._consulta_texto(texto)
+            if consulta is None:
+                return super().consultar(texto, estado, categoria, prioridad,
+                                         orden, ascendente, limite, desplazamiento, despues_de)
+            condiciones.append("id IN (SELECT rowid FROM tareas_fts WHERE tareas_fts MATCH ?)")
+            parametros.append(consulta)
+        if estado is not None:
+            condiciones.append("estado = ?")
+            parametros.append(ORDEN_ESTADO[estado])
+        if categoria is not None:
+            condiciones.append("categoria_normalizada = ?")
+            parametros.append(categoria.lower())
+        if prioridad is not None:
+            condiciones.append("prioridad = ?")
+            parametros.append(ORDEN_PRIORIDAD[prioridad])
+        orden_sql = ORDENES[orden][0 if ascendente else 1]
+        if despues_de is None:
+            return self._pagina(condiciones, parametros, orden_sql, limite, desplazamiento)
+        # Tras el cursor van primero sus empates (misma clave, id mayor) y
+        # luego las claves posteriores. Cada parte es una busqueda directa en
+        # el indice de la columna; con una sola condicion SQLite recorreria
+        # todos los empates anteriores al cursor
+        tareas = []
+        for parte, valores, orden_parte in self._partes_posteriores(orden, ascendente, despues_de):
+            falta = None if limite is None else desplazamiento + limite - len(tareas)
+            if falta == 0:
+                break
+            tareas += self._pagina(condiciones + [parte], parametros + valores, orden_parte, falta, 0)
+        return tareas[desplazamiento:]
+
+    def _pagina(self, condiciones: List[str], parametros: list, orden_sql: str,
+                limite: Optional[int], desplazamiento: int) -> List[Tarea]:
+        if limite is not None or desplazamiento:
+            orden_sql += " LIMIT ? OFFSET ?"
+            parametros = parametros + [-1 if limite is None else limite, desplazamiento]
+        condicion = "WHERE " + " AND ".join(condiciones) if condiciones else ""
+        return self._consultar(condicion, parametros, orden_sql)
+
+    @staticmethod
+    def _partes_posteriores(orden: str, ascendente: bool, despues_de: tuple) -> List[Tuple[str, list, str]]:
+        # Lo mismo que AlmacenTareas._posterior sobre el orden de ORDENES, como
+        # (condicion, parametros, orden) de cada parte y en el orden de salida
+        clave, id_limite = despues_de
+        orden_sql = ORDENES[orden][0 if ascendente else 1]
+        if orden == 'id':
+            return [("id > ?" if ascendente else "id < ?", [id_limite], orden_sql)]
+        if orden == 'fecha_limite':
+            # Las tareas sin fecha (clave datetime.max) van al final en
+            # ascendente y al principio en descendente
+            if clave == datetime.max:
+                empates = ("fecha_limite IS NULL AND id > ?", [id_limite], "id")
+                if ascendente:
+                    return [empates]
+                return [empates, ("fecha_limite IS NOT NULL", [], orden_sql)]
+            columna, valor = "fecha_limite", a_epoca(clave)
+            resto = ("(fecha_limite > ? OR fecha_limite IS NULL)" if ascendente else "fecha_limite < ?")
+        else:
+            columna, convertir = COLUMNAS_ORDEN[orden]
+            valor = convertir(clave)
+            resto = f"{columna} {'>' if ascendente else '<'} ?"
+        return [(f"{columna} = ? AND id > ?", [valor, id_limite], "id"),
+                (resto, [valor], orden_sql)]
+
+    def contar_por_estado(self, estado: EstadoTarea) -> int:
+        return self._conexion.execute(
+            "SELECT COUNT(*) FROM tareas WHERE estado = ?", (ORDEN_ESTADO[estado],)).fetchone()[0]
+
+    def ordenar(self, campo: str, ascendente: bool = True) -> List[Tarea]:
+        return self._consultar(orden=ORDENES[campo][0 if ascendente else 1])
+
+    def get_nombre(self) -> str:
+        return "SQLite"
\ No newline at end of file
@@ -0,0 +1,103 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import AsyncIterator, Optional
+from models.tarea import Tarea, EstadoTarea, Prioridad
+from models.gestor_tareas import GestorTareas
+from models.gestor_concurrente import GestorTareasConcurrente
+
+
+def _en_ejecutor(nombre: str):
+    # Metodo asincrono que ejecuta `nombre` del gestor en el ejecutor
+    async def metodo(self, *args, **kwargs):
+        return await self._ejecutar(getattr(self.gestor, nombre), *args, **kwargs)
+    metodo.__name__ = nombre
+    metodo.__doc__ = getattr(GestorTareas, nombre).__doc__
+    return metodo
+
+
+class AsyncGestorTareas:
+    """Fachada asyncio de GestorTareas.
+
+    Cada llamada que toca el almacen o los archivos se ejecuta en un
+    ThreadPoolExecutor propio, de modo que el bucle de eventos nunca espera
+    a disco ni a una consulta larga. Con varios trabajadores el gestor ha de
+    ser un GestorTareasConcurrente (el de por defecto); con cualquier otro
+    las llamadas se ejecutan de una en una en un unico trabajador.
+    """
+
+    def __init__(self, gestor: Optional[GestorTareas] = None, trabajadores: int = 4):
+        self.gestor = gestor if gestor is not None else GestorTareasConcurrente()
+        if not isinstance(self.gestor, GestorTareasConcurrente):
+            trabajadores = 1
+        self._ejecutor = ThreadPoolExecutor(max_workers=trabajadores,
+                                            thread_name_prefix="gestor-async")
+
+    async def _ejecutar(self, funcion, *args, **kwargs):
+        bucle = asyncio.get_running_loop()
+        return await bucle.run_in_executor(self._ejecutor, partial(funcion, *args, **kwargs))
+
+    crear_tarea = _en_ejecutor('crear_tarea')
+    crear_tareas_lote = _en_ejecutor('crear_tareas_lote')
+    obtener_tarea_por_id = _en_ejecutor('obtener_tarea_por_id')
+    obtener_todas_tareas = _en_ejecutor('obtener_todas_tareas')
+    actualizar_tarea = _en_ejecutor('actualizar_tarea')
+    actualizar_lote = _en_ejecutor('actualizar_lote')
+    eliminar_tarea = _en_ejecutor('eliminar_tarea')
+    eliminar_lote = _en_ejecutor('eliminar_lote')
+    limpiar_tareas_completadas = _en_ejecutor('limpiar_tareas_completadas')
+    aplicar_prioridad_inteligente = _en_ejecutor('aplicar_prioridad_inteligente')
+    buscar_por_texto = _en_ejecutor('buscar_por_texto')
+    consultar = _en_ejecutor('consultar')
+    obtener_estadisticas = _en_ejecutor('obtener_estadisticas')
+    obtener_tareas_vencidas = _en_ejecutor('obtener_tareas_vencidas')
+    tiene_cambios_sin_guardar = _en_ejecutor('tiene_cambios_sin_guardar')
+    guardar_tareas = _en_ejecutor('guardar_tareas')
+    cargar_tareas = _en_ejecutor('cargar_tareas')
+
+    async def esperar_guardados(self, tiempo_maximo: Optional[float] = None) -> bool:
+        return await self._ejecutar(self.gestor.persistence_manager.esperar_guardados, tiempo_maximo)
+
+    async def iterar_consulta(self, texto: str = '', estado: Optional[EstadoTarea] = None,
+                              categoria: Optional[str] = None, prioridad: Optional[Prioridad] = None,
+                              orden: str = 'id', ascendente: bool = True,
+                              lote: int = 500) -> AsyncIterator[Tarea]:
+        """Recorre el resultado de consultar. La consulta se resuelve una vez
+        en el ejecutor y las tareas se entregan en lotes de `lote`, cediendo
+        el bucle entre lotes."""
+        tareas = await self.consultar(texto, estado, categoria, prioridad, orden, ascendente)
+        for inicio in range(0, len(tareas), lote):
+            for tarea in tareas[inicio:inicio + lote]:
+                yield tarea
+            await asyncio.sleep(0)
+
+    async def iterar_tareas_archivo(self, archivo: str = "tareas.json",
+                                    lote: int = 500) -> AsyncIterator[Tarea]:
+        """Recorre las tareas de un archivo sin cargarlas en el gestor. Cada
+        lote de `lote` tareas se lee en el ejecutor con la carga incremental
+        del formato."""
+        iterador = await self._ejecutar(
+            lambda: iter(self.gestor.iterar_tareas_archivo(archivo)))
+        try:
+            while True:
+                tareas = await self._ejecutar(lambda: list(islice(iterador, lote)))
+                if not tareas:
+                    return
+                for tarea in tareas:
+                    yield tarea
+        finally:
+            cerrar = getattr(iterador, 'close', None)
+            if cerrar is not None:
+                await self._ejecutar(cerrar)
+
+    async def cerrar(self):
+        # Espera a los guardados pendientes y libera los hilos del ejecutor
+        await self.esperar_guardados()
+        self._ejecutor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *excepcion):
+        await self.cerrar()
@@ -0,0 +1,280 @@
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import List, Optional, Tuple
+from models.tarea import Tarea
+from models.gestor_tareas import GestorTareas
+from persistence.persistence_manager import estados_de, tareas_desde_estados
+
+
+class CerrojoLectoresEscritor:
+    """Muchos lectores a la vez o un solo escritor.
+
+    Cuando un escritor espera no entran lectores nuevos, asi un flujo
+    continuo de lecturas no lo deja esperando para siempre; al salir un
+    escritor pasan primero los lectores que ya esperaban, asi tampoco los
+    escritores seguidos dejan sin turno a los lectores. Ambos modos son
+    reentrantes en el mismo hilo y quien escribe tambien puede leer; pasar
+    de lectura a escritura no se permite porque dos hilos que lo intentaran
+    a la vez se bloquearian mutuamente.
+    """
+
+    def __init__(self):
+        self._condicion = threading.Condition(threading.Lock())
+        self._lectores = 0
+        self._escritor: Optional[int] = None
+        self._profundidad = 0
+        self._escritores_esperando = 0
+        self._lectores_esperando = 0
+        # Cada escritor que sale abre una fase nueva; los lectores que
+        # esperaban desde antes entran aunque haya escritores esperando
+        self._fase = 0
+        self._turno_lectores = 0
+        self._local = threading.local()
+
+    def _lecturas(self) -> int:
+        return getattr(self._local, 'lecturas', 0)
+
+    def adquirir_lectura(self):
+        lecturas = self._lecturas()
+        if lecturas or self._escritor == threading.get_ident():
+            # Ya dentro: esperar aqui a un escritor seria un interbloqueo
+            self._local.lecturas = lecturas + 1
+            if lecturas == 0:
+                self._local.del_escritor = True
+            return
+        with self._condicion:
+            fase = self._fase
+            self._lectores_esperando += 1
+            try:
+                while self._escritor is not None or (self._escritores_esperando and
+                                                     self._fase == fase):
+                    self._condicion.wait()
+            finally:
+                self._lectores_esperando -= 1
+                if self._fase != fase:
+                    self._turno_lectores -= 1
+            self._lectores += 1
+        self._local.lecturas = 1
+        self._local.del_escritor = False
+
+    def liberar_lectura(self):
+        lecturas = self._lecturas() - 1
+        if lecturas < 0:
+            raise RuntimeError("liberar_lectura sin lectura adquirida")
+        self._local.lecturas = lecturas
+        if lecturas or self._local.del_escritor:
+            return
+        with self._condicion:
+            self._lectores -= 1
+            if not self._lectores:
+                self._condicion.notify_all()
+
+    def adquirir_escritura(self):
+        yo = threading.get_ident()
+        if self._escritor == yo:
+            self._profundidad += 1
+            return
+        if self._lecturas():
+            raise RuntimeError("No se puede escribir mientras se sostiene una lectura")
+        with self._condicion:
+            self._escritores_esperando += 1
+            try:
+                while self._escritor is not None or self._lectores or self._turno_lectores:
+                    self._condicion.wait()
+            finally:
+                self._escritores_esperando -= 1
+            self._escritor = yo
+            self._profundidad = 1
+
+    def liberar_escritura(self):
+        if self._escritor != threading.get_ident():
+            raise RuntimeError("liberar_escritura desde un hilo que no escribe")
+        self._profundidad -= 1
+        if self._profundidad:
+            return
+        with self._condicion:
+            self._escritor = None
+            if self._lectores_esperando:
+                self._turno_lectores = self._lectores_esperando
+                self._fase += 1
+            self._condicion.notify_all()
+
+    @contextmanager
+    def lectura(self):
+        self.adquirir_lectura()
+        try:
+            yield
+        finally:
+            self.liberar_lectura()
+
+    @contextmanager
+    def escritura(self):
+        self.adquirir_escritura()
+        try:
+            yield
+        finally:
+            self.liberar_escritura()
+
+
+def _con_lectura(metodo):
+    @wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        with self.cerrojo.lectura():
+            return metodo(self, *args, **kwargs)
+    return envoltorio
+
+
+def _con_escritura(metodo):
+    @wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        with self.cerrojo.escritura():
+            resultado = metodo(self, *args, **kwargs)
+        # Se espera al registro de escritura fuera del cerrojo: mientras
+        # tanto otros escriben y sus cambios comparten el siguiente fsync
+        self._esperar_registro()
+        return resultado
+    return envoltorio
+
+
+class GestorTareasConcurrente(GestorTareas):
+    """GestorTareas que pueden usar varios hilos a la vez.
+
+    Las consultas toman el cerrojo en modo lectura y no se bloquean entre
+    si; las operaciones que cambian tareas lo toman en modo escritura.
+    `instantanea()` entrega una tupla de las tareas compartida por todos los
+    lectores hasta el siguiente cambio. guardar_tareas solo retiene a los
+    escritores mientras copia los campos de las tareas: la escritura del
+    archivo se hace fuera del cerrojo.
+
+    Las tareas entregadas siguen siendo las del gestor: para cambiarlas
+    desde varios hilos hay que usar actualizar_tarea o actualizar_lote, que
+    aplican el cambio y actualizan los indices dentro del cerrojo.
+    """
+
+    def __init__(self, almacen='memoria'):
+        self.cerrojo = CerrojoLectoresEscritor()
+        # Serializa los guardados entre si, no con los escritores;
+        # reentrante porque punto_control guarda con el tomado
+        self._cerrojo_guardado = threading.RLock()
+        self._local = threading.local()
+        self._cerrojo_cache = threading.Lock()
+        self._instantanea: Tuple[int, Tuple[Tarea, ...]] = (-1, ())
+        super().__init__(almacen)
+
+    def instantanea(self) -> Tuple[Tarea, ...]:
+        version, tareas = self._instantanea
+        if version == self.version:
+            return tareas
+        with self.cerrojo.lectura():
+            version = self.version
+            tareas = tuple(self.almacen.todas())
+            self._instantanea = (version, tareas)
+            return tareas
+
+    def obtener_todas_tareas(self) -> List[Tarea]:
+        return list(self.instantanea())
+
+    @property
+    def tareas(self) -> List[Tarea]:
+        return list(self.instantanea())
+
+    # Como el resto de escrituras: vuelve con el reinicio ya en el registro
+    tareas = tareas.setter(_con_escritura(GestorTareas.tareas.fset))
+
+    # Lecturas
+    tiene_cambios_sin_guardar = _con_lectura(GestorTareas.tiene_cambios_sin_guardar)
+    obtener_tarea_por_id = _con_lectura(GestorTareas.obtener_tarea_por_id)
+    filtrar_por_estado = _con_lectura(GestorTareas.filtrar_por_estado)
+    filtrar_por_categoria = _con_lectura(GestorTareas.filtrar_por_categoria)
+    filtrar_por_prioridad = _con_lectura(GestorTareas.filtrar_por_prioridad)
+    filtrar_por_fecha_limite = _con_lectura(GestorTareas.filtrar_por_fecha_limite)
+    buscar_por_texto = _con_lectura(GestorTareas.buscar_por_texto)
+    consultar = _con_lectura(GestorTareas.consultar)
+    ordenar_por_fecha_creacion = _con_lectura(GestorTareas.ordenar_por_fecha_creacion)
+    ordenar_por_fecha_limite = _con_lectura(GestorTareas.ordenar_por_fecha_limite)
+    ordenar_por_prioridad = _con_lectura(GestorTareas.ordenar_por_prioridad)
+    ordenar_por_titulo = _con_lectura(GestorTareas.ordenar_por_titulo)
+    ordenar_por_estado = _con_lectura(GestorTareas.ordenar_por_estado)
+    obtener_estadisticas = _con_lectura(GestorTareas.obtener_estadisticas)
+    obtener_tareas_vencidas = _con_lectura(GestorTareas.obtener_tareas_vencidas)
+
+    # Escrituras
+    crear_tarea = _con_escritura(GestorTareas.crear_tarea)
+    crear_tareas_lote = _con_escritura(GestorTareas.crear_tareas_lote)
+    tarea_modificada = _con_escritura(GestorTareas.tarea_modificada)
+    actualizar_tarea = _con_escritura(GestorTareas.actualizar_tarea)
+    actualizar_lote = _con_escritura(GestorTareas.actualizar_lote)
+    eliminar_tarea = _con_escritura(GestorTareas.eliminar_tarea)
+    eliminar_lote = _con_escritura(GestorTareas.eliminar_lote)
+    limpiar_tareas_completadas = _con_escritura(GestorTareas.limpiar_tareas_completadas)
+    aplicar_prioridad_inteligente = _con_escritura(GestorTareas.aplicar_prioridad_inteligente)
+    cargar_tareas = _con_escritura(GestorTareas.cargar_tareas)
+    configurar_cache_consultas = _con_escritura(GestorTareas.configurar_cache_consultas)
+    _activar_registro = _con_escritura(GestorTareas.activar_registro)
+    desactivar_registro = _con_escritura(GestorTareas.desactivar_registro)
+
+    def activar_registro(self, *args, **kwargs) -> int:
+        # Sin instantanea acaba en punto_control: el cerrojo de guardado va
+        # antes que el de escritura, en el mismo orden que guardar_tareas
+        with self._cerrojo_guardado:
+            return self._activar_registro(*args, **kwargs)
+
+    def punto_control(self) -> bool:
+        # Ningun cambio entre la instantanea y vaciar el registro
+        with self._cerrojo_guardado:
+            with self.cerrojo.escritura():
+                return super().punto_control()
+
+    def _confirmar_registro(self):
+        # Dentro del cerrojo solo se sella; _con_escritura espera al salir
+        self._local.secuencia = self.registro.sellar()
+
+    def _esperar_registro(self):
+        secuencia = getattr(self._local, 'secuencia', None)
+        if secuencia is not None:
+            self._local.secuencia = None
+            registro = self.registro
+            if registro is not None:
+                registro.esperar(secuencia)
+
+    # Varios lectores comparten la cache de consultas
+    def _leer_cache(self, clave: tuple, version: int) -> Optional[List[Tarea]]:
+        with self._cerrojo_cache:
+            return super()._leer_cache(clave, version)
+
+    def _guardar_cache(self, clave: tuple, version: int, resultado: List[Tarea]):
+        with self._cerrojo_cache:
+            super()._guardar_cache(clave, version, resultado)
+
+    def _vaciar_cache(self):
+        with self._cerrojo_cache:
+            super()._vaciar_cache()
+
+    def guardar_tareas(self, archivo: str = "tareas.json") -> bool:
+        with self._cerrojo_guardado:
+            with self.cerrojo.lectura():
+                guardado = self._preparar_guardado(archivo)
+                if guardado is None:
+                    return True
+                destino, modificadas, eliminadas = guardado
+                if self.persistence_manager.asincrono:
+                    # El guardado asincrono ya copia los campos y vuelve enseguida
+                    if modificadas is None:
+                        self.persistence_manager.guardar_tareas(self.almacen.todas(), archivo)
+                    else:
+                        self.persistence_manager.guardar_cambios(modificadas, eliminadas, archivo)
+                    self._marcar_guardado(destino)
+                    return True
+                estados = estados_de(self.almacen.todas() if modificadas is None else modificadas)
+                # Los cambios posteriores a la foto quedan para el proximo guardado
+                self._marcar_guardado(destino)
+            tareas = tareas_desde_estados(estados)
+            if modificadas is None:
+                ok = self.persistence_manager.guardar_tareas(tareas, archivo)
+            else:
+                ok = self.persistence_manager.guardar_cambios(tareas, eliminadas, archivo)
+            if not ok:
+                # Ya se dio por guardado al copiar los campos
+                self._anotar_guardado_fallido(archivo)
+            return ok
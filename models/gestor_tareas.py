@@ -1,18 +1,85 @@
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+from itertools import chain
 from models.tarea import Tarea, EstadoTarea, Prioridad
+from models.almacen import AlmacenTareas, AlmacenMemoria, CLAVES_ORDEN
+from models.indices import normalizar_texto
 from strategies.prioridad_strategy import PrioridadStrategy
 from strategies.prioridad_fecha import PrioridadFechaStrategy
-from typing import List, Optional
+from strategies.ejecucion_paralela import calcular_prioridades_en_paralelo, MODOS_EJECUCION
+from typing import Iterable, Iterator, List, Optional
 from datetime import datetime
 from persistence.persistence_manager import PersistenceManager
 from persistence.json_persistence import JSONPersistence
+from persistence.registro_escritura import RegistroEscritura, leer_registro
+
+# Campos que admiten crear_tarea y actualizar_tarea (y sus versiones por lotes)
+CAMPOS_CREACION = frozenset(['titulo', 'descripcion', 'categoria', 'fecha_limite', 'prioridad'])
+CAMPOS_ACTUALIZABLES = frozenset(['titulo', 'descripcion', 'categoria', 'fecha_limite', 'estado', 'prioridad'])
+
+
+def _operacion(metodo):
+    # Lo que anota una operacion (y las que llama) se confirma en el registro
+    # de escritura una sola vez, al terminar la mas externa
+    @wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        self._profundidad_operacion += 1
+        try:
+            return metodo(self, *args, **kwargs)
+        finally:
+            self._profundidad_operacion -= 1
+            if not self._profundidad_operacion and self.registro is not None:
+                self._confirmar_registro()
+    return envoltorio
 
 class GestorTareas:
-    def __init__(self):
-        self.tareas: List[Tarea] = []
-        self.contador_id = 1
+    def __init__(self, almacen='memoria'):
+        # `almacen` es el nombre de un almacen en memoria o una instancia ya
+        # creada, p. ej. AlmacenSQLite('tareas.db') para consultar en la base
+        self.almacen: AlmacenTareas = self._crear_almacen(almacen)
+        self.contador_id = self.almacen.max_id() + 1
         self.estrategia_prioridad: PrioridadStrategy = PrioridadFechaStrategy()
+        self.modo_ejecucion_prioridad = 'serie'
+        self.trabajadores_prioridad: Optional[int] = None
         self.persistence_manager = PersistenceManager(JSONPersistence())
+        self.persistence_manager.al_terminar_guardado = self._guardado_terminado
+        # Cambios desde el ultimo guardado o carga en `_destino_guardado`
+        # (archivo y estrategia); None obliga a un guardado completo
+        self._destino_guardado = None
+        # Archivos en los que fallo un guardado en segundo plano; el hilo de
+        # guardado solo anota aqui y el siguiente guardado sera completo
+        self._guardados_fallidos = set()
+        self._cerrojo_fallidos = threading.Lock()
+        self._creadas = set()
+        self._modificadas = set()
+        self._eliminadas = set()
+        # Cada cambio en las tareas sube `version` y vacia la cache de
+        # consultas: sus resultados ya no valen
+        self._version = 0
+        self.tamano_cache_consultas = 64
+        self._cache_consultas: OrderedDict = OrderedDict()
+        self.aciertos_cache = 0
+        self.fallos_cache = 0
+        # Registro de escritura anticipada (ver activar_registro)
+        self.registro: Optional[RegistroEscritura] = None
+        self._archivo_instantanea: Optional[str] = None
+        self._profundidad_operacion = 0
+    
+    def _crear_almacen(self, tipo) -> AlmacenTareas:
+        if isinstance(tipo, AlmacenTareas):
+            tipo.observador = self
+            return tipo
+        elif tipo.lower() == 'memoria':
+            return AlmacenMemoria(observador=self)
+        elif tipo.lower() == 'columnar':
+            from models.almacen_columnar import AlmacenColumnar
+            return AlmacenColumnar(observador=self)
+        else:
+            raise ValueError(f"Tipo de almacen no soportado: {tipo}")
     
+    @_operacion
     def crear_tarea(self, titulo: str, descripcion: str = "", categoria: str = "general",
                    fecha_limite: Optional[datetime] = None, prioridad: Prioridad = Prioridad.MEDIA) -> Tarea:
         tarea = Tarea(
@@ -24,86 +91,300 @@ class GestorTareas:
         )
         tarea.id = self.contador_id
         self.contador_id += 1
-        self.tareas.append(tarea)
+        self.almacen.agregar(tarea)
+        self._creadas.add(tarea.id)
+        self.version += 1
+        if self.registro is not None:
+            self.registro.anotar_creadas([tarea])
         return tarea
     
+    @_operacion
+    def crear_tareas_lote(self, datos: Iterable[dict]) -> List[Tarea]:
+        """Crea una tarea por cada dict de `datos` (los argumentos de
+        crear_tarea). Los ids se reservan en un bloque y el almacen, sus
+        indices y el registro de cambios se actualizan una vez para todas;
+        si un dict no es valido no se crea ninguna."""
+        ahora = datetime.now()
+        primero = id_tarea = self.contador_id
+        nuevas = []
+        for campos in datos:
+            desconocidos = campos.keys() - CAMPOS_CREACION
+            if desconocidos:
+                raise ValueError(f"Campos no soportados: {', '.join(sorted(desconocidos))}")
+            if 'titulo' not in campos:
+                raise ValueError("Cada tarea necesita un titulo")
+            nuevas.append(Tarea.desde_campos(
+                id_tarea,
+                campos['titulo'],
+                campos.get('descripcion', ""),
+                campos.get('categoria', "general"),
+                campos.get('fecha_limite'),
+                EstadoTarea.PENDIENTE,
+                campos.get('prioridad', Prioridad.MEDIA),
+                ahora,
+                ahora
+            ))
+            id_tarea += 1
+        if not nuevas:
+            return nuevas
+        self.almacen.agregar_lote(nuevas)
+        self.contador_id = id_tarea
+        self._creadas.update(range(primero, id_tarea))
+        self.version += 1
+        if self.registro is not None:
+            self.registro.anotar_creadas(nuevas)
+        return nuevas
+    
+    def tarea_modificada(self, tarea: Tarea, campo: str, anterior):
+        self.almacen.tarea_modificada(tarea, campo, anterior)
+        self.version += 1
+        if tarea.id not in self._creadas:
+            self._modificadas.add(tarea.id)
+        if self.registro is not None:
+            self.registro.anotar_modificada(tarea.id, campo, getattr(tarea, campo))
+            # Un cambio hecho directamente sobre la tarea, fuera de una operacion
+            if not self._profundidad_operacion:
+                self._confirmar_registro()
+    
+    def _quitar(self, tarea: Tarea):
+        self.almacen.quitar(tarea)
+        self._registrar_eliminadas([tarea.id])
+    
+    def _quitar_lote(self, tareas: List[Tarea]):
+        if tareas:
+            self.almacen.quitar_lote(tareas)
+            self._registrar_eliminadas([tarea.id for tarea in tareas])
+    
+    def _registrar_eliminadas(self, ids: List[int]):
+        for id_tarea in ids:
+            if id_tarea in self._creadas:
+                self._creadas.discard(id_tarea)
+            else:
+                self._modificadas.discard(id_tarea)
+                self._eliminadas.add(id_tarea)
+        self.version += 1
+        if self.registro is not None:
+            self.registro.anotar_eliminadas(ids)
+    
+    def _marcar_guardado(self, destino):
+        self._destino_guardado = destino
+        self._creadas.clear()
+        self._modificadas.clear()
+        self._eliminadas.clear()
+    
+    def _guardado_terminado(self, archivo: str, ok: bool):
+        # Con guardado asincrono los cambios se dan por guardados al
+        # encolarlos; si la escritura falla al archivo le faltan cambios y el
+        # siguiente guardado en el sera completo
+        if not ok:
+            self._anotar_guardado_fallido(archivo)
+    
+    def _anotar_guardado_fallido(self, archivo: str):
+        with self._cerrojo_fallidos:
+            self._guardados_fallidos.add(os.path.abspath(archivo))
+    
+    def _guardado_fallido(self, archivo: str, olvidar: bool = False) -> bool:
+        with self._cerrojo_fallidos:
+            archivo = os.path.abspath(archivo)
+            fallido = archivo in self._guardados_fallidos
+            if olvidar:
+                self._guardados_fallidos.discard(archivo)
+            return fallido
+    
+    def tiene_cambios_sin_guardar(self) -> bool:
+        return (self._destino_guardado is None or
+                self._guardado_fallido(self._destino_guardado[0]) or
+                bool(self._creadas or self._modificadas or self._eliminadas))
+    
+    @property
+    def version(self) -> int:
+        return self._version
+    
+    @version.setter
+    def version(self, version: int):
+        self._version = version
+        # Las listas de la version anterior no se volveran a servir: se
+        # sueltan ya en vez de esperar a que las desplace el LRU
+        self._vaciar_cache()
+    
+    @property
+    def tareas(self) -> List[Tarea]:
+        return self.almacen.todas()
+    
+    @tareas.setter
+    @_operacion
+    def tareas(self, tareas: List[Tarea]):
+        self.almacen.reemplazar(tareas)
+        self.version += 1
+        self._marcar_guardado(None)
+        if self.registro is not None:
+            self.registro.anotar_reinicio(self.almacen.todas())
+    
     def obtener_todas_tareas(self) -> List[Tarea]:
-        return self.tareas.copy()
+        return self.almacen.todas()
     
     def obtener_tarea_por_id(self, id_tarea: int) -> Optional[Tarea]:
-        for tarea in self.tareas:
-            if tarea.id == id_tarea:
-                return tarea
-        return None
+        return self.almacen.obtener(id_tarea)
     
+    @_operacion
     def actualizar_tarea(self, id_tarea: int, **kwargs) -> bool:
         tarea = self.obtener_tarea_por_id(id_tarea)
         if not tarea:
             return False
         
-        campos_permitidos = ['titulo', 'descripcion', 'categoria', 'fecha_limite', 'estado', 'prioridad']
         for campo, valor in kwargs.items():
-            if campo in campos_permitidos:
+            if campo in CAMPOS_ACTUALIZABLES:
                 setattr(tarea, campo, valor)
         
         tarea.fecha_actualizacion = datetime.now()
         return True
     
+    @_operacion
+    def actualizar_lote(self, cambios) -> int:
+        """Aplica `cambios`, pares (id, {campo: valor}) o un dict id ->
+        {campo: valor}, con los campos de actualizar_tarea. Los indices y el
+        registro de cambios se actualizan una vez al final. Devuelve cuantas
+        tareas existian y se actualizaron."""
+        cambios = [(id_tarea, {campo: valor for campo, valor in campos.items()
+                               if campo in CAMPOS_ACTUALIZABLES})
+                   for id_tarea, campos in (cambios.items() if hasattr(cambios, 'items') else cambios)]
+        modificaciones = self.almacen.actualizar_lote(cambios, datetime.now())
+        # Cada tarea actualizada trae al menos su fecha_actualizacion
+        actualizadas = {id_tarea for id_tarea, _, _ in modificaciones}
+        if not actualizadas:
+            return 0
+        self._modificadas.update(actualizadas - self._creadas)
+        self.version += 1
+        if self.registro is not None:
+            for id_tarea, campo, valor in modificaciones:
+                self.registro.anotar_modificada(id_tarea, campo, valor)
+        return len(actualizadas)
+    
+    @_operacion
     def eliminar_tarea(self, id_tarea: int) -> bool:
-        tarea = self.obtener_tarea_por_id(id_tarea)
-        if tarea:
-            self.tareas.remove(tarea)
-            return True
-        return False
+        tarea = self.almacen.obtener(id_tarea)
+        if tarea is None:
+            return False
+        self._quitar(tarea)
+        return True
+    
+    @_operacion
+    def eliminar_lote(self, ids: Iterable[int]) -> int:
+        # Devuelve cuantas de las tareas existian y se eliminaron
+        tareas = self.almacen.obtener_lote(ids)
+        self._quitar_lote(list(tareas.values()))
+        return len(tareas)
     
     def filtrar_por_estado(self, estado: EstadoTarea) -> List[Tarea]:
-        return [tarea for tarea in self.tareas if tarea.estado == estado]
+        return self.almacen.filtrar_por_estado(estado)
     
     def filtrar_por_categoria(self, categoria: str) -> List[Tarea]:
-        return [tarea for tarea in self.tareas if tarea.categoria.lower() == categoria.lower()]
+        return self.almacen.filtrar_por_categoria(categoria)
     
     def filtrar_por_prioridad(self, prioridad: Prioridad) -> List[Tarea]:
-        return [tarea for tarea in self.tareas if tarea.prioridad == prioridad]
+        return self.almacen.filtrar_por_prioridad(prioridad)
     
     def filtrar_por_fecha_limite(self, fecha_inicio: datetime, fecha_fin: datetime) -> List[Tarea]:
-        return [tarea for tarea in self.tareas 
-                if tarea.fecha_limite and fecha_inicio <= tarea.fecha_limite <= fecha_fin]
+        return self.almacen.filtrar_por_fecha_limite(fecha_inicio, fecha_fin)
     
-    def buscar_por_texto(self, texto: str) -> List[Tarea]:
+    def buscar_por_texto(self, texto: str, modo: str = 'indice') -> List[Tarea]:
+        # 'indice': palabras por prefijo, sin distinguir mayusculas ni acentos
+        # 'subcadena': coincidencia literal recorriendo todas las tareas
+        if modo == 'indice':
+            resultado = self.almacen.buscar_por_texto(texto)
+            if resultado is not None:
+                return resultado
+        elif modo != 'subcadena':
+            raise ValueError(f"Modo de busqueda no soportado: {modo}")
         texto = texto.lower()
-        return [tarea for tarea in self.tareas 
+        return [tarea for tarea in self.almacen.todas() 
                 if texto in tarea.titulo.lower() or texto in tarea.descripcion.lower()]
     
+    def consultar(self, texto: str = '', estado: Optional[EstadoTarea] = None,
+                  categoria: Optional[str] = None, prioridad: Optional[Prioridad] = None,
+                  orden: str = 'id', ascendente: bool = True,
+                  limite: Optional[int] = None, desplazamiento: int = 0,
+                  despues_de: Optional[tuple] = None) -> List[Tarea]:
+        # Busqueda por texto, filtros y orden combinados; con `limite` solo se
+        # devuelve esa pagina, empezando en `desplazamiento` o justo detras de
+        # `despues_de`, (clave, id) de la ultima tarea de la pagina anterior
+        if orden not in CLAVES_ORDEN:
+            raise ValueError(f"Orden no soportado: {orden}")
+        if (limite is not None and limite < 0) or desplazamiento < 0:
+            raise ValueError("limite y desplazamiento no pueden ser negativos")
+        if self.tamano_cache_consultas <= 0:
+            return self.almacen.consultar(texto, estado, categoria, prioridad,
+                                          orden, ascendente, limite, desplazamiento, despues_de)
+        # El resultado solo depende del texto normalizado (ver AlmacenTareas.consultar)
+        clave = (normalizar_texto(texto or ''), estado, None if categoria is None else categoria.lower(),
+                 prioridad, orden, ascendente, limite, desplazamiento, despues_de)
+        version = self.version
+        resultado = self._leer_cache(clave, version)
+        if resultado is None:
+            resultado = self.almacen.consultar(texto, estado, categoria, prioridad,
+                                               orden, ascendente, limite, desplazamiento, despues_de)
+            # Con la version de antes de consultar: si algo cambio entretanto
+            # no se guarda
+            self._guardar_cache(clave, version, resultado)
+        return list(resultado)
+    
+    def _leer_cache(self, clave: tuple, version: int) -> Optional[List[Tarea]]:
+        # La cache solo tiene entradas de la version actual
+        resultado = self._cache_consultas.get(clave) if version == self._version else None
+        if resultado is not None:
+            self._cache_consultas.move_to_end(clave)
+            self.aciertos_cache += 1
+            return resultado
+        self.fallos_cache += 1
+        return None
+    
+    def _guardar_cache(self, clave: tuple, version: int, resultado: List[Tarea]):
+        if version != self._version:
+            return
+        self._cache_consultas[clave] = resultado
+        self._cache_consultas.move_to_end(clave)
+        while len(self._cache_consultas) > self.tamano_cache_consultas:
+            self._cache_consultas.popitem(last=False)
+    
+    def configurar_cache_consultas(self, tamano: int):
+        # Numero maximo de consultas recordadas; 0 desactiva la cache
+        if tamano < 0:
+            raise ValueError("El tamano de la cache no puede ser negativo")
+        self.tamano_cache_consultas = tamano
+        while len(self._cache_consultas) > tamano:
+            self._cache_consultas.popitem(last=False)
+    
+    def _vaciar_cache(self):
+        self._cache_consultas.clear()
+    
+    def estadisticas_cache_consultas(self) -> dict:
+        return {
+            'entradas': len(self._cache_consultas),
+            'tamano': self.tamano_cache_consultas,
+            'aciertos': self.aciertos_cache,
+            'fallos': self.fallos_cache
+        }
+    
     def ordenar_por_fecha_creacion(self, ascendente: bool = True) -> List[Tarea]:
-        return sorted(self.tareas, 
-                     key=lambda x: x.fecha_creacion, 
-                     reverse=not ascendente)
+        return self.almacen.ordenar('fecha_creacion', ascendente)
     
     def ordenar_por_fecha_limite(self, ascendente: bool = True) -> List[Tarea]:
-        return sorted(self.tareas, 
-                     key=lambda x: x.fecha_limite or datetime.max, 
-                     reverse=not ascendente)
+        return self.almacen.ordenar('fecha_limite', ascendente)
     
     def ordenar_por_prioridad(self) -> List[Tarea]:
-        orden_prioridad = {Prioridad.ALTA: 1, Prioridad.MEDIA: 2, Prioridad.BAJA: 3}
-        return sorted(self.tareas, 
-                     key=lambda x: orden_prioridad.get(x.prioridad, 4))
+        return self.almacen.ordenar('prioridad')
     
     def ordenar_por_titulo(self, ascendente: bool = True) -> List[Tarea]:
-        return sorted(self.tareas, 
-                     key=lambda x: x.titulo.lower(), 
-                     reverse=not ascendente)
+        return self.almacen.ordenar('titulo', ascendente)
     
     def ordenar_por_estado(self) -> List[Tarea]:
-        orden_estado = {EstadoTarea.COMPLETADA: 1, EstadoTarea.EN_PROGRESO: 2, EstadoTarea.PENDIENTE: 3}
-        return sorted(self.tareas, 
-                     key=lambda x: orden_estado.get(x.estado, 4))
+        return self.almacen.ordenar('estado')
     
     def obtener_estadisticas(self) -> dict:
-        total = len(self.tareas)
-        completadas = len(self.filtrar_por_estado(EstadoTarea.COMPLETADA))
-        pendientes = len(self.filtrar_por_estado(EstadoTarea.PENDIENTE))
-        en_progreso = len(self.filtrar_por_estado(EstadoTarea.EN_PROGRESO))
+        total = len(self.almacen)
+        completadas = self.almacen.contar_por_estado(EstadoTarea.COMPLETADA)
+        pendientes = self.almacen.contar_por_estado(EstadoTarea.PENDIENTE)
+        en_progreso = self.almacen.contar_por_estado(EstadoTarea.EN_PROGRESO)
         
         return {
             'total': total,
@@ -114,19 +395,24 @@ class GestorTareas:
         }
     
     def obtener_tareas_vencidas(self) -> List[Tarea]:
-        ahora = datetime.now()
-        return [tarea for tarea in self.tareas 
-                if tarea.fecha_limite and tarea.fecha_limite < ahora 
-                and tarea.estado != EstadoTarea.COMPLETADA]
+        return self.almacen.obtener_vencidas(datetime.now())
     
+    @_operacion
     def limpiar_tareas_completadas(self) -> int:
-        cantidad_inicial = len(self.tareas)
-        self.tareas = [tarea for tarea in self.tareas if tarea.estado != EstadoTarea.COMPLETADA]
-        return cantidad_inicial - len(self.tareas)
+        completadas = self.almacen.filtrar_por_estado(EstadoTarea.COMPLETADA)
+        self._quitar_lote(completadas)
+        return len(completadas)
     
     def establecer_estrategia_prioridad(self, estrategia: PrioridadStrategy):
         self.estrategia_prioridad = estrategia
 
+    def establecer_ejecucion_prioridad(self, modo: str, trabajadores: Optional[int] = None):
+        # 'serie', 'hilos' o 'procesos' para aplicar_prioridad_inteligente sobre todas las tareas
+        if modo not in MODOS_EJECUCION:
+            raise ValueError(f"Modo de ejecucion no soportado: {modo}")
+        self.modo_ejecucion_prioridad = modo
+        self.trabajadores_prioridad = trabajadores
+
     def obtener_estrategias_disponibles(self) -> List[PrioridadStrategy]:
         from strategies.prioridad_fecha import PrioridadFechaStrategy
         from strategies.prioridad_categoria import PrioridadCategoriaStrategy
@@ -138,6 +424,7 @@ class GestorTareas:
             PrioridadManualStrategy()
         ]
 
+    @_operacion
     def aplicar_prioridad_inteligente(self, id_tarea: int = None) -> bool:
         if id_tarea:
             tarea = self.obtener_tarea_por_id(id_tarea)
@@ -147,24 +434,165 @@ class GestorTareas:
                 return True
             return False
         else:
-            for tarea in self.tareas:
-                nueva_prioridad = self.estrategia_prioridad.calcular_prioridad(tarea)
+            tareas = self.almacen.todas()
+            prioridades = calcular_prioridades_en_paralelo(
+                self.estrategia_prioridad, tareas,
+                self.modo_ejecucion_prioridad, self.trabajadores_prioridad)
+            for tarea, nueva_prioridad in zip(tareas, prioridades):
                 tarea.prioridad = nueva_prioridad
             return True
 
     
+    def _preparar_guardado(self, archivo: str):
+        # Decide que hay que escribir en `archivo`: None si nada, o (destino,
+        # modificadas, eliminadas) con modificadas None para un guardado completo
+        estrategia = self.persistence_manager.estrategia
+        destino = (os.path.abspath(archivo), estrategia)
+        if self._guardado_fallido(archivo, olvidar=True) and destino == self._destino_guardado:
+            self._destino_guardado = None
+        self.almacen.confirmar()
+        if self.almacen.guardado_en(archivo):
+            self._marcar_guardado(destino)
+            return None
+        if destino == self._destino_guardado and os.path.exists(archivo):
+            if not (self._creadas or self._modificadas or self._eliminadas):
+                return None
+            if estrategia.guardado_incremental:
+                modificadas = [self.almacen.obtener(id_tarea)
+                               for id_tarea in sorted(self._creadas | self._modificadas)]
+                return destino, modificadas, sorted(self._eliminadas)
+        return destino, None, None
+    
     def guardar_tareas(self, archivo: str = "tareas.json") -> bool:
-        return self.persistence_manager.guardar_tareas(self.tareas, archivo)
-
+        guardado = self._preparar_guardado(archivo)
+        if guardado is None:
+            return True
+        destino, modificadas, eliminadas = guardado
+        if modificadas is None:
+            ok = self.persistence_manager.guardar_tareas(self.almacen.todas(), archivo)
+        else:
+            ok = self.persistence_manager.guardar_cambios(modificadas, eliminadas, archivo)
+        if ok:
+            self._marcar_guardado(destino)
+        return ok
 
+    @_operacion
     def cargar_tareas(self, archivo: str = "tareas.json") -> bool:
-        tareas_cargadas = self.persistence_manager.cargar_tareas(archivo)
-        if tareas_cargadas:
-            self.tareas = tareas_cargadas
-            if self.tareas:
-                self.contador_id = max(tarea.id for tarea in self.tareas) + 1
-            return True
-        return False
+        # Las tareas pasan al almacen a medida que se leen; si el archivo no
+        # trae tareas o falla a mitad, el almacen conserva su contenido
+        try:
+            iterador = iter(self.persistence_manager.iterar_tareas(archivo))
+            primera = next(iterador, None)
+            if primera is None:
+                return False
+            self.almacen.reemplazar(chain([primera], iterador))
+        except Exception as e:
+            print(f"Error cargando tareas: {e}")
+            return False
+        self.version += 1
+        self.contador_id = self.almacen.max_id() + 1
+        self._marcar_guardado((os.path.abspath(archivo), self.persistence_manager.estrategia))
+        if self.registro is not None:
+            self.registro.anotar_reinicio(self.almacen.todas())
+        return True
+    
+    # --- Registro de escritura anticipada ---
+    def activar_registro(self, archivo_registro: str, archivo_instantanea: str,
+                         politica: str = 'lote', intervalo: float = 0.05) -> int:
+        """Recupera las tareas de disco (la instantanea `archivo_instantanea`,
+        en el formato de persistencia actual, mas lo que `archivo_registro`
+        anoto despues) y desde ahi anota en el registro cada cambio. Ver
+        RegistroEscritura para `politica` e `intervalo`. Devuelve cuantos
+        registros se reprodujeron. Si el registro tiene una linea corrupta
+        antes del final lanza ValueError y deja el archivo como estaba."""
+        if self.registro is not None:
+            raise ValueError("El registro de escritura ya esta activo")
+        registro = RegistroEscritura(archivo_registro, politica, intervalo)
+        try:
+            if os.path.exists(archivo_instantanea):
+                self.cargar_tareas(archivo_instantanea)
+            lectura = leer_registro(archivo_registro)
+            reproducidos = self._reproducir_registro(lectura)
+            registro.recortar(lectura.fin_valido)
+        except Exception:
+            # Un registro corrupto se deja como esta para examinarlo
+            registro.cerrar()
+            raise
+        self.registro = registro
+        self._archivo_instantanea = archivo_instantanea
+        if not os.path.exists(archivo_instantanea):
+            # Sin instantanea las tareas que ya tenia el gestor no estarian
+            # en ninguna parte
+            self.punto_control()
+        return reproducidos
+    
+    def _reproducir_registro(self, registros) -> int:
+        # Los registros fijan valores absolutos: reproducirlos sobre una
+        # instantanea que ya los incluye deja el mismo resultado
+        reproducidos = 0
+        nuevas = {}
+        
+        def agregar_nuevas():
+            if nuevas:
+                self._quitar_lote(list(self.almacen.obtener_lote(nuevas).values()))
+                self.almacen.agregar_lote(list(nuevas.values()))
+                for id_tarea in nuevas:
+                    if id_tarea in self._eliminadas:
+                        self._eliminadas.discard(id_tarea)
+                        self._modificadas.add(id_tarea)
+                    else:
+                        self._creadas.add(id_tarea)
+                nuevas.clear()
+        
+        for registro in registros:
+            reproducidos += 1
+            if registro[0] == 'c':
+                nuevas[registro[1].id] = registro[1]
+                continue
+            agregar_nuevas()
+            if registro[0] == 'm':
+                tarea = self.almacen.obtener(registro[1])
+                if tarea is not None:
+                    setattr(tarea, registro[2], registro[3])
+            elif registro[0] == 'e':
+                self._quitar_lote(list(self.almacen.obtener_lote(registro[1]).values()))
+            elif registro[0] == 'r':
+                self.almacen.reemplazar([])
+                self._marcar_guardado(None)
+        agregar_nuevas()
+        if reproducidos:
+            self.version += 1
+            self.contador_id = max(self.contador_id, self.almacen.max_id() + 1)
+        return reproducidos
+    
+    def _confirmar_registro(self):
+        self.registro.confirmar()
+    
+    def punto_control(self) -> bool:
+        """Guarda la instantanea y vacia el registro, que deja de crecer y
+        de alargar la recuperacion. Si el guardado falla el registro queda
+        intacto."""
+        if self.registro is None:
+            raise ValueError("El registro de escritura no esta activo")
+        if not self.guardar_tareas(self._archivo_instantanea):
+            return False
+        # Con guardado asincrono el archivo tiene que estar escrito antes de
+        # vaciar el registro
+        self.persistence_manager.esperar_guardados()
+        if self._guardado_fallido(self._archivo_instantanea):
+            return False
+        self.registro.truncar()
+        return True
+    
+    def desactivar_registro(self):
+        if self.registro is not None:
+            self.registro.cerrar()
+            self.registro = None
+            self._archivo_instantanea = None
+    
+    def iterar_tareas_archivo(self, archivo: str = "tareas.json") -> Iterator[Tarea]:
+        # Recorre las tareas de un archivo sin cargarlas en el gestor
+        return self.persistence_manager.iterar_tareas(archivo)
 
     def establecer_persistencia(self, tipo: str):
         if tipo.lower() == 'json':
@@ -172,6 +600,15 @@ class GestorTareas:
         elif tipo.lower() == 'csv':
             from persistence.csv_persistence import CSVPersistence
             self.persistence_manager.establecer_estrategia(CSVPersistence())
+        elif tipo.lower() == 'jsonl':
+            from persistence.jsonl_persistence import JSONLPersistence
+            self.persistence_manager.establecer_estrategia(JSONLPersistence())
+        elif tipo.lower() == 'sqlite':
+            from persistence.sqlite_persistence import SQLitePersistence
+            self.persistence_manager.establecer_estrategia(SQLitePersistence())
+        elif tipo.lower() == 'binaria':
+            from persistence.binaria_persistence import BinariaPersistence
+            self.persistence_manager.establecer_estrategia(BinariaPersistence())
         else:
             raise ValueError(f"Tipo de persistencia no soportado: {tipo}")
 
@@ -1,5 +1,6 @@
 import os
 import sys
+import threading
 import tkinter as tk
 from tkinter import messagebox, simpledialog, ttk
 from datetime import datetime
@@ -10,14 +11,87 @@ INNER = os.path.join(BASE, 'sistema-gestion-tareas-python-main')
 if os.path.isdir(INNER) and INNER not in sys.path:
     sys.path.insert(0, INNER)
 
-from models.gestor_tareas import GestorTareas
+from models.gestor_concurrente import GestorTareasConcurrente
 from models.tarea import EstadoTarea, Prioridad
 
 
+# Alto de fila del Treeview (ver estilo) y filas que se pintan por encima y
+# por debajo de las visibles para desplazarse sin repintar en cada paso
+ALTO_FILA = 26
+MARGEN_FILAS = 40
+# Pausa tras la ultima tecla antes de lanzar la busqueda
+RETARDO_BUSQUEDA_MS = 200
+
+
 def formato_fecha(f):
     return f.strftime('%Y-%m-%d %H:%M') if f else ''
 
 
+class ConsultasEnSegundoPlano:
+    """Ejecuta consultas en un hilo aparte, de una en una.
+
+    Solo importa la ultima: lanzar una nueva descarta la que aun no habia
+    empezado y marca como cancelada la que esta en curso. La funcion recibe
+    `cancelada` para comprobarlo entre sus etapas; lo que este haciendo en
+    ese momento (p. ej. la llamada al gestor) no se interrumpe, pero su
+    resultado se descarta antes de programarlo y otra vez antes de pintarlo.
+    Los resultados se entregan en el hilo de Tk a traves de root.after.
+    """
+
+    def __init__(self, root, entregar):
+        self.root = root
+        self.entregar = entregar
+        self._condicion = threading.Condition()
+        self._siguiente = None
+        self._cancelada = threading.Event()
+        self._hilo = None
+
+    def lanzar(self, funcion, *args):
+        # funcion(cancelada, *args) se ejecuta en el hilo y devuelve el resultado
+        with self._condicion:
+            self._cancelada.set()
+            self._cancelada = threading.Event()
+            self._siguiente = (funcion, args, self._cancelada)
+            if self._hilo is None:
+                # Demonio: solo lee, no hay nada que dejar a medias al salir
+                self._hilo = threading.Thread(target=self._trabajar, name="consultas-gui", daemon=True)
+                self._hilo.start()
+            self._condicion.notify()
+
+    def cancelar(self):
+        with self._condicion:
+            self._cancelada.set()
+            self._siguiente = None
+
+    def _trabajar(self):
+        while True:
+            with self._condicion:
+                self._condicion.wait_for(lambda: self._siguiente is not None)
+                funcion, args, cancelada = self._siguiente
+                self._siguiente = None
+            if cancelada.is_set():
+                continue
+            try:
+                resultado = funcion(cancelada, *args)
+            except Exception as e:
+                # De una consulta cancelada ya no se espera nada
+                if not cancelada.is_set():
+                    print(f"Error en la consulta: {e}")
+                continue
+            if cancelada.is_set():
+                continue
+            try:
+                self.root.after(0, self._entregar, cancelada, resultado)
+            except (RuntimeError, tk.TclError):
+                # la ventana ya se cerro
+                return
+
+    def _entregar(self, cancelada, resultado):
+        # Ya en el hilo de Tk: pudo lanzarse otra consulta entretanto
+        if not cancelada.is_set():
+            self.entregar(resultado)
+
+
 class TareasApp:
     def __init__(self, root):
         self.root = root
@@ -48,14 +122,22 @@ class TareasApp:
             style.theme_use('clam')
         except Exception:
             pass
-        style.configure('Treeview', background=self.colors['card'], fieldbackground=self.colors['card'], foreground=self.colors['muted'], rowheight=26, font=('Segoe UI', 10))
+        style.configure('Treeview', background=self.colors['card'], fieldbackground=self.colors['card'], foreground=self.colors['muted'], rowheight=ALTO_FILA, font=('Segoe UI', 10))
         style.configure('Treeview.Heading', background=self.colors['header'], foreground=self.colors['muted'], font=('Segoe UI', 10, 'bold'))
         style.configure('TButton', padding=6, font=('Segoe UI', 9))
         style.configure('Accent.TButton', foreground='white')
         style.map('Accent.TButton', background=[('active', self.colors['accent_dark'])], foreground=[('disabled', '#aaaaaa')])
         style.configure('TLabel', font=('Segoe UI', 10))
 
-        self.gestor = GestorTareas()
+        # Las consultas corren en otro hilo mientras la ventana cambia tareas:
+        # el gestor concurrente las separa con su cerrojo
+        self.gestor = GestorTareasConcurrente()
+        # Guardar no bloquea la ventana: el archivo se escribe en otro hilo
+        self.gestor.persistence_manager.establecer_asincrono(True)
+        root.protocol('WM_DELETE_WINDOW', self.cerrar)
+
+        self._consultas = ConsultasEnSegundoPlano(root, self._mostrar_resultado)
+        self._busqueda_pendiente = None
 
         self._build_ui()
         self._cargar_cache_estrategias()
@@ -107,7 +189,7 @@ class TareasApp:
         persist_frame = ttk.Frame(left)
         persist_frame.pack(pady=6)
         self.persist_var = tk.StringVar(value='JSON')
-        ttk.OptionMenu(persist_frame, self.persist_var, self.persist_var.get(), 'JSON', 'CSV').grid(row=0, column=0)
+        ttk.OptionMenu(persist_frame, self.persist_var, self.persist_var.get(), 'JSON', 'CSV', 'JSONL', 'SQLite', 'Binaria').grid(row=0, column=0)
         ttk.Button(persist_frame, text='Establecer', command=self.establecer_persistencia).grid(row=0, column=1, padx=6)
         ttk.Button(persist_frame, text='Guardar', command=self.guardar_tareas).grid(row=1, column=0, pady=4)
         ttk.Button(persist_frame, text='Cargar', command=self.cargar_tareas).grid(row=1, column=1, pady=4)
@@ -126,25 +208,44 @@ class TareasApp:
         ttk.Label(top_right, text='Buscar:').pack(side=tk.LEFT)
         self.search_var = tk.StringVar()
         ttk.Entry(top_right, textvariable=self.search_var, width=30).pack(side=tk.LEFT, padx=6)
+        self.search_var.trace_add('write', lambda *_: self._buscar_tras_pausa())
         ttk.Button(top_right, text='Ir', command=self.refresh_tree).pack(side=tk.LEFT)
 
         ttk.Label(top_right, text='Estado:').pack(side=tk.LEFT, padx=(12, 0))
         estados = ['Todos'] + [e.value for e in EstadoTarea]
         self.estado_var = tk.StringVar(value='Todos')
         ttk.OptionMenu(top_right, self.estado_var, self.estado_var.get(), *estados).pack(side=tk.LEFT, padx=4)
+        self.estado_var.trace_add('write', lambda *_: self.refresh_tree())
 
         ttk.Label(top_right, text='Ordenar:').pack(side=tk.LEFT, padx=(12, 0))
         self.sort_var = tk.StringVar(value='id')
         ttk.OptionMenu(top_right, self.sort_var, 'id', 'id', 'fecha_creacion', 'fecha_limite', 'prioridad', 'titulo').pack(side=tk.LEFT)
-
-        # Treeview
+        self.sort_var.trace_add('write', lambda *_: self.refresh_tree())
+
+        # Treeview virtual: solo se pintan las filas visibles mas un margen.
+        # La lista completa es self._filas y la barra de desplazamiento la
+        # recorre entera; el arbol solo se desplaza dentro de lo pintado
+        self._filas = []
+        self._primera = 0       # posicion en _filas de la primera fila pintada
+        self._arriba = 0        # posicion en _filas de la primera fila visible
+        self._pintadas = []     # iids pintados, en orden
+        self._contenido = {}    # iid -> (valores, tags) pintados
+        self._seleccion = None  # iid seleccionado, aunque salga de la ventana
+        self._repintado = None
+        lista = ttk.Frame(right)
+        lista.pack(fill=tk.BOTH, expand=True, pady=(8, 0))
+        self.scroll = ttk.Scrollbar(lista, orient=tk.VERTICAL, command=self._desplazar)
+        self.scroll.pack(side=tk.RIGHT, fill=tk.Y)
         cols = ('id', 'titulo', 'estado', 'prioridad', 'categoria', 'fecha_limite')
-        self.tree = ttk.Treeview(right, columns=cols, show='headings', selectmode='browse')
+        self.tree = ttk.Treeview(lista, columns=cols, show='headings', selectmode='browse',
+                                 yscrollcommand=self._vista_arbol)
         for c in cols:
             self.tree.heading(c, text=c.capitalize())
             self.tree.column(c, anchor='w')
-        self.tree.pack(fill=tk.BOTH, expand=True, pady=(8, 0))
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.tree.bind('<Double-1>', lambda e: self.view_selected())
+        self.tree.bind('<<TreeviewSelect>>', self._al_seleccionar)
+        self.tree.bind('<Configure>', lambda e: self._pintar(self._arriba))
         # etiquetas para filas
         # etiquetas para filas: completada, vencida y zebra (par/impar)
         try:
@@ -197,52 +298,146 @@ class TareasApp:
         for t in tareas:
             yield (t.id, t.titulo, t.estado.value, t.prioridad.value, t.categoria, formato_fecha(t.fecha_limite))
 
-    def refresh_tree(self):
-        q = self.search_var.get().strip()
-        estado = self.estado_var.get()
-        sort_key = self.sort_var.get()
+    def _buscar_tras_pausa(self):
+        # Cada tecla reinicia la espera: se busca cuando se deja de escribir
+        if self._busqueda_pendiente is not None:
+            self.root.after_cancel(self._busqueda_pendiente)
+        self._busqueda_pendiente = self.root.after(RETARDO_BUSQUEDA_MS, self.refresh_tree)
 
-        if q:
-            tareas = self.gestor.buscar_por_texto(q)
+    def refresh_tree(self):
+        # Las variables de Tk se leen aqui; buscar, filtrar y ordenar se hace
+        # en el hilo de consultas y la lista se repinta al llegar el resultado
+        if self._busqueda_pendiente is not None:
+            self.root.after_cancel(self._busqueda_pendiente)
+            self._busqueda_pendiente = None
+        self._consultas.lanzar(self._consultar, self.search_var.get().strip(),
+                               self.estado_var.get(), self.sort_var.get())
+
+    def _mostrar_resultado(self, tareas):
+        self._filas = tareas
+        self._pintar(self._arriba)
+
+    def _consultar(self, cancelada, q, estado, sort_key):
+        # Se ejecuta fuera del hilo de Tk: busqueda, filtro y orden en una
+        # sola consulta del gestor, con su cerrojo de lectura tomado. Si ya
+        # hay otra mas reciente no se llega a consultar; si llega mientras
+        # tanto, el hilo descarta el resultado y no se pinta
+        if cancelada.is_set():
+            return None
+        return self.gestor.consultar(
+            texto=q,
+            estado=None if estado == 'Todos' else EstadoTarea(estado),
+            orden=sort_key)
+
+    # --- Lista virtual ---
+    def _visibles(self):
+        return max(1, self.tree.winfo_height() // ALTO_FILA)
+
+    def _pintar(self, arriba):
+        # Pinta la ventana de _filas que empieza en `arriba` mas el margen y
+        # deja esa fila arriba del todo
+        total = len(self._filas)
+        visibles = self._visibles()
+        arriba = max(0, min(arriba, total - visibles))
+        primera = max(0, arriba - MARGEN_FILAS)
+        fin = min(total, arriba + visibles + MARGEN_FILAS)
+        self._primera = primera
+        self._arriba = arriba
+        self._sincronizar(primera, self._filas[primera:fin])
+        if fin > primera:
+            self.tree.yview_moveto((arriba - primera) / (fin - primera))
         else:
-            tareas = self.gestor.obtener_todas_tareas()
-
-        if estado != 'Todos':
-            tareas = [t for t in tareas if t.estado.value == estado]
-
-        # ordenar
-        if sort_key == 'fecha_limite':
-            tareas = sorted(tareas, key=lambda x: x.fecha_limite or datetime.max)
-        elif sort_key == 'fecha_creacion':
-            tareas = sorted(tareas, key=lambda x: x.fecha_creacion)
-        elif sort_key == 'prioridad':
-            orden = {Prioridad.ALTA: 1, Prioridad.MEDIA: 2, Prioridad.BAJA: 3}
-            tareas = sorted(tareas, key=lambda x: orden.get(x.prioridad, 4))
-        elif sort_key == 'titulo':
-            tareas = sorted(tareas, key=lambda x: x.titulo.lower())
-
-        # refresh
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        for idx, t in enumerate(tareas):
-            row = (t.id, t.titulo, t.estado.value, t.prioridad.value, t.categoria, formato_fecha(t.fecha_limite))
-            tags = []
-            # zebra
-            tags.append('even' if idx % 2 else 'odd')
-            # estado especial
-            if t.estado == EstadoTarea.COMPLETADA:
-                tags.append('completed')
+            self.scroll.set(0, 1)
+
+    def _sincronizar(self, primera, tareas):
+        # Lleva el arbol a `tareas` tocando solo lo que cambia: borra las
+        # filas que sobran, inserta las nuevas, mueve las que cambian de
+        # posicion y actualiza las que cambian de contenido
+        ahora = datetime.now()
+        completada = EstadoTarea.COMPLETADA
+        nuevas = []
+        for posicion, t in enumerate(tareas, primera):
+            # la zebra va por posicion en la lista completa: no cambia al desplazarse
+            tags = ('even' if posicion % 2 else 'odd',)
+            if t.estado == completada:
+                tags += ('completed',)
+            elif t.fecha_limite and t.fecha_limite < ahora:
+                tags += ('overdue',)
+            valores = (t.id, t.titulo, t.estado.value, t.prioridad.value, t.categoria, formato_fecha(t.fecha_limite))
+            nuevas.append((str(t.id), valores, tags))
+
+        ids_nuevos = {iid for iid, _, _ in nuevas}
+        sobran = [iid for iid in self._pintadas if iid not in ids_nuevos]
+        if sobran:
+            self.tree.delete(*sobran)
+            for iid in sobran:
+                del self._contenido[iid]
+        pintadas = [iid for iid in self._pintadas if iid in ids_nuevos]
+
+        for posicion, (iid, valores, tags) in enumerate(nuevas):
+            contenido = (valores, tags)
+            anterior = self._contenido.get(iid)
+            if anterior is None:
+                self.tree.insert('', posicion, iid=iid, values=valores, tags=tags)
+                pintadas.insert(posicion, iid)
             else:
-                if t.fecha_limite and t.fecha_limite < datetime.now() and t.estado != EstadoTarea.COMPLETADA:
-                    tags.append('overdue')
-            self.tree.insert('', tk.END, values=row, tags=tags)
+                if pintadas[posicion] != iid:
+                    self.tree.move(iid, '', posicion)
+                    pintadas.remove(iid)
+                    pintadas.insert(posicion, iid)
+                if anterior != contenido:
+                    self.tree.item(iid, values=valores, tags=tags)
+            self._contenido[iid] = contenido
+        self._pintadas = pintadas
+
+        if self._seleccion in self._contenido and self._seleccion not in self.tree.selection():
+            self.tree.selection_set(self._seleccion)
+
+    def _vista_arbol(self, primero, ultimo):
+        # yscrollcommand del arbol: pasa su posicion dentro de lo pintado a
+        # la lista completa y, cerca del borde del margen, pinta mas filas
+        pintadas = len(self._pintadas)
+        total = len(self._filas)
+        if not total:
+            self.scroll.set(0, 1)
+            return
+        self._arriba = self._primera + round(float(primero) * pintadas)
+        visibles = max(1, round((float(ultimo) - float(primero)) * pintadas))
+        self.scroll.set(self._arriba / total, min(1.0, (self._arriba + visibles) / total))
+        fin = self._primera + pintadas
+        cerca_arriba = self._primera > 0 and self._arriba - self._primera < MARGEN_FILAS // 2
+        cerca_abajo = fin < total and fin - (self._arriba + visibles) < MARGEN_FILAS // 2
+        if (cerca_arriba or cerca_abajo) and self._repintado is None:
+            # el arbol no se modifica desde su propio callback
+            self._repintado = self.root.after_idle(self._repintar)
+
+    def _repintar(self):
+        self._repintado = None
+        self._pintar(self._arriba)
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        # command de la barra: se mueve por la lista completa
+        if accion == tk.MOVETO:
+            arriba = round(float(cantidad) * len(self._filas))
+        else:
+            paso = self._visibles() if unidad == tk.PAGES else 1
+            arriba = self._arriba + int(cantidad) * paso
+        self._pintar(arriba)
 
-    def _selected_task_id(self):
+    def _al_seleccionar(self, event=None):
         sel = self.tree.selection()
-        if not sel:
+        if sel:
+            self._seleccion = sel[0]
+
+    def _selected_task_id(self):
+        # el iid de cada fila es el id de su tarea
+        if self._seleccion is None:
             return None
-        vals = self.tree.item(sel[0])['values']
-        return int(vals[0])
+        tid = int(self._seleccion)
+        if self.gestor.obtener_tarea_por_id(tid) is None:
+            self._seleccion = None
+            return None
+        return tid
 
     def view_selected(self):
         tid = self._selected_task_id()
@@ -305,7 +500,13 @@ class TareasApp:
     def guardar_tareas(self):
         archivo = self.entry_archivo.get().strip() or 'tareas.json'
         ok = self.gestor.guardar_tareas(archivo)
-        messagebox.showinfo('Guardar', 'Guardado exitoso' if ok else 'Error al guardar')
+        messagebox.showinfo('Guardar', 'Guardando en segundo plano' if ok else 'Error al guardar')
+
+    def cerrar(self):
+        # No salir con un guardado a medio escribir
+        self._consultas.cancelar()
+        self.gestor.persistence_manager.esperar_guardados()
+        self.root.destroy()
 
     def cargar_tareas(self):
         archivo = self.entry_archivo.get().strip() or 'tareas.json'
@@ -0,0 +1,297 @@
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from datetime import datetime
+from operator import itemgetter
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Set
+from models.tarea import Tarea
+
+_VALOR_ACTUAL = object()
+
+
+_PATRON_TOKEN = re.compile(r'\w+')
+
+
+def normalizar_categoria(categoria: str) -> str:
+    return categoria.lower()
+
+
+def normalizar_texto(texto: str) -> str:
+    texto = texto.casefold()
+    if texto.isascii():
+        return texto
+    texto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in texto if not unicodedata.combining(c))
+
+
+def tokenizar(texto: str) -> List[str]:
+    return _PATRON_TOKEN.findall(normalizar_texto(texto))
+
+
+class IndiceSecundario:
+    """Agrupa las tareas por el valor (normalizado) de uno de sus campos.
+
+    Cada cubeta es un dict id -> Tarea, de modo que agregar, quitar y mover
+    una tarea cuesta O(1) y consultar una clave cuesta O(k) en el tamano del
+    resultado.
+    """
+    
+    def __init__(self, campo: str, normalizar: Optional[Callable] = None):
+        self.campo = campo
+        self.campos = frozenset([campo])
+        self.normalizar = normalizar
+        self._cubetas: Dict[Hashable, Dict[int, Tarea]] = {}
+    
+    def _clave(self, valor) -> Hashable:
+        if self.normalizar and valor is not None:
+            return self.normalizar(valor)
+        return valor
+    
+    def agregar(self, tarea: Tarea):
+        clave = self._clave(getattr(tarea, self.campo))
+        self._cubetas.setdefault(clave, {})[tarea.id] = tarea
+    
+    def quitar(self, tarea: Tarea, valor=_VALOR_ACTUAL):
+        if valor is _VALOR_ACTUAL:
+            valor = getattr(tarea, self.campo)
+        clave = self._clave(valor)
+        cubeta = self._cubetas.get(clave)
+        if cubeta is not None:
+            cubeta.pop(tarea.id, None)
+            if not cubeta:
+                del self._cubetas[clave]
+    
+    def tarea_modificada(self, tarea: Tarea, campo: str, anterior):
+        self.quitar(tarea, anterior)
+        self.agregar(tarea)
+    
+    def agregar_lote(self, tareas: List[Tarea]):
+        for tarea in tareas:
+            self.agregar(tarea)
+    
+    def quitar_lote(self, tareas: List[Tarea]):
+        for tarea in tareas:
+            self.quitar(tarea)
+    
+    def modificadas_lote(self, cambios: List[tuple]):
+        # cambios: (tarea, campo, valor anterior) en el orden en que se hicieron
+        for tarea, campo, anterior in cambios:
+            if campo == self.campo:
+                self.tarea_modificada(tarea, campo, anterior)
+    
+    def obtener(self, valor) -> List[Tarea]:
+        cubeta = self._cubetas.get(self._clave(valor))
+        if not cubeta:
+            return []
+        return sorted(cubeta.values(), key=lambda tarea: tarea.id)
+    
+    def valores(self, valor) -> List[Tarea]:
+        # Como obtener pero sin ordenar
+        return list(self._cubetas.get(self._clave(valor), {}).values())
+    
+    def contar(self, valor) -> int:
+        return len(self._cubetas.get(self._clave(valor), ()))
+    
+    def limpiar(self):
+        self._cubetas.clear()
+
+
+
+class IndiceFechas:
+    """Mantiene ordenadas por fecha las tareas con ese campo definido.
+
+    Las entradas son tuplas (fecha, id, tarea) en una lista ordenada que se
+    mantiene con bisect: las consultas por rango cuestan O(log n + k) y el
+    orden completo se obtiene sin volver a ordenar. Con `incluir` el indice
+    solo guarda las tareas que cumplen el predicado (y se reevalua cuando
+    cambia el estado).
+    """
+    
+    def __init__(self, campo: str = 'fecha_limite', incluir: Optional[Callable[[Tarea], bool]] = None):
+        self.campo = campo
+        self.campos = frozenset([campo, 'estado']) if incluir else frozenset([campo])
+        self.incluir = incluir
+        self._entradas: List[tuple] = []
+        self._fechas: Dict[int, datetime] = {}
+    
+    def agregar(self, tarea: Tarea):
+        fecha = getattr(tarea, self.campo)
+        if fecha is None or (self.incluir and not self.incluir(tarea)):
+            return
+        insort(self._entradas, (fecha, tarea.id, tarea))
+        self._fechas[tarea.id] = fecha
+    
+    def quitar(self, tarea: Tarea):
+        fecha = self._fechas.pop(tarea.id, None)
+        if fecha is None:
+            return
+        posicion = bisect_left(self._entradas, (fecha, tarea.id))
+        del self._entradas[posicion]
+    
+    def tarea_modificada(self, tarea: Tarea, campo: str, anterior):
+        self.quitar(tarea)
+        self.agregar(tarea)
+    
+    def agregar_lote(self, tareas: List[Tarea]):
+        # Se anaden al final y se reordena una vez: Timsort aprovecha que la
+        # lista ya estaba ordenada, en vez de desplazarla con cada insort
+        nuevas = []
+        for tarea in tareas:
+            fecha = getattr(tarea, self.campo)
+            if fecha is None or (self.incluir and not self.incluir(tarea)):
+                continue
+            nuevas.append((fecha, tarea.id, tarea))
+            self._fechas[tarea.id] = fecha
+        if len(nuevas) < 8:
+            for entrada in nuevas:
+                insort(self._entradas, entrada)
+        else:
+            self._entradas.extend(nuevas)
+            self._entradas.sort()
+    
+    def quitar_lote(self, tareas: List[Tarea]):
+        quitadas = []
+        for tarea in tareas:
+            fecha = self._fechas.pop(tarea.id, None)
+            if fecha is not None:
+                quitadas.append((fecha, tarea.id))
+        if len(quitadas) < 8:
+            for clave in quitadas:
+                del self._entradas[bisect_left(self._entradas, clave)]
+        else:
+            # Una pasada que reconstruye la lista en vez de un borrado por tarea
+            ids = {id_tarea for _, id_tarea in quitadas}
+            self._entradas = [entrada for entrada in self._entradas if entrada[1] not in ids]
+    
+    def modificadas_lote(self, cambios: List[tuple]):
+        tareas = list({tarea.id: tarea for tarea, campo, _ in cambios if campo in self.campos}.values())
+        self.quitar_lote(tareas)
+        self.agregar_lote(tareas)
+    
+    def rango(self, fecha_inicio: datetime, fecha_fin: datetime) -> List[Tarea]:
+        inicio = bisect_left(self._entradas, (fecha_inicio,))
+        fin = bisect_left(self._entradas, (fecha_fin, float('inf')))
+        return [entrada[2] for entrada in self._entradas[inicio:fin]]
+    
+    def anteriores_a(self, fecha: datetime) -> List[Tarea]:
+        fin = bisect_left(self._entradas, (fecha,))
+        return [entrada[2] for entrada in self._entradas[:fin]]
+    
+    def ordenadas(self, ascendente: bool = True) -> List[Tarea]:
+        entradas = self._entradas if ascendente else reversed(self._entradas)
+        return [entrada[2] for entrada in entradas]
+    
+    def recorrer(self, ascendente: bool = True) -> Iterator[Tarea]:
+        """Las tareas en orden de fecha sin copiar la lista. Los empates van
+        por id ascendente tambien en orden descendente, como en consultar."""
+        if ascendente:
+            return map(itemgetter(2), self._entradas)
+        return self._recorrer_descendente()
+    
+    def _recorrer_descendente(self) -> Iterator[Tarea]:
+        # Cada fecha, de la ultima a la primera, con sus tareas por id
+        entradas = self._entradas
+        fin = len(entradas)
+        while fin:
+            inicio = bisect_left(entradas, (entradas[fin - 1][0],), 0, fin)
+            for posicion in range(inicio, fin):
+                yield entradas[posicion][2]
+            fin = inicio
+    
+    def __len__(self) -> int:
+        return len(self._entradas)
+    
+    def limpiar(self):
+        self._entradas.clear()
+        self._fechas.clear()
+
+
+
+class IndiceTexto:
+    """Indice invertido sobre titulo y descripcion.
+
+    Los tokens se guardan sin mayusculas ni acentos. El vocabulario ordenado
+    se reconstruye en la primera busqueda tras un cambio de tokens y resuelve
+    prefijos con bisect, de modo que una busqueda solo recorre los tokens y
+    las tareas que coinciden.
+    """
+    
+    campos = frozenset(['titulo', 'descripcion'])
+    
+    def __init__(self):
+        self._ids_por_token: Dict[str, Set[int]] = {}
+        self._tokens_por_id: Dict[int, frozenset] = {}
+        self._vocabulario: List[str] = []
+        self._vocabulario_valido = True
+    
+    def agregar(self, tarea: Tarea):
+        tokens = frozenset(tokenizar(tarea.titulo) + tokenizar(tarea.descripcion))
+        self._tokens_por_id[tarea.id] = tokens
+        for token in tokens:
+            ids = self._ids_por_token.get(token)
+            if ids is None:
+                ids = self._ids_por_token[token] = set()
+                self._vocabulario_valido = False
+            ids.add(tarea.id)
+    
+    def quitar(self, tarea: Tarea):
+        tokens = self._tokens_por_id.pop(tarea.id, None)
+        if tokens is None:
+            return
+        for token in tokens:
+            ids = self._ids_por_token[token]
+            ids.discard(tarea.id)
+            if not ids:
+                del self._ids_por_token[token]
+                self._vocabulario_valido = False
+    
+    def tarea_modificada(self, tarea: Tarea, campo: str, anterior):
+        self.quitar(tarea)
+        self.agregar(tarea)
+    
+    def agregar_lote(self, tareas: List[Tarea]):
+        for tarea in tareas:
+            self.agregar(tarea)
+    
+    def quitar_lote(self, tareas: List[Tarea]):
+        for tarea in tareas:
+            self.quitar(tarea)
+    
+    def modificadas_lote(self, cambios: List[tuple]):
+        # Cada tarea se reindexa una vez aunque cambien titulo y descripcion
+        tareas = {tarea.id: tarea for tarea, campo, _ in cambios if campo in self.campos}
+        for tarea in tareas.values():
+            self.quitar(tarea)
+            self.agregar(tarea)
+    
+    def _ids_con_prefijo(self, prefijo: str) -> Set[int]:
+        if not self._vocabulario_valido:
+            self._vocabulario = sorted(self._ids_por_token)
+            self._vocabulario_valido = True
+        ids = set()
+        posicion = bisect_left(self._vocabulario, prefijo)
+        while posicion < len(self._vocabulario) and self._vocabulario[posicion].startswith(prefijo):
+            ids |= self._ids_por_token[self._vocabulario[posicion]]
+            posicion += 1
+        return ids
+    
+    def buscar_ids(self, texto: str) -> Optional[List[int]]:
+        """Ids (ordenados) de las tareas que contienen, para cada palabra de
+        `texto`, un token que empieza por ella. Devuelve None si `texto` no
+        tiene palabras."""
+        prefijos = set(tokenizar(texto))
+        if not prefijos:
+            return None
+        resultado = None
+        for prefijo in sorted(prefijos, key=len, reverse=True):
+            ids = self._ids_con_prefijo(prefijo)
+            resultado = ids if resultado is None else resultado & ids
+            if not resultado:
+                return []
+        return sorted(resultado)
+    
+    def limpiar(self):
+        self._ids_por_token.clear()
+        self._tokens_por_id.clear()
+        self._vocabulario.clear()
+        self._vocabulario_valido = True
@@ -0,0 +1,330 @@
+import argparse
+import base64
+import json
+import os
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+from models.tarea import Tarea, EstadoTarea, Prioridad
+from models.almacen import CLAVES_ORDEN
+from models.gestor_tareas import CAMPOS_CREACION, CAMPOS_ACTUALIZABLES
+from models.gestor_concurrente import GestorTareasConcurrente
+from persistence.json_persistence import tarea_a_dict
+
+LIMITE_PAGINA = 50
+LIMITE_MAXIMO = 500
+FILTROS = ('texto', 'estado', 'categoria', 'prioridad', 'orden', 'ascendente')
+
+
+def campos_desde_json(datos, permitidos: frozenset) -> dict:
+    # Valida y convierte los campos de una tarea tal como llegan en JSON
+    if not isinstance(datos, dict):
+        raise ValueError("Se esperaba un objeto con los campos de la tarea")
+    desconocidos = datos.keys() - permitidos
+    if desconocidos:
+        raise ValueError(f"Campos no soportados: {', '.join(sorted(desconocidos))}")
+    campos = dict(datos)
+    for campo in ('titulo', 'descripcion', 'categoria'):
+        if campo in campos and not isinstance(campos[campo], str):
+            raise ValueError(f"El campo {campo} debe ser texto")
+    if campos.get('fecha_limite') is not None:
+        if not isinstance(campos['fecha_limite'], str):
+            raise ValueError("fecha_limite debe ser una fecha ISO 8601")
+        campos['fecha_limite'] = datetime.fromisoformat(campos['fecha_limite'])
+    if 'estado' in campos:
+        campos['estado'] = EstadoTarea(campos['estado'])
+    if 'prioridad' in campos:
+        campos['prioridad'] = Prioridad(campos['prioridad'])
+    return campos
+
+
+def codificar_cursor(filtros: dict, ultima: Tarea) -> str:
+    # Cursor por clave: los filtros de la primera pagina y la clave de orden
+    # y el id de la ultima tarea enviada; las fechas van en ISO 8601
+    clave = CLAVES_ORDEN[filtros.get('orden', 'id')](ultima)
+    if isinstance(clave, datetime):
+        clave = clave.isoformat()
+    datos = json.dumps([filtros, clave, ultima.id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(datos).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor: str) -> Tuple[dict, tuple]:
+    # Devuelve los filtros y el `despues_de` de consultar
+    try:
+        datos = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        filtros, clave, id_tarea = json.loads(datos)
+        if not isinstance(filtros, dict) or type(id_tarea) is not int:
+            raise ValueError
+        # Los filtros son los de la query string: nombres conocidos y texto
+        if filtros.keys() - set(FILTROS) or not all(isinstance(v, str) for v in filtros.values()):
+            raise ValueError
+        orden = filtros.get('orden', 'id')
+        if orden in ('fecha_creacion', 'fecha_limite'):
+            clave = datetime.fromisoformat(clave)
+        elif not isinstance(clave, str if orden == 'titulo' else int):
+            raise ValueError
+    except Exception:
+        raise ValueError("Cursor no valido")
+    return filtros, (clave, id_tarea)
+
+
+class ManejadorTareas(BaseHTTPRequestHandler):
+    """API JSON sobre el GestorTareasConcurrente del servidor.
+
+    GET    /tareas            pagina de una consulta (?texto, estado, categoria,
+                              prioridad, orden, ascendente, limite, cursor)
+    GET    /tareas/<id>       una tarea
+    GET    /estadisticas
+    POST   /tareas            crea una tarea
+    POST   /tareas/lote       {"crear": [...], "actualizar": {id: {...}}, "eliminar": [ids]}
+    PATCH  /tareas/<id>       actualiza campos
+    DELETE /tareas/<id>
+
+    Las respuestas GET llevan un ETag ligado a la version del gestor y
+    responden 304 a un If-None-Match que coincide. Con HTTP/1.1 la conexion
+    se reutiliza entre peticiones.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    # Cabeceras y cuerpo salen en un solo envio (handle_one_request vacia el
+    # bufer al acabar cada peticion) y sin Nagle: en una conexion reutilizada
+    # dos escrituras pequenas seguidas esperan al ACK retardado (~40 ms)
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def log_message(self, formato, *args):
+        if self.server.registrar:
+            super().log_message(formato, *args)
+
+    @property
+    def gestor(self) -> GestorTareasConcurrente:
+        return self.server.gestor
+
+    # --- Respuestas ---
+    def _responder(self, estado: int, cuerpo=None, cabeceras: Optional[dict] = None):
+        datos = b'' if cuerpo is None else json.dumps(cuerpo, ensure_ascii=False).encode('utf-8')
+        self.send_response(estado)
+        for nombre, valor in (cabeceras or {}).items():
+            self.send_header(nombre, valor)
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        if estado not in (204, 304):
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(datos)))
+        self.end_headers()
+        if estado not in (204, 304):
+            self.wfile.write(datos)
+
+    def _error(self, estado: int, mensaje: str):
+        self._responder(estado, {'error': mensaje})
+
+    def _leer_json(self):
+        try:
+            return json.loads(self._cuerpo or b'null')
+        except ValueError:
+            raise ValueError("El cuerpo no es JSON valido")
+
+    def _etag(self, version: int) -> str:
+        # El prefijo distingue versiones de arranques distintos del servidor
+        return f'"{self.server.arranque}-{version}"'
+
+    def _responder_lectura(self, generar):
+        """GET condicional: `generar()` construye el cuerpo con el cerrojo de
+        lectura tomado, asi el ETag corresponde exactamente a lo enviado."""
+        etiqueta = self._etag(self.gestor.version)
+        if etiqueta in self.headers.get('If-None-Match', ''):
+            self._responder(304, cabeceras={'ETag': etiqueta})
+            return
+        with self.gestor.cerrojo.lectura():
+            etiqueta = self._etag(self.gestor.version)
+            estado, cuerpo = generar()
+        self._responder(estado, cuerpo, {'ETag': etiqueta} if estado == 200 else None)
+
+    def _longitud_cuerpo(self) -> int:
+        try:
+            longitud = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            longitud = -1
+        if longitud < 0:
+            # Sin saber donde acaba el cuerpo no se puede leer la siguiente
+            # peticion de la conexion
+            self.close_connection = True
+            raise ValueError("Content-Length no valido")
+        return longitud
+
+    def _despachar(self, metodo: str):
+        try:
+            # El cuerpo se lee siempre: si quedara en el socket, la siguiente
+            # peticion de la conexion empezaria a mitad de el
+            self._cuerpo = self.rfile.read(self._longitud_cuerpo())
+            ruta = urlsplit(self.path)
+            partes = [parte for parte in ruta.path.split('/') if parte]
+            id_tarea = int(partes[1]) if len(partes) == 2 and partes[1].isdigit() else None
+            if partes not in (['tareas'], ['tareas', 'lote'], ['estadisticas']) and (
+                    id_tarea is None or partes[0] != 'tareas'):
+                return self._error(404, "Ruta no encontrada")
+            if partes == ['estadisticas'] and metodo == 'GET':
+                return self._responder_lectura(lambda: (200, self.gestor.obtener_estadisticas()))
+            if partes == ['tareas'] and metodo == 'GET':
+                return self._listar(parse_qs(ruta.query))
+            if partes == ['tareas'] and metodo == 'POST':
+                return self._crear(self._leer_json())
+            if partes == ['tareas', 'lote'] and metodo == 'POST':
+                return self._lote(self._leer_json())
+            if id_tarea is not None and metodo == 'GET':
+                return self._responder_lectura(lambda: self._tarea(id_tarea))
+            if id_tarea is not None and metodo == 'PATCH':
+                return self._actualizar(id_tarea, self._leer_json())
+            if id_tarea is not None and metodo == 'DELETE':
+                if self.gestor.eliminar_tarea(id_tarea):
+                    return self._responder(204)
+                return self._error(404, f"No existe la tarea {id_tarea}")
+            self._error(405, "Metodo no soportado")
+        except ValueError as e:
+            self._error(400, str(e))
+        except Exception as e:
+            print(f"Error atendiendo {metodo} {self.path}: {e}")
+            self._error(500, "Error interno")
+
+    def do_GET(self):
+        self._despachar('GET')
+
+    def do_POST(self):
+        self._despachar('POST')
+
+    def do_PATCH(self):
+        self._despachar('PATCH')
+
+    def do_DELETE(self):
+        self._despachar('DELETE')
+
+    def do_PUT(self):
+        self._despachar('PUT')
+
+    # --- Operaciones ---
+    def _tarea(self, id_tarea: int):
+        tarea = self.gestor.obtener_tarea_por_id(id_tarea)
+        if tarea is None:
+            return 404, {'error': f"No existe la tarea {id_tarea}"}
+        return 200, tarea_a_dict(tarea)
+
+    def _listar(self, parametros: dict):
+        valor = lambda nombre: parametros.get(nombre, [None])[-1]
+        limite = int(valor('limite') or LIMITE_PAGINA)
+        if not 0 < limite <= LIMITE_MAXIMO:
+            raise ValueError(f"limite debe estar entre 1 y {LIMITE_MAXIMO}")
+        if valor('cursor'):
+            # El cursor guarda los filtros de la primera pagina; la siguiente
+            # empieza justo detras de la ultima tarea enviada, asi las altas y
+            # bajas entre paginas no repiten ni saltan tareas
+            filtros, despues_de = decodificar_cursor(valor('cursor'))
+        else:
+            filtros = {nombre: valor(nombre) for nombre in FILTROS if valor(nombre) is not None}
+            despues_de = None
+        estado = filtros.get('estado')
+        prioridad = filtros.get('prioridad')
+        consulta = dict(texto=filtros.get('texto', ''),
+                        estado=EstadoTarea(estado) if estado else None,
+                        categoria=filtros.get('categoria'),
+                        prioridad=Prioridad(prioridad) if prioridad else None,
+                        orden=filtros.get('orden', 'id'),
+                        ascendente=str(filtros.get('ascendente', 'true')).lower() != 'false')
+
+        def generar():
+            # Se pide una tarea de mas para saber si hay otra pagina
+            tareas = self.gestor.consultar(limite=limite + 1, despues_de=despues_de, **consulta)
+            siguiente = None
+            if len(tareas) > limite:
+                tareas = tareas[:limite]
+                siguiente = codificar_cursor(filtros, tareas[-1])
+            return 200, {'tareas': [tarea_a_dict(tarea) for tarea in tareas], 'siguiente': siguiente}
+
+        self._responder_lectura(generar)
+
+    def _crear(self, datos):
+        campos = campos_desde_json(datos, CAMPOS_CREACION)
+        if 'titulo' not in campos:
+            raise ValueError("La tarea necesita un titulo")
+        tarea = self.gestor.crear_tarea(**campos)
+        self._responder(201, tarea_a_dict(tarea), {'Location': f"/tareas/{tarea.id}"})
+
+    def _actualizar(self, id_tarea: int, datos):
+        # Los metodos del gestor toman ya el cerrojo de escritura y esperan
+        # al registro sin el; envolverlos en otro cerrojo haria esperar a
+        # todos los escritores al fsync de cada uno
+        campos = campos_desde_json(datos, CAMPOS_ACTUALIZABLES)
+        if self.gestor.actualizar_tarea(id_tarea, **campos):
+            with self.gestor.cerrojo.lectura():
+                tarea = self.gestor.obtener_tarea_por_id(id_tarea)
+                cuerpo = None if tarea is None else tarea_a_dict(tarea)
+            if cuerpo is not None:
+                return self._responder(200, cuerpo)
+        self._error(404, f"No existe la tarea {id_tarea}")
+
+    def _lote(self, datos):
+        # Se valida todo antes de aplicar nada
+        if not isinstance(datos, dict) or datos.keys() - {'crear', 'actualizar', 'eliminar'}:
+            raise ValueError("El lote admite crear, actualizar y eliminar")
+        crear = [campos_desde_json(campos, CAMPOS_CREACION) for campos in datos.get('crear', [])]
+        actualizar = datos.get('actualizar', {})
+        if isinstance(actualizar, dict):
+            actualizar = list(actualizar.items())
+        try:
+            actualizar = [(int(id_tarea), campos_desde_json(campos, CAMPOS_ACTUALIZABLES))
+                          for id_tarea, campos in actualizar]
+            eliminar = [int(id_tarea) for id_tarea in datos.get('eliminar', [])]
+        except TypeError:
+            raise ValueError("Lote mal formado")
+        # Cada parte toma el cerrojo de escritura por su cuenta (ver
+        # _actualizar)
+        creadas = self.gestor.crear_tareas_lote(crear)
+        actualizadas = self.gestor.actualizar_lote(actualizar)
+        eliminadas = self.gestor.eliminar_lote(eliminar)
+        with self.gestor.cerrojo.lectura():
+            cuerpo = {'creadas': [tarea_a_dict(tarea) for tarea in creadas],
+                      'actualizadas': actualizadas,
+                      'eliminadas': eliminadas}
+        self._responder(200, cuerpo)
+
+
+def crear_servidor(gestor: Optional[GestorTareasConcurrente] = None, host: str = '127.0.0.1',
+                   puerto: int = 8000, registrar: bool = False) -> ThreadingHTTPServer:
+    # Un hilo por conexion; con puerto 0 el sistema elige uno libre
+    servidor = ThreadingHTTPServer((host, puerto), ManejadorTareas)
+    servidor.daemon_threads = True
+    servidor.gestor = gestor if gestor is not None else GestorTareasConcurrente()
+    servidor.arranque = uuid.uuid4().hex[:8]
+    servidor.registrar = registrar
+    return servidor
+
+
+def main(argumentos: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Servidor HTTP/JSON del gestor de tareas")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8000)
+    parser.add_argument('--archivo', default='tareas.json',
+                        help="se carga al arrancar y se guarda al parar")
+    parser.add_argument('--persistencia', default='json')
+    parser.add_argument('--registrar', action='store_true', help="muestra cada peticion")
+    opciones = parser.parse_args(argumentos)
+
+    gestor = GestorTareasConcurrente()
+    gestor.establecer_persistencia(opciones.persistencia)
+    if os.path.exists(opciones.archivo):
+        gestor.cargar_tareas(opciones.archivo)
+    servidor = crear_servidor(gestor, opciones.host, opciones.puerto, opciones.registrar)
+    print(f"Sirviendo {len(gestor.almacen)} tareas en http://{opciones.host}:{servidor.server_address[1]}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        if gestor.guardar_tareas(opciones.archivo):
+            print(f"Tareas guardadas en {opciones.archivo}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,4 @@
+import sys
 from datetime import datetime
 from enum import Enum
 
@@ -11,9 +12,22 @@ class Prioridad(Enum):
     MEDIA = "media"
     BAJA = "baja"
 
+# Campos cuyo cambio se notifica al gestor dueno de la tarea para que
+# mantenga sus indices y su almacen al dia
+CAMPOS_OBSERVADOS = frozenset(['titulo', 'descripcion', 'categoria',
+                               'fecha_limite', 'estado', 'prioridad',
+                               'fecha_creacion', 'fecha_actualizacion'])
+
 class Tarea:
+    # Sin __dict__ por instancia: con millones de tareas el coste por objeto
+    # domina la memoria
+    __slots__ = ('id', 'titulo', 'descripcion', 'categoria', 'fecha_limite', 'estado',
+                 'prioridad', 'fecha_creacion', 'fecha_actualizacion', '_observador',
+                 '__weakref__')
+    
     def __init__(self, titulo, descripcion="", categoria="general", 
                  fecha_limite=None, estado=EstadoTarea.PENDIENTE, prioridad=Prioridad.MEDIA):
+        self._observador = None
         self.id = id(self)
         self.titulo = titulo
         self.descripcion = descripcion
@@ -21,8 +35,53 @@ class Tarea:
         self.fecha_limite = fecha_limite
         self.estado = estado
         self.prioridad = prioridad
-        self.fecha_creacion = datetime.now()
-        self.fecha_actualizacion = datetime.now()
+        ahora = datetime.now()
+        self.fecha_creacion = ahora
+        self.fecha_actualizacion = ahora
+    
+    @classmethod
+    def desde_campos(cls, id_tarea, titulo, descripcion, categoria, fecha_limite,
+                     estado, prioridad, fecha_creacion, fecha_actualizacion):
+        # Reconstruye una tarea ya existente sin pasar por __init__ (que
+        # consulta el reloj para fechas que se sobrescribirian)
+        tarea = cls.__new__(cls)
+        asignar = object.__setattr__
+        asignar(tarea, '_observador', None)
+        asignar(tarea, 'id', id_tarea)
+        asignar(tarea, 'titulo', titulo)
+        asignar(tarea, 'descripcion', descripcion)
+        asignar(tarea, 'categoria', sys.intern(categoria))
+        asignar(tarea, 'fecha_limite', fecha_limite)
+        asignar(tarea, 'estado', estado)
+        asignar(tarea, 'prioridad', prioridad)
+        asignar(tarea, 'fecha_creacion', fecha_creacion)
+        asignar(tarea, 'fecha_actualizacion', fecha_actualizacion)
+        return tarea
+    
+    def __getstate__(self):
+        # Sin el observador: una copia serializada (p. ej. para otro proceso)
+        # no pertenece a ningun gestor
+        return (self.id, self.titulo, self.descripcion, self.categoria, self.fecha_limite,
+                self.estado, self.prioridad, self.fecha_creacion, self.fecha_actualizacion)
+    
+    def __setstate__(self, estado):
+        asignar = object.__setattr__
+        asignar(self, '_observador', None)
+        for campo, valor in zip(self.__slots__[:9], estado):
+            asignar(self, campo, valor)
+    
+    def __setattr__(self, campo, valor):
+        if campo == 'categoria' and type(valor) is str:
+            # pocas categorias distintas repetidas en muchas tareas
+            valor = sys.intern(valor)
+        observador = getattr(self, '_observador', None)
+        if observador is None or campo not in CAMPOS_OBSERVADOS:
+            object.__setattr__(self, campo, valor)
+            return
+        anterior = getattr(self, campo, None)
+        object.__setattr__(self, campo, valor)
+        if anterior != valor:
+            observador.tarea_modificada(self, campo, anterior)
     
     def actualizar_estado(self, nuevo_estado):
         self.estado = nuevo_estado
@@ -1,10 +1,16 @@
 from .persistence_manager import PersistenceManager, PersistenceStrategy
 from .json_persistence import JSONPersistence
 from .csv_persistence import CSVPersistence
+from .jsonl_persistence import JSONLPersistence
+from .sqlite_persistence import SQLitePersistence
+from .binaria_persistence import BinariaPersistence
 
 __all__ = [
     'PersistenceManager',
     'PersistenceStrategy', 
     'JSONPersistence',
-    'CSVPersistence'
+    'CSVPersistence',
+    'JSONLPersistence',
+    'SQLitePersistence',
+    'BinariaPersistence'
 ]
\ No newline at end of file
@@ -0,0 +1,186 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from typing import Iterator, List
+from models.tarea import Tarea
+from models.almacen import ORDEN_ESTADO, ORDEN_PRIORIDAD
+from .persistence_manager import PersistenceStrategy, escritura_atomica
+from models.almacen_columnar import a_epoca, desde_epoca
+from .sqlite_persistence import ESTADO_POR_CODIGO, PRIORIDAD_POR_CODIGO
+
+MAGIA = b'TAREASB\x00'
+VERSION = 1
+# magia, version, reservado, numero de tareas, numero de cadenas
+CABECERA = struct.Struct('<8sIIQQ')
+# id, fecha_limite, fecha_creacion, fecha_actualizacion (microsegundos desde
+# la epoca), titulo, descripcion, categoria (posiciones en la tabla de
+# cadenas), estado, prioridad
+REGISTRO = struct.Struct('<qqqqIIIbbxx')
+# fecha_limite ausente
+SIN_FECHA = -2 ** 63
+
+
+class LectorInstantanea:
+    """Acceso por posicion a una instantanea binaria proyectada con mmap.
+
+    Solo se lee del disco lo que se toca: cada tarea se decodifica al
+    pedirla y cada cadena la primera vez que se usa, de modo que las
+    tareas que comparten categoria o descripcion comparten el str.
+    """
+
+    def __init__(self, archivo: str):
+        with open(archivo, 'rb') as f:
+            # mmap no admite archivos vacios; se tratan como cualquier otro corte
+            if os.fstat(f.fileno()).st_size < CABECERA.size:
+                raise ValueError("Instantanea truncada")
+            self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magia, version, _, self._total, total_cadenas = CABECERA.unpack_from(self._mapa)
+            if magia != MAGIA:
+                raise ValueError("El archivo no es una instantanea de tareas")
+            if version != VERSION:
+                raise ValueError(f"Version de instantanea no soportada: {version}")
+            inicio_desplazamientos = CABECERA.size + self._total * REGISTRO.size
+            self._inicio_cadenas = inicio_desplazamientos + (total_cadenas + 1) * 8
+            if len(self._mapa) < self._inicio_cadenas:
+                raise ValueError("Instantanea truncada")
+            self._vista = memoryview(self._mapa)
+            self._registros = self._vista[CABECERA.size:inicio_desplazamientos]
+            desplazamientos = self._vista[inicio_desplazamientos:self._inicio_cadenas]
+            try:
+                if sys.byteorder == 'little':
+                    self._desplazamientos = desplazamientos.cast('Q')
+                else:
+                    self._desplazamientos = array('Q', desplazamientos)
+                    self._desplazamientos.byteswap()
+            finally:
+                # si queda viva en el marco de una excepcion, cerrar() no
+                # podria cerrar el mapa
+                desplazamientos.release()
+            if len(self._mapa) < self._inicio_cadenas + self._desplazamientos[-1]:
+                raise ValueError("Instantanea truncada")
+        except Exception:
+            self.cerrar()
+            raise
+        self._cadenas = [None] * total_cadenas
+
+    def _cadena(self, indice: int) -> str:
+        cadena = self._cadenas[indice]
+        if cadena is None:
+            inicio = self._inicio_cadenas + self._desplazamientos[indice]
+            fin = self._inicio_cadenas + self._desplazamientos[indice + 1]
+            cadena = self._cadenas[indice] = str(self._mapa[inicio:fin], 'utf-8')
+        return cadena
+
+    def _construir(self, campos) -> Tarea:
+        (id_tarea, fecha_limite, fecha_creacion, fecha_actualizacion,
+         titulo, descripcion, categoria, estado, prioridad) = campos
+        creacion = desde_epoca(fecha_creacion)
+        return Tarea.desde_campos(
+            id_tarea,
+            self._cadena(titulo),
+            self._cadena(descripcion),
+            self._cadena(categoria),
+            None if fecha_limite == SIN_FECHA else desde_epoca(fecha_limite),
+            ESTADO_POR_CODIGO[estado],
+            PRIORIDAD_POR_CODIGO[prioridad],
+            creacion,
+            creacion if fecha_actualizacion == fecha_creacion else desde_epoca(fecha_actualizacion)
+        )
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __getitem__(self, posicion: int) -> Tarea:
+        if posicion < 0:
+            posicion += self._total
+        if not 0 <= posicion < self._total:
+            raise IndexError("Posicion fuera de la instantanea")
+        return self._construir(REGISTRO.unpack_from(self._registros, posicion * REGISTRO.size))
+
+    def __iter__(self) -> Iterator[Tarea]:
+        construir = self._construir
+        for campos in REGISTRO.iter_unpack(self._registros):
+            yield construir(campos)
+
+    def cerrar(self):
+        # Las vistas deben soltarse antes de cerrar el mapa
+        for nombre in ('_desplazamientos', '_registros', '_vista'):
+            vista = self.__dict__.pop(nombre, None)
+            if isinstance(vista, memoryview):
+                vista.release()
+        self._mapa.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+class BinariaPersistence(PersistenceStrategy):
+    """Instantanea binaria de registros de ancho fijo para arrancar rapido.
+
+    Las fechas son enteros, estado y prioridad codigos de un byte y los
+    textos posiciones en una tabla de cadenas sin repetidos al final del
+    archivo. Se carga con mmap a traves de LectorInstantanea.
+    """
+
+    def guardar_tareas(self, tareas: List[Tarea], archivo: str) -> bool:
+        try:
+            posiciones = {}
+            cadenas = []
+
+            def posicion(texto: str) -> int:
+                indice = posiciones.get(texto)
+                if indice is None:
+                    indice = posiciones[texto] = len(cadenas)
+                    cadenas.append(texto.encode('utf-8'))
+                return indice
+
+            empaquetar = REGISTRO.pack
+            registros = []
+            for tarea in tareas:
+                registros.append(empaquetar(
+                    tarea.id,
+                    a_epoca(tarea.fecha_limite, SIN_FECHA),
+                    a_epoca(tarea.fecha_creacion),
+                    a_epoca(tarea.fecha_actualizacion),
+                    posicion(tarea.titulo),
+                    posicion(tarea.descripcion),
+                    posicion(tarea.categoria),
+                    ORDEN_ESTADO[tarea.estado],
+                    ORDEN_PRIORIDAD[tarea.prioridad]
+                ))
+            desplazamientos = array('Q', accumulate(map(len, cadenas), initial=0))
+            if sys.byteorder != 'little':
+                desplazamientos.byteswap()
+
+            with escritura_atomica(archivo, 'wb') as f:
+                f.write(CABECERA.pack(MAGIA, VERSION, 0, len(registros), len(cadenas)))
+                f.writelines(registros)
+                f.write(desplazamientos.tobytes())
+                f.writelines(cadenas)
+            return True
+        except Exception as e:
+            print(f"Error guardando binario: {e}")
+            return False
+
+    def cargar_tareas(self, archivo: str) -> List[Tarea]:
+        try:
+            return list(self.iterar_tareas(archivo))
+        except Exception as e:
+            print(f"Error cargando binario: {e}")
+            return []
+
+    def iterar_tareas(self, archivo: str) -> Iterator[Tarea]:
+        if not os.path.exists(archivo):
+            return
+        with LectorInstantanea(archivo) as lector:
+            yield from lector
+
+    def get_nombre(self) -> str:
+        return "Binaria"
\ No newline at end of file
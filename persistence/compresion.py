@@ -0,0 +1,59 @@
+import bz2
+import gzip
+import lzma
+import os
+from contextlib import contextmanager
+from typing import Optional
+from .persistence_manager import escritura_atomica
+
+# Codec -> (extension, funcion de apertura, opciones al escribir). Todas
+# aceptan un nombre de archivo o un objeto archivo y comprimen por bloques,
+# sin tener en memoria el contenido completo sin comprimir
+CODECS = {
+    'gzip': ('.gz', gzip.open, {'compresslevel': 6}),
+    'bz2': ('.bz2', bz2.open, {}),
+    'xz': ('.xz', lzma.open, {}),
+}
+
+try:
+    # Python 3.14+
+    from compression import zstd
+    CODECS['zstd'] = ('.zst', zstd.open, {})
+except ImportError:
+    pass
+
+
+def resolver_compresion(archivo: str, compresion: Optional[str] = 'auto') -> Optional[str]:
+    """Codec a usar con `archivo`: con 'auto' se elige por la extension;
+    None o '' es sin comprimir."""
+    if compresion == 'auto':
+        extension = os.path.splitext(archivo)[1].lower()
+        for nombre, (extension_codec, _, _) in CODECS.items():
+            if extension == extension_codec:
+                return nombre
+        return None
+    if compresion and compresion not in CODECS:
+        raise ValueError(f"Compresion no soportada: {compresion}")
+    return compresion or None
+
+
+def abrir_lectura(archivo: str, compresion: Optional[str], **opciones):
+    # Abre en modo texto; `opciones` son las de open (encoding, newline...)
+    if compresion is None:
+        return open(archivo, 'r', **opciones)
+    return CODECS[compresion][1](archivo, 'rt', **opciones)
+
+
+@contextmanager
+def escritura_comprimida(archivo: str, compresion: Optional[str], **opciones):
+    """Como escritura_atomica en modo texto, comprimiendo al vuelo con
+    `compresion` si no es None."""
+    if compresion is None:
+        with escritura_atomica(archivo, 'w', **opciones) as f:
+            yield f
+        return
+    _, abrir, opciones_codec = CODECS[compresion]
+    with escritura_atomica(archivo, 'wb') as destino:
+        # Cerrar el flujo comprimido no cierra `destino`, que aun se sincroniza
+        with abrir(destino, 'wt', **opciones_codec, **opciones) as f:
+            yield f
\ No newline at end of file
@@ -1,33 +1,53 @@
 import csv
-from typing import List
+from typing import Iterator, List, Optional
 from datetime import datetime
 from models.tarea import Tarea, EstadoTarea, Prioridad
 from .persistence_manager import PersistenceStrategy
+from .compresion import resolver_compresion, abrir_lectura, escritura_comprimida
+
+COLUMNAS = ['id', 'titulo', 'descripcion', 'categoria',
+            'fecha_limite', 'estado', 'prioridad',
+            'fecha_creacion', 'fecha_actualizacion']
+
+# Enum.value y Enum(valor) son lentos para millones de filas
+ESTADO_POR_VALOR = {estado.value: estado for estado in EstadoTarea}
+PRIORIDAD_POR_VALOR = {prioridad.value: prioridad for prioridad in Prioridad}
+VALOR_ESTADO = {estado: estado.value for estado in EstadoTarea}
+VALOR_PRIORIDAD = {prioridad: prioridad.value for prioridad in Prioridad}
+
+
+def _fila(tarea: Tarea) -> tuple:
+    creacion = tarea.fecha_creacion.isoformat()
+    return (
+        tarea.id,
+        tarea.titulo,
+        tarea.descripcion,
+        tarea.categoria,
+        tarea.fecha_limite.isoformat() if tarea.fecha_limite else '',
+        VALOR_ESTADO[tarea.estado],
+        VALOR_PRIORIDAD[tarea.prioridad],
+        creacion,
+        # Recien creada las dos fechas coinciden: se formatea una sola vez
+        creacion if tarea.fecha_actualizacion == tarea.fecha_creacion
+        else tarea.fecha_actualizacion.isoformat()
+    )
+
 
 class CSVPersistence(PersistenceStrategy):
+    """Una fila por tarea con cabecera. Con `compresion` 'auto' los
+    archivos .gz, .bz2, .xz (y .zst si hay soporte) van comprimidos."""
+    
+    def __init__(self, compresion: Optional[str] = 'auto'):
+        resolver_compresion('', compresion)
+        self.compresion = compresion
     
     def guardar_tareas(self, tareas: List[Tarea], archivo: str) -> bool:
         try:
-            with open(archivo, 'w', newline='', encoding='utf-8') as f:
+            with escritura_comprimida(archivo, resolver_compresion(archivo, self.compresion),
+                                      newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
-                writer.writerow([
-                    'id', 'titulo', 'descripcion', 'categoria', 
-                    'fecha_limite', 'estado', 'prioridad',
-                    'fecha_creacion', 'fecha_actualizacion'
-                ])
-                
-                for tarea in tareas:
-                    writer.writerow([
-                        tarea.id,
-                        tarea.titulo,
-                        tarea.descripcion,
-                        tarea.categoria,
-                        tarea.fecha_limite.isoformat() if tarea.fecha_limite else '',
-                        tarea.estado.value,
-                        tarea.prioridad.value,
-                        tarea.fecha_creacion.isoformat(),
-                        tarea.fecha_actualizacion.isoformat()
-                    ])
+                writer.writerow(COLUMNAS)
+                writer.writerows(map(_fila, tareas))
             
             return True
             
@@ -37,30 +57,51 @@ class CSVPersistence(PersistenceStrategy):
     
     def cargar_tareas(self, archivo: str) -> List[Tarea]:
         try:
-            tareas = []
-            with open(archivo, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for fila in reader:
-                    tarea = Tarea(
-                        titulo=fila['titulo'],
-                        descripcion=fila['descripcion'],
-                        categoria=fila['categoria'],
-                        fecha_limite=datetime.fromisoformat(fila['fecha_limite']) if fila['fecha_limite'] else None,
-                        estado=EstadoTarea(fila['estado']),
-                        prioridad=Prioridad(fila['prioridad'])
-                    )
-                    tarea.id = int(fila['id'])
-                    tarea.fecha_creacion = datetime.fromisoformat(fila['fecha_creacion'])
-                    tarea.fecha_actualizacion = datetime.fromisoformat(fila['fecha_actualizacion'])
-                    tareas.append(tarea)
-            
-            return tareas
-            
-        except FileNotFoundError:
-            return []
+            return list(self.iterar_tareas(archivo))
         except Exception as e:
             print(f"Error cargando CSV: {e}")
             return []
     
+    def iterar_tareas(self, archivo: str) -> Iterator[Tarea]:
+        try:
+            f = abrir_lectura(archivo, resolver_compresion(archivo, self.compresion),
+                              newline='', encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with f:
+            reader = csv.reader(f)
+            cabecera = next(reader, None)
+            if cabecera is None:
+                return
+            # Las columnas se buscan por nombre una sola vez y despues cada
+            # fila se lee por posicion, sin construir un dict por fila
+            posiciones = {nombre: posicion for posicion, nombre in enumerate(cabecera)}
+            faltan = [columna for columna in COLUMNAS if columna not in posiciones]
+            if faltan:
+                raise ValueError(f"Faltan columnas en el CSV: {', '.join(faltan)}")
+            (p_id, p_titulo, p_descripcion, p_categoria, p_limite, p_estado,
+             p_prioridad, p_creacion, p_actualizacion) = [posiciones[columna] for columna in COLUMNAS]
+            
+            desde_iso = datetime.fromisoformat
+            desde_campos = Tarea.desde_campos
+            for fila in reader:
+                if not fila:
+                    continue
+                limite = fila[p_limite]
+                creacion_texto = fila[p_creacion]
+                actualizacion_texto = fila[p_actualizacion]
+                creacion = desde_iso(creacion_texto)
+                yield desde_campos(
+                    int(fila[p_id]),
+                    fila[p_titulo],
+                    fila[p_descripcion],
+                    fila[p_categoria],
+                    desde_iso(limite) if limite else None,
+                    ESTADO_POR_VALOR[fila[p_estado]],
+                    PRIORIDAD_POR_VALOR[fila[p_prioridad]],
+                    creacion,
+                    creacion if actualizacion_texto == creacion_texto else desde_iso(actualizacion_texto)
+                )
+    
     def get_nombre(self) -> str:
         return "CSV"
\ No newline at end of file
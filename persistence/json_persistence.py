@@ -1,30 +1,135 @@
 import json
-from typing import List
+from typing import Iterator, List, Optional
 from datetime import datetime
 from models.tarea import Tarea, EstadoTarea, Prioridad
 from .persistence_manager import PersistenceStrategy
+from .compresion import resolver_compresion, abrir_lectura, escritura_comprimida
+
+# Caracteres que se leen de cada vez al cargar de forma incremental
+TAMANO_BLOQUE = 1 << 16
+
+_ESPACIOS = ' \t\r\n'
+
+
+def iterar_array_json(f, tamano_bloque: int = TAMANO_BLOQUE) -> Iterator:
+    """Decodifica uno a uno los elementos de un array JSON de nivel superior
+    leyendo `f` por bloques, sin cargar el archivo completo en memoria."""
+    decodificador = json.JSONDecoder()
+    buffer = f.read(tamano_bloque)
+    pos = 0
+    fin_archivo = not buffer
+    dentro_del_array = False
+    
+    while True:
+        while pos < len(buffer) and buffer[pos] in _ESPACIOS:
+            pos += 1
+        if pos == len(buffer):
+            if fin_archivo:
+                if dentro_del_array:
+                    raise ValueError("Array JSON sin cerrar")
+                return
+            buffer = f.read(tamano_bloque)
+            pos = 0
+            fin_archivo = not buffer
+            continue
+        
+        caracter = buffer[pos]
+        if not dentro_del_array:
+            if caracter != '[':
+                raise ValueError("Se esperaba un array JSON de tareas")
+            dentro_del_array = True
+            pos += 1
+        elif caracter == ']':
+            resto = buffer[pos + 1:]
+            while resto:
+                if resto.strip(_ESPACIOS):
+                    raise ValueError("Datos extra despues del array JSON")
+                resto = f.read(tamano_bloque)
+            return
+        elif caracter == ',':
+            pos += 1
+        else:
+            try:
+                valor, fin = decodificador.raw_decode(buffer, pos)
+                completo = fin < len(buffer) or fin_archivo
+            except json.JSONDecodeError:
+                if fin_archivo:
+                    raise
+                completo = False
+            if not completo:
+                # Elemento cortado por el final del bloque: leer mas y reintentar
+                bloque = f.read(tamano_bloque)
+                fin_archivo = not bloque
+                buffer = buffer[pos:] + bloque
+                pos = 0
+                continue
+            pos = fin
+            yield valor
+            if pos > tamano_bloque:
+                buffer = buffer[pos:]
+                pos = 0
+
+
+def escribir_agrupado(f, trozos, tamano_bloque: int = TAMANO_BLOQUE):
+    """Escribe `trozos` juntandolos en bloques de unos `tamano_bloque`
+    caracteres. json.dump hace una escritura por token y, con compresion,
+    cada escritura cuesta una llamada al codec."""
+    bloque = []
+    longitud = 0
+    for trozo in trozos:
+        bloque.append(trozo)
+        longitud += len(trozo)
+        if longitud >= tamano_bloque:
+            f.write(''.join(bloque))
+            bloque.clear()
+            longitud = 0
+    f.write(''.join(bloque))
+
+
+def tarea_a_dict(tarea: Tarea) -> dict:
+    return {
+        'id': tarea.id,
+        'titulo': tarea.titulo,
+        'descripcion': tarea.descripcion,
+        'categoria': tarea.categoria,
+        'fecha_limite': tarea.fecha_limite.isoformat() if tarea.fecha_limite else None,
+        'estado': tarea.estado.value,
+        'prioridad': tarea.prioridad.value,
+        'fecha_creacion': tarea.fecha_creacion.isoformat(),
+        'fecha_actualizacion': tarea.fecha_actualizacion.isoformat()
+    }
+
+
+def tarea_desde_dict(datos: dict) -> Tarea:
+    return Tarea.desde_campos(
+        datos['id'],
+        datos['titulo'],
+        datos['descripcion'],
+        datos['categoria'],
+        datetime.fromisoformat(datos['fecha_limite']) if datos['fecha_limite'] else None,
+        EstadoTarea(datos['estado']),
+        Prioridad(datos['prioridad']),
+        datetime.fromisoformat(datos['fecha_creacion']),
+        datetime.fromisoformat(datos['fecha_actualizacion'])
+    )
+
 
 class JSONPersistence(PersistenceStrategy):
+    """Array JSON de tareas. Con `compresion` 'auto' los archivos .gz,
+    .bz2, .xz (y .zst si hay soporte) se leen y escriben comprimidos."""
+    
+    def __init__(self, compresion: Optional[str] = 'auto'):
+        resolver_compresion('', compresion)
+        self.compresion = compresion
     
     def guardar_tareas(self, tareas: List[Tarea], archivo: str) -> bool:
         try:
-            datos_tareas = []
-            for tarea in tareas:
-                tarea_dict = {
-                    'id': tarea.id,
-                    'titulo': tarea.titulo,
-                    'descripcion': tarea.descripcion,
-                    'categoria': tarea.categoria,
-                    'fecha_limite': tarea.fecha_limite.isoformat() if tarea.fecha_limite else None,
-                    'estado': tarea.estado.value,
-                    'prioridad': tarea.prioridad.value,
-                    'fecha_creacion': tarea.fecha_creacion.isoformat(),
-                    'fecha_actualizacion': tarea.fecha_actualizacion.isoformat()
-                }
-                datos_tareas.append(tarea_dict)
+            datos_tareas = [tarea_a_dict(tarea) for tarea in tareas]
             
-            with open(archivo, 'w', encoding='utf-8') as f:
-                json.dump(datos_tareas, f, indent=2, ensure_ascii=False)
+            with escritura_comprimida(archivo, resolver_compresion(archivo, self.compresion),
+                                      encoding='utf-8') as f:
+                codificador = json.JSONEncoder(indent=2, ensure_ascii=False)
+                escribir_agrupado(f, codificador.iterencode(datos_tareas))
             
             return True
             
@@ -34,31 +139,19 @@ class JSONPersistence(PersistenceStrategy):
     
     def cargar_tareas(self, archivo: str) -> List[Tarea]:
         try:
-            with open(archivo, 'r', encoding='utf-8') as f:
-                datos_tareas = json.load(f)
-            
-            tareas = []
-            for datos in datos_tareas:
-                tarea = Tarea(
-                    titulo=datos['titulo'],
-                    descripcion=datos['descripcion'],
-                    categoria=datos['categoria'],
-                    fecha_limite=datetime.fromisoformat(datos['fecha_limite']) if datos['fecha_limite'] else None,
-                    estado=EstadoTarea(datos['estado']),
-                    prioridad=Prioridad(datos['prioridad'])
-                )
-                tarea.id = datos['id']
-                tarea.fecha_creacion = datetime.fromisoformat(datos['fecha_creacion'])
-                tarea.fecha_actualizacion = datetime.fromisoformat(datos['fecha_actualizacion'])
-                tareas.append(tarea)
-            
-            return tareas
-            
-        except FileNotFoundError:
-            return []
+            return list(self.iterar_tareas(archivo))
         except Exception as e:
             print(f"Error cargando JSON: {e}")
             return []
     
+    def iterar_tareas(self, archivo: str) -> Iterator[Tarea]:
+        try:
+            f = abrir_lectura(archivo, resolver_compresion(archivo, self.compresion), encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with f:
+            for datos in iterar_array_json(f):
+                yield tarea_desde_dict(datos)
+    
     def get_nombre(self) -> str:
         return "JSON"
\ No newline at end of file
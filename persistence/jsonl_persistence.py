@@ -0,0 +1,192 @@
+import json
+import os
+from typing import Dict, Iterable, Iterator, List
+from models.tarea import Tarea
+from .persistence_manager import PersistenceStrategy, escritura_atomica
+from .json_persistence import tarea_a_dict, tarea_desde_dict
+
+
+def _huella(tarea: Tarea) -> tuple:
+    return (tarea.titulo, tarea.descripcion, tarea.categoria, tarea.fecha_limite,
+            tarea.estado, tarea.prioridad, tarea.fecha_creacion, tarea.fecha_actualizacion)
+
+
+def _linea(datos: dict) -> str:
+    return json.dumps(datos, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+class JSONLPersistence(PersistenceStrategy):
+    """Una tarea por linea en JSON compacto, escribiendo solo al final.
+
+    Cada linea es la version mas reciente de una tarea o una marca
+    {"id": ..., "eliminada": true}; al cargar gana la ultima linea de cada id.
+    Mientras el archivo no cambie por fuera, guardar_tareas solo anexa las
+    tareas nuevas o modificadas desde la ultima carga o guardado de esta
+    instancia. Cuando las lineas obsoletas superan a las tareas vivas (y a
+    `minimo_compactacion`) el registro se compacta en una instantanea.
+    """
+
+    guardado_incremental = True
+
+    def __init__(self, factor_compactacion: float = 1.0, minimo_compactacion: int = 1000):
+        self.factor_compactacion = factor_compactacion
+        self.minimo_compactacion = minimo_compactacion
+        self._archivo = None
+        self._firma = None
+        self._huellas: Dict[int, tuple] = {}
+        self._lineas = 0
+
+    # --- Estado del archivo conocido por esta instancia ---
+    def _firma_archivo(self, archivo: str):
+        estado = os.stat(archivo)
+        return (estado.st_size, estado.st_mtime_ns)
+
+    def _sincronizado(self, archivo: str) -> bool:
+        if self._archivo != os.path.abspath(archivo):
+            return False
+        try:
+            return self._firma_archivo(archivo) == self._firma
+        except FileNotFoundError:
+            return False
+
+    def _recordar(self, archivo: str, huellas: Dict[int, tuple], lineas: int):
+        self._archivo = os.path.abspath(archivo)
+        self._huellas = huellas
+        self._lineas = lineas
+        self._firma = self._firma_archivo(archivo)
+
+    def _debe_compactar(self) -> bool:
+        obsoletas = self._lineas - len(self._huellas)
+        return obsoletas > max(self.minimo_compactacion, self.factor_compactacion * len(self._huellas))
+
+    # --- Escritura ---
+    def _escribir_instantanea(self, tareas: Iterable[Tarea], archivo: str):
+        huellas = {}
+        with escritura_atomica(archivo, 'w', encoding='utf-8') as f:
+            for tarea in tareas:
+                f.write(_linea(tarea_a_dict(tarea)))
+                huellas[tarea.id] = _huella(tarea)
+        self._recordar(archivo, huellas, len(huellas))
+
+    def anexar_cambios(self, archivo: str, modificadas: Iterable[Tarea], eliminadas: Iterable[int]):
+        """Anexa al registro las tareas dadas y las marcas de eliminacion."""
+        if not self._sincronizado(archivo):
+            # Sin base conocida solo se puede anexar sobre un registro ya existente
+            self._recordar_desde_archivo(archivo)
+        lineas = []
+        for tarea in modificadas:
+            lineas.append(_linea(tarea_a_dict(tarea)))
+            self._huellas[tarea.id] = _huella(tarea)
+        for id_tarea in eliminadas:
+            lineas.append(_linea({'id': id_tarea, 'eliminada': True}))
+            self._huellas.pop(id_tarea, None)
+        if lineas:
+            with open(archivo, 'a', encoding='utf-8') as f:
+                f.writelines(lineas)
+                # Una caida durante el anexado solo puede cortar la ultima
+                # linea, que la lectura descarta
+                f.flush()
+                os.fsync(f.fileno())
+        self._recordar(archivo, self._huellas, self._lineas + len(lineas))
+
+    def compactar(self, archivo: str):
+        """Reescribe el registro como una instantanea con una linea por tarea viva."""
+        self._escribir_instantanea(
+            (tarea_desde_dict(datos) for datos in self._leer_registros(archivo)[0].values()), archivo)
+
+    def guardar_tareas(self, tareas: List[Tarea], archivo: str) -> bool:
+        try:
+            if not self._sincronizado(archivo):
+                self._escribir_instantanea(tareas, archivo)
+                return True
+
+            huellas = {}
+            modificadas = []
+            for tarea in tareas:
+                huella = huellas[tarea.id] = _huella(tarea)
+                if self._huellas.get(tarea.id) != huella:
+                    modificadas.append(tarea)
+            eliminadas = [id_tarea for id_tarea in self._huellas if id_tarea not in huellas]
+            self.anexar_cambios(archivo, modificadas, eliminadas)
+
+            if self._debe_compactar():
+                self._escribir_instantanea(tareas, archivo)
+            return True
+
+        except Exception as e:
+            print(f"Error guardando JSONL: {e}")
+            return False
+
+    def guardar_cambios(self, modificadas: List[Tarea], eliminadas: List[int], archivo: str) -> bool:
+        try:
+            self.anexar_cambios(archivo, modificadas, eliminadas)
+            if self._debe_compactar():
+                self.compactar(archivo)
+            return True
+        except Exception as e:
+            print(f"Error guardando JSONL: {e}")
+            return False
+
+    # --- Lectura ---
+    def _leer_registros(self, archivo: str):
+        # Devuelve los registros vivos, las lineas leidas y el byte donde
+        # acaba la ultima linea valida
+        registros: Dict[int, dict] = {}
+        lineas = 0
+        fin_valido = 0
+        with open(archivo, 'rb') as f:
+            for linea in f:
+                if linea.strip():
+                    try:
+                        datos = json.loads(linea)
+                    except ValueError:
+                        # Ultima linea a medio escribir (p. ej. por una caida): se ignora
+                        if not linea.endswith(b'\n'):
+                            break
+                        raise
+                    lineas += 1
+                    if datos.get('eliminada'):
+                        registros.pop(datos['id'], None)
+                    else:
+                        registros[datos['id']] = datos
+                fin_valido += len(linea)
+        return registros, lineas, fin_valido
+
+    def _descartar_linea_cortada(self, archivo: str, fin_valido: int):
+        # Antes de anexar nada se quita la linea a medio escribir: una linea
+        # anexada tras ella quedaria pegada y el registro dejaria de leerse
+        with open(archivo, 'ab') as f:
+            if f.tell() != fin_valido:
+                f.truncate(fin_valido)
+
+    def _recordar_desde_archivo(self, archivo: str):
+        try:
+            registros, lineas, fin_valido = self._leer_registros(archivo)
+        except FileNotFoundError:
+            registros, lineas, fin_valido = {}, 0, 0
+        self._descartar_linea_cortada(archivo, fin_valido)
+        huellas = {id_tarea: _huella(tarea_desde_dict(datos)) for id_tarea, datos in registros.items()}
+        self._recordar(archivo, huellas, lineas)
+
+    def cargar_tareas(self, archivo: str) -> List[Tarea]:
+        try:
+            return list(self.iterar_tareas(archivo))
+        except Exception as e:
+            print(f"Error cargando JSONL: {e}")
+            return []
+
+    def iterar_tareas(self, archivo: str) -> Iterator[Tarea]:
+        try:
+            registros, lineas, fin_valido = self._leer_registros(archivo)
+        except FileNotFoundError:
+            return
+        huellas = {}
+        for datos in registros.values():
+            tarea = tarea_desde_dict(datos)
+            huellas[tarea.id] = _huella(tarea)
+            yield tarea
+        self._descartar_linea_cortada(archivo, fin_valido)
+        self._recordar(archivo, huellas, lineas)
+
+    def get_nombre(self) -> str:
+        return "JSONL"
@@ -1,43 +1,242 @@
+import os
+import stat
+import tempfile
+import threading
 from abc import ABC, abstractmethod
-from typing import List
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
 from models.tarea import Tarea
 
+
+@contextmanager
+def escritura_atomica(archivo: str, modo: str = 'w', **opciones):
+    """Abre un temporal junto a `archivo` y, si el bloque termina sin error,
+    lo vuelca a disco (fsync) y lo renombra sobre `archivo`. Una caida a
+    mitad de guardado deja intacta la version anterior. Cada guardado usa
+    su propio temporal, asi dos guardados a la vez o uno abortado no se
+    pisan entre si."""
+    directorio, nombre = os.path.split(os.path.abspath(archivo))
+    descriptor, temporal = tempfile.mkstemp(prefix=nombre + '.', suffix='.tmp', dir=directorio)
+    try:
+        with open(descriptor, modo, **opciones) as f:
+            # mkstemp crea el temporal solo legible por su dueno
+            try:
+                permisos = stat.S_IMODE(os.stat(archivo).st_mode)
+            except FileNotFoundError:
+                permisos = 0o644
+            os.chmod(temporal, permisos)
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, archivo)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    sincronizar_directorio(archivo)
+
+
+def sincronizar_directorio(archivo: str):
+    # Hace duradero el renombrado; no todos los sistemas permiten abrir un
+    # directorio (p. ej. Windows), y ahi el propio os.replace basta
+    try:
+        descriptor = os.open(os.path.dirname(os.path.abspath(archivo)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+def estados_de(tareas) -> list:
+    # Foto inmutable de los campos de cada tarea; construir las copias se
+    # deja al hilo que escribe para no frenar a quien pide el guardado
+    return [tarea.__getstate__() for tarea in tareas]
+
+
+def tareas_desde_estados(estados) -> List[Tarea]:
+    return [Tarea.desde_campos(*estado) for estado in estados]
+
+
 class PersistenceStrategy(ABC):
-    
+    # True si el formato implementa guardar_cambios
+    guardado_incremental = False
+
     @abstractmethod
     def guardar_tareas(self, tareas: List[Tarea], archivo: str) -> bool:
         pass
-    
+
     @abstractmethod
     def cargar_tareas(self, archivo: str) -> List[Tarea]:
         pass
-    
+
+    def guardar_cambios(self, modificadas: List[Tarea], eliminadas: List[int], archivo: str) -> bool:
+        # Aplica sobre `archivo`, que ya contiene el ultimo guardado, solo las
+        # tareas creadas o modificadas y los ids eliminados desde entonces
+        raise NotImplementedError(f"{self.get_nombre()} no soporta guardado incremental")
+
+    def iterar_tareas(self, archivo: str) -> Iterator[Tarea]:
+        # Carga incremental; los formatos que no la soportan cargan todo
+        return iter(self.cargar_tareas(archivo))
+
     @abstractmethod
     def get_nombre(self) -> str:
         pass
 
+
+class _GuardadoPendiente:
+    # Lo que falta escribir en un archivo: una foto completa o un conjunto
+    # de cambios, como estados de tarea (ver estados_de). Las peticiones que
+    # llegan mientras se espera se funden con la pendiente y se escriben
+    # una sola vez
+
+    def __init__(self, estrategia: PersistenceStrategy):
+        self.estrategia = estrategia
+        self.completo: Optional[Dict[int, tuple]] = None
+        self.modificadas: Dict[int, tuple] = {}
+        self.eliminadas = set()
+
+    def sustituir(self, estados: list):
+        self.completo = {estado[0]: estado for estado in estados}
+        self.modificadas.clear()
+        self.eliminadas.clear()
+
+    def fundir(self, modificadas: list, eliminadas: List[int]):
+        if self.completo is not None:
+            for estado in modificadas:
+                self.completo[estado[0]] = estado
+            for id_tarea in eliminadas:
+                self.completo.pop(id_tarea, None)
+            return
+        for estado in modificadas:
+            self.modificadas[estado[0]] = estado
+            self.eliminadas.discard(estado[0])
+        for id_tarea in eliminadas:
+            self.modificadas.pop(id_tarea, None)
+            self.eliminadas.add(id_tarea)
+
+    def escribir(self, archivo: str) -> bool:
+        if self.completo is not None:
+            return self.estrategia.guardar_tareas(tareas_desde_estados(self.completo.values()), archivo)
+        return self.estrategia.guardar_cambios(
+            tareas_desde_estados(self.modificadas[id_tarea] for id_tarea in sorted(self.modificadas)),
+            sorted(self.eliminadas), archivo)
+
+
 class PersistenceManager:
-    
-    def __init__(self, estrategia: PersistenceStrategy = None):
+    """Delegado de la estrategia de persistencia activa.
+
+    En modo asincrono guardar_tareas y guardar_cambios toman una foto de los
+    campos de las tareas y vuelven enseguida; un hilo escribe despues esa
+    foto. Las peticiones
+    sobre un archivo que aun no se ha escrito se funden en una sola
+    escritura. `al_terminar_guardado(archivo, ok)` se llama desde ese hilo
+    al acabar cada escritura; cargar y esperar_guardados esperan a que no
+    quede ninguna pendiente.
+    """
+
+    def __init__(self, estrategia: PersistenceStrategy = None, asincrono: bool = False):
         self.estrategia = estrategia
-    
+        self.asincrono = asincrono
+        self.al_terminar_guardado: Optional[Callable[[str, bool], None]] = None
+        self._pendientes: Dict[str, _GuardadoPendiente] = {}
+        self._condicion = threading.Condition()
+        self._hilo: Optional[threading.Thread] = None
+
     def establecer_estrategia(self, estrategia: PersistenceStrategy):
         self.estrategia = estrategia
-    
-    def guardar_tareas(self, tareas: List[Tarea], archivo: str) -> bool:
+
+    def establecer_asincrono(self, asincrono: bool):
+        if not asincrono:
+            self.esperar_guardados()
+        self.asincrono = asincrono
+
+    def _comprobar_estrategia(self):
         if not self.estrategia:
             raise ValueError("No se ha establecido una estrategia de persistencia")
-        return self.estrategia.guardar_tareas(tareas, archivo)
-    
+
+    def guardar_tareas(self, tareas: List[Tarea], archivo: str) -> bool:
+        self._comprobar_estrategia()
+        if not self.asincrono:
+            return self.estrategia.guardar_tareas(tareas, archivo)
+        estados = estados_de(tareas)
+        self._encolar(archivo, lambda pendiente: pendiente.sustituir(estados))
+        return True
+
+    def guardar_cambios(self, modificadas: List[Tarea], eliminadas: List[int], archivo: str) -> bool:
+        self._comprobar_estrategia()
+        if not self.asincrono:
+            return self.estrategia.guardar_cambios(modificadas, eliminadas, archivo)
+        estados = estados_de(modificadas)
+        eliminadas = list(eliminadas)
+        self._encolar(archivo, lambda pendiente: pendiente.fundir(estados, eliminadas))
+        return True
+
     def cargar_tareas(self, archivo: str) -> List[Tarea]:
-        if not self.estrategia:
-            raise ValueError("No se ha establecido una estrategia de persistencia")
+        self._comprobar_estrategia()
+        self.esperar_guardados()
         return self.estrategia.cargar_tareas(archivo)
-    
+
+    def iterar_tareas(self, archivo: str) -> Iterator[Tarea]:
+        self._comprobar_estrategia()
+        self.esperar_guardados()
+        return self.estrategia.iterar_tareas(archivo)
+
+    # --- Guardado en segundo plano ---
+    def _encolar(self, archivo: str, aplicar: Callable[[_GuardadoPendiente], None]):
+        # Aplica la peticion sobre la pendiente de `archivo` (creandola si
+        # hace falta) y se asegura de que haya un hilo para escribirla. La
+        # foto ya esta hecha: bajo el cerrojo solo se funde
+        clave = os.path.abspath(archivo)
+        with self._condicion:
+            pendiente = self._pendientes.get(clave)
+            if pendiente is None or pendiente.estrategia is not self.estrategia:
+                pendiente = self._pendientes[clave] = _GuardadoPendiente(self.estrategia)
+            aplicar(pendiente)
+            if self._hilo is None:
+                # El hilo no es demonio y termina al vaciarse la cola: el
+                # interprete no sale con un guardado a medias
+                self._hilo = threading.Thread(target=self._escribir_pendientes,
+                                              name="guardado-tareas")
+                self._hilo.start()
+            self._condicion.notify_all()
+
+    def _escribir_pendientes(self):
+        while True:
+            with self._condicion:
+                if not self._pendientes:
+                    self._hilo = None
+                    self._condicion.notify_all()
+                    return
+                archivo = next(iter(self._pendientes))
+                pendiente = self._pendientes.pop(archivo)
+            try:
+                ok = pendiente.escribir(archivo)
+            except Exception as e:
+                print(f"Error guardando en segundo plano: {e}")
+                ok = False
+            if self.al_terminar_guardado is not None:
+                self.al_terminar_guardado(archivo, ok)
+
+    def esperar_guardados(self, tiempo_maximo: Optional[float] = None) -> bool:
+        """Espera a que se escriban los guardados pendientes. Devuelve False
+        si pasado `tiempo_maximo` aun queda alguno."""
+        with self._condicion:
+            return self._condicion.wait_for(lambda: self._hilo is None, tiempo_maximo)
+
     def get_estrategias_disponibles(self):
         from .json_persistence import JSONPersistence
         from .csv_persistence import CSVPersistence
+        from .jsonl_persistence import JSONLPersistence
+        from .sqlite_persistence import SQLitePersistence
+        from .binaria_persistence import BinariaPersistence
         return [
             JSONPersistence(),
-            CSVPersistence()
+            CSVPersistence(),
+            JSONLPersistence(),
+            SQLitePersistence(),
+            BinariaPersistence()
         ]
\ No newline at end of file
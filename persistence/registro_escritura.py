@@ -0,0 +1,245 @@
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+from models.tarea import Tarea, EstadoTarea, Prioridad
+from persistence.json_persistence import tarea_a_dict, tarea_desde_dict
+from persistence.persistence_manager import sincronizar_directorio
+
+POLITICAS_FSYNC = ('siempre', 'lote', 'nunca')
+CAMPOS_FECHA = frozenset(['fecha_limite', 'fecha_creacion', 'fecha_actualizacion'])
+
+
+def codificar_valor(campo: str, valor):
+    if valor is None:
+        return None
+    if campo in CAMPOS_FECHA:
+        return valor.isoformat()
+    if campo in ('estado', 'prioridad'):
+        return valor.value
+    return valor
+
+
+def decodificar_valor(campo: str, valor):
+    if valor is None:
+        return None
+    if campo in CAMPOS_FECHA:
+        return datetime.fromisoformat(valor)
+    if campo == 'estado':
+        return EstadoTarea(valor)
+    if campo == 'prioridad':
+        return Prioridad(valor)
+    return valor
+
+
+class LecturaRegistro:
+    """Registros de `archivo` ya decodificados:
+    ('c', Tarea) tarea creada o reescrita entera,
+    ('m', id, campo, valor) un campo cambiado,
+    ('e', [ids]) tareas eliminadas y
+    ('r',) se vacio el gestor (le siguen las tareas que tenia despues).
+    La lectura para en la ultima linea si le falta el salto de linea (caida
+    a mitad de escritura); al terminar, `fin_valido` es el byte donde acaba
+    la ultima linea reproducida (ver RegistroEscritura.recortar). Una linea
+    completa que no se puede leer no es una escritura cortada sino un
+    registro corrupto: lanza ValueError en vez de descartar lo que sigue."""
+
+    def __init__(self, archivo: str):
+        self.archivo = archivo
+        self.fin_valido = 0
+
+    def __iter__(self) -> Iterator[tuple]:
+        self.fin_valido = 0
+        if not os.path.exists(self.archivo):
+            return
+        with open(self.archivo, 'rb') as f:
+            for linea in f:
+                if not linea.endswith(b'\n'):
+                    # Solo la ultima linea puede quedar sin salto
+                    return
+                try:
+                    registro = self._decodificar(json.loads(linea))
+                except (ValueError, KeyError, IndexError, TypeError) as e:
+                    raise ValueError(
+                        f"Registro de escritura corrupto en el byte {self.fin_valido} "
+                        f"de {self.archivo}: {e}") from e
+                self.fin_valido += len(linea)
+                yield registro
+
+    @staticmethod
+    def _decodificar(registro: list) -> tuple:
+        tipo = registro[0]
+        if tipo == 'c':
+            return 'c', tarea_desde_dict(registro[1])
+        if tipo == 'm':
+            return 'm', registro[1], registro[2], decodificar_valor(registro[2], registro[3])
+        if tipo in ('e', 'r'):
+            return tuple(registro)
+        raise ValueError(f"Tipo de registro desconocido: {tipo!r}")
+
+
+def leer_registro(archivo: str) -> LecturaRegistro:
+    return LecturaRegistro(archivo)
+
+
+class RegistroEscritura:
+    """Registro de escritura anticipada (WAL) de las tareas.
+
+    El gestor anota cada cambio y, al terminar cada operacion, lo sella y
+    espera segun `politica`:
+    'siempre': la operacion vuelve con el cambio escrito y en disco (fsync).
+               Los hilos que confirman a la vez comparten escritura y fsync
+               (group commit): el primero escribe lo de todos y el resto
+               espera a que acabe.
+    'lote':    el cambio se escribe al sistema al confirmar y un hilo hace
+               fsync cada `intervalo` segundos; una caida del sistema pierde
+               como mucho ese intervalo, una del proceso nada.
+    'nunca':   como 'lote' pero sin fsync; lo decide el sistema.
+    """
+
+    def __init__(self, archivo: str, politica: str = 'lote', intervalo: float = 0.05):
+        if politica not in POLITICAS_FSYNC:
+            raise ValueError(f"Politica de fsync no soportada: {politica}")
+        self.archivo = archivo
+        self.politica = politica
+        self.intervalo = intervalo
+        self._descriptor = os.open(archivo, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        sincronizar_directorio(archivo)
+        self._condicion = threading.Condition()
+        self._anotados: List[bytes] = []
+        # Lineas selladas y aun sin escribir, y numeros de secuencia de lo
+        # sellado, lo escrito y lo volcado a disco
+        self._sellados: List[bytes] = []
+        self._sellado = 0
+        self._escrito = 0
+        self._volcado = 0
+        self._escribiendo = False
+        self._cerrado = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+        if politica == 'lote':
+            self._hilo = threading.Thread(target=self._volcar_periodicamente,
+                                          name="registro-tareas", daemon=True)
+            self._hilo.start()
+
+    # --- Anotar ---
+    def _anotar(self, registro: list):
+        linea = json.dumps(registro, ensure_ascii=False, separators=(',', ':')) + '\n'
+        self._anotados.append(linea.encode('utf-8'))
+
+    def anotar_creadas(self, tareas: Iterable[Tarea]):
+        for tarea in tareas:
+            self._anotar(['c', tarea_a_dict(tarea)])
+
+    def anotar_modificada(self, id_tarea: int, campo: str, valor):
+        self._anotar(['m', id_tarea, campo, codificar_valor(campo, valor)])
+
+    def anotar_eliminadas(self, ids: List[int]):
+        if ids:
+            self._anotar(['e', list(ids)])
+
+    def anotar_reinicio(self, tareas: Iterable[Tarea]):
+        self._anotar(['r'])
+        self.anotar_creadas(tareas)
+
+    # --- Confirmar ---
+    def sellar(self) -> int:
+        """Cierra la operacion en curso: lo anotado pasa a la cola de
+        escritura. Devuelve el numero de secuencia que hay que esperar."""
+        with self._condicion:
+            if self._anotados:
+                self._sellados.extend(self._anotados)
+                self._anotados.clear()
+                self._sellado += 1
+            return self._sellado
+
+    def esperar(self, secuencia: int):
+        # Espera a que `secuencia` este escrita (y volcada con 'siempre')
+        volcar = self.politica == 'siempre'
+        with self._condicion:
+            while True:
+                hecho = self._volcado if volcar else self._escrito
+                if hecho >= secuencia:
+                    return
+                if not self._escribiendo:
+                    break
+                self._condicion.wait()
+            self._escribir(volcar)
+
+    def confirmar(self):
+        self.esperar(self.sellar())
+
+    def _escribir(self, volcar: bool):
+        # Con la condicion tomada: este hilo escribe todo lo sellado hasta
+        # ahora, sin la condicion, mientras los demas siguen sellando. Si la
+        # escritura o el fsync fallan el error sale por este hilo; lo que no
+        # llego al archivo vuelve a la cabeza de la cola y los demas que
+        # esperan lo reintentan (y ven su propio error si vuelve a fallar)
+        datos = b''.join(self._sellados)
+        self._sellados = []
+        secuencia = self._sellado
+        self._escribiendo = True
+        self._condicion.release()
+        try:
+            while datos:
+                escritos = os.write(self._descriptor, datos)
+                datos = datos[escritos:]
+            if volcar:
+                os.fsync(self._descriptor)
+        finally:
+            self._condicion.acquire()
+            self._escribiendo = False
+            self._condicion.notify_all()
+            if datos:
+                self._sellados.insert(0, datos)
+            else:
+                self._escrito = max(self._escrito, secuencia)
+        if volcar:
+            self._volcado = max(self._volcado, secuencia)
+
+    def _volcar_periodicamente(self):
+        while not self._cerrado.wait(self.intervalo):
+            try:
+                self.volcar()
+            except OSError as e:
+                # Lo pendiente sigue en la cola para el siguiente intento
+                print(f"Error volcando el registro de escritura: {e}")
+
+    def volcar(self):
+        # Escribe lo sellado y hace fsync, sea cual sea la politica
+        with self._condicion:
+            while self._escribiendo:
+                self._condicion.wait()
+            if self._volcado < self._sellado:
+                self._escribir(True)
+
+    def recortar(self, fin_valido: int):
+        """Descarta lo que haya en el archivo tras `fin_valido` (la linea a
+        medio escribir de una caida) antes de anotar nada: lo anexado detras
+        quedaria pegado a ella y la siguiente recuperacion no lo leeria."""
+        with self._condicion:
+            if os.fstat(self._descriptor).st_size > fin_valido:
+                os.ftruncate(self._descriptor, fin_valido)
+                os.fsync(self._descriptor)
+
+    def truncar(self):
+        """Vacia el registro tras un punto de control. Quien llama garantiza
+        que no se anota nada mientras tanto."""
+        with self._condicion:
+            while self._escribiendo:
+                self._condicion.wait()
+            self._anotados.clear()
+            self._sellados.clear()
+            os.ftruncate(self._descriptor, 0)
+            os.fsync(self._descriptor)
+            self._escrito = self._volcado = self._sellado
+
+    def cerrar(self):
+        self._cerrado.set()
+        if self._hilo is not None:
+            self._hilo.join()
+        self.sellar()
+        try:
+            self.volcar()
+        finally:
+            os.close(self._descriptor)
@@ -0,0 +1,200 @@
+import os
+import sqlite3
+from contextlib import closing
+from typing import Iterator, List
+from models.tarea import Tarea
+from models.almacen import ORDEN_ESTADO, ORDEN_PRIORIDAD
+from models.almacen_columnar import a_epoca, desde_epoca
+from .persistence_manager import PersistenceStrategy
+
+# Estado y prioridad se guardan con su posicion de ordenacion, asi
+# ORDER BY sobre la columna coincide con ordenar_por_estado / _por_prioridad
+ESTADO_POR_CODIGO = {codigo: estado for estado, codigo in ORDEN_ESTADO.items()}
+PRIORIDAD_POR_CODIGO = {codigo: prioridad for prioridad, codigo in ORDEN_PRIORIDAD.items()}
+
+COLUMNAS = ('id, titulo, descripcion, categoria, fecha_limite, estado, prioridad, '
+            'fecha_creacion, fecha_actualizacion')
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS tareas (
+    id INTEGER PRIMARY KEY,
+    titulo TEXT NOT NULL,
+    descripcion TEXT NOT NULL,
+    categoria TEXT NOT NULL,
+    fecha_limite INTEGER,
+    estado INTEGER NOT NULL,
+    prioridad INTEGER NOT NULL,
+    fecha_creacion INTEGER NOT NULL,
+    fecha_actualizacion INTEGER NOT NULL,
+    categoria_normalizada TEXT NOT NULL,
+    titulo_orden TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tareas_estado ON tareas(estado);
+CREATE INDEX IF NOT EXISTS tareas_categoria ON tareas(categoria_normalizada);
+CREATE INDEX IF NOT EXISTS tareas_prioridad ON tareas(prioridad);
+CREATE INDEX IF NOT EXISTS tareas_fecha_limite ON tareas(fecha_limite);
+CREATE INDEX IF NOT EXISTS tareas_fecha_creacion ON tareas(fecha_creacion);
+CREATE INDEX IF NOT EXISTS tareas_titulo ON tareas(titulo_orden);
+"""
+
+# Indice de texto con el contenido en `tareas`; los triggers lo mantienen
+TABLA_TEXTO = """CREATE VIRTUAL TABLE tareas_fts USING fts5(
+    titulo, descripcion, content='tareas', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+)"""
+TRIGGERS_TEXTO = {
+    'tareas_fts_ai': """CREATE TRIGGER tareas_fts_ai AFTER INSERT ON tareas BEGIN
+        INSERT INTO tareas_fts(rowid, titulo, descripcion) VALUES (new.id, new.titulo, new.descripcion);
+    END""",
+    'tareas_fts_ad': """CREATE TRIGGER tareas_fts_ad AFTER DELETE ON tareas BEGIN
+        INSERT INTO tareas_fts(tareas_fts, rowid, titulo, descripcion)
+        VALUES ('delete', old.id, old.titulo, old.descripcion);
+    END""",
+    'tareas_fts_au': """CREATE TRIGGER tareas_fts_au AFTER UPDATE OF titulo, descripcion ON tareas BEGIN
+        INSERT INTO tareas_fts(tareas_fts, rowid, titulo, descripcion)
+        VALUES ('delete', old.id, old.titulo, old.descripcion);
+        INSERT INTO tareas_fts(rowid, titulo, descripcion) VALUES (new.id, new.titulo, new.descripcion);
+    END""",
+}
+RECONSTRUIR_TEXTO = "INSERT INTO tareas_fts(tareas_fts) VALUES ('rebuild')"
+
+INSERTAR = (f"INSERT INTO tareas ({COLUMNAS}, categoria_normalizada, titulo_orden) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+ACTUALIZAR_O_INSERTAR = INSERTAR + """ ON CONFLICT(id) DO UPDATE SET
+    titulo = excluded.titulo, descripcion = excluded.descripcion,
+    categoria = excluded.categoria, fecha_limite = excluded.fecha_limite,
+    estado = excluded.estado, prioridad = excluded.prioridad,
+    fecha_creacion = excluded.fecha_creacion,
+    fecha_actualizacion = excluded.fecha_actualizacion,
+    categoria_normalizada = excluded.categoria_normalizada,
+    titulo_orden = excluded.titulo_orden"""
+
+
+def tarea_a_fila(tarea: Tarea) -> tuple:
+    # Las fechas van en microsegundos desde la epoca y las ausentes como NULL
+    return (tarea.id, tarea.titulo, tarea.descripcion, tarea.categoria,
+            a_epoca(tarea.fecha_limite, None), ORDEN_ESTADO[tarea.estado],
+            ORDEN_PRIORIDAD[tarea.prioridad], a_epoca(tarea.fecha_creacion),
+            a_epoca(tarea.fecha_actualizacion), tarea.categoria.lower(), tarea.titulo.lower())
+
+
+def tarea_desde_fila(fila) -> Tarea:
+    # `fila` sigue el orden de COLUMNAS
+    return Tarea.desde_campos(
+        fila[0], fila[1], fila[2], fila[3], desde_epoca(fila[4]),
+        ESTADO_POR_CODIGO[fila[5]], PRIORIDAD_POR_CODIGO[fila[6]],
+        desde_epoca(fila[7]), desde_epoca(fila[8]))
+
+
+def conectar(archivo: str, compartida: bool = False) -> sqlite3.Connection:
+    """Abre `archivo` creando el esquema si falta. El indice de texto (FTS5)
+    solo se crea si el sqlite3 de esta instalacion lo incluye. Una conexion
+    `compartida` puede usarse desde otros hilos; sincronizarlos queda a
+    cargo de quien la comparte."""
+    conexion = sqlite3.connect(archivo, check_same_thread=not compartida)
+    # WAL: los lectores no bloquean al escritor; con WAL, NORMAL no arriesga
+    # la integridad ante una caida, solo las ultimas transacciones
+    conexion.execute("PRAGMA journal_mode=WAL")
+    conexion.execute("PRAGMA synchronous=NORMAL")
+    with conexion:
+        conexion.executescript(ESQUEMA)
+        if not tiene_indice_texto(conexion):
+            try:
+                conexion.execute(TABLA_TEXTO)
+            except sqlite3.OperationalError:
+                return conexion
+        # Tambien repara las bases en las que un guardado fallido dejo el
+        # indice sin triggers: se recrean y se reconstruye el indice
+        existentes = {nombre for nombre, in conexion.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        faltan = [sentencia for nombre, sentencia in TRIGGERS_TEXTO.items() if nombre not in existentes]
+        if faltan:
+            for sentencia in faltan:
+                conexion.execute(sentencia)
+            conexion.execute(RECONSTRUIR_TEXTO)
+    return conexion
+
+
+def tiene_indice_texto(conexion: sqlite3.Connection) -> bool:
+    return conexion.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'tareas_fts'").fetchone() is not None
+
+
+def reescribir_tareas(conexion: sqlite3.Connection, filas, sentencia: str = INSERTAR):
+    """Sustituye todas las filas dentro de la transaccion en curso, que se
+    abre aqui si no la hay. El indice de texto no se mantiene fila a fila
+    sino que se reconstruye al final, varias veces mas rapido con muchas
+    tareas. Con ACTUALIZAR_O_INSERTAR como `sentencia` un id repetido se
+    queda con su ultima fila en vez de fallar."""
+    if not conexion.in_transaction:
+        # sqlite3 solo abre la transaccion al llegar al primer DML: los DROP
+        # TRIGGER se confirmarian solos y un fallo posterior dejaria el
+        # indice de texto sin mantener
+        conexion.execute("BEGIN")
+    texto = tiene_indice_texto(conexion)
+    if texto:
+        for nombre in TRIGGERS_TEXTO:
+            conexion.execute(f"DROP TRIGGER IF EXISTS {nombre}")
+    conexion.execute("DELETE FROM tareas")
+    conexion.executemany(sentencia, filas)
+    if texto:
+        conexion.execute(RECONSTRUIR_TEXTO)
+        for sentencia in TRIGGERS_TEXTO.values():
+            conexion.execute(sentencia)
+
+
+class SQLitePersistence(PersistenceStrategy):
+    """Base de datos SQLite con una fila por tarea e indices por estado,
+    categoria, prioridad, fechas y texto.
+
+    Cada guardado es una transaccion; guardar_cambios solo inserta,
+    actualiza o borra las filas afectadas. El mismo archivo se puede abrir
+    con AlmacenSQLite para consultarlo sin cargarlo en memoria.
+    """
+
+    guardado_incremental = True
+
+    def _conectar_para_guardar(self, archivo: str) -> sqlite3.Connection:
+        # La transaccion ya es atomica; FULL ademas la hace duradera al
+        # confirmar, como el fsync de los formatos de archivo
+        conexion = conectar(archivo)
+        conexion.execute("PRAGMA synchronous=FULL")
+        return conexion
+
+    def guardar_tareas(self, tareas: List[Tarea], archivo: str) -> bool:
+        try:
+            with closing(self._conectar_para_guardar(archivo)) as conexion, conexion:
+                reescribir_tareas(conexion, map(tarea_a_fila, tareas))
+            return True
+        except Exception as e:
+            print(f"Error guardando SQLite: {e}")
+            return False
+
+    def guardar_cambios(self, modificadas: List[Tarea], eliminadas: List[int], archivo: str) -> bool:
+        try:
+            with closing(self._conectar_para_guardar(archivo)) as conexion, conexion:
+                conexion.executemany(ACTUALIZAR_O_INSERTAR, map(tarea_a_fila, modificadas))
+                conexion.executemany("DELETE FROM tareas WHERE id = ?",
+                                     ((id_tarea,) for id_tarea in eliminadas))
+            return True
+        except Exception as e:
+            print(f"Error guardando SQLite: {e}")
+            return False
+
+    def cargar_tareas(self, archivo: str) -> List[Tarea]:
+        try:
+            return list(self.iterar_tareas(archivo))
+        except Exception as e:
+            print(f"Error cargando SQLite: {e}")
+            return []
+
+    def iterar_tareas(self, archivo: str) -> Iterator[Tarea]:
+        if not os.path.exists(archivo):
+            return
+        # Quien consume el iterador puede avanzarlo desde hilos distintos
+        with closing(conectar(archivo, compartida=True)) as conexion:
+            for fila in conexion.execute(f"SELECT {COLUMNAS} FROM tareas ORDER BY id"):
+                yield tarea_desde_fila(fila)
+
+    def get_nombre(self) -> str:
+        return "SQLite"
\ No newline at end of file
@@ -0,0 +1,51 @@
+import os
+import pickle
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Sequence
+from models.tarea import Tarea, Prioridad
+from .prioridad_strategy import PrioridadStrategy
+
+MODOS_EJECUCION = ('serie', 'hilos', 'procesos')
+
+
+def _calcular_lote(estrategia: PrioridadStrategy, tareas: Sequence[Tarea]) -> List[Prioridad]:
+    return estrategia.calcular_prioridades(tareas)
+
+
+def _es_serializable(estrategia: PrioridadStrategy) -> Optional[Exception]:
+    try:
+        pickle.dumps(estrategia)
+    except Exception as e:
+        return e
+    return None
+
+
+def calcular_prioridades_en_paralelo(estrategia: PrioridadStrategy, tareas: Sequence[Tarea],
+                                     modo: str = 'procesos', trabajadores: Optional[int] = None) -> List[Prioridad]:
+    """Reparte las tareas en bloques contiguos entre un pool de hilos o de
+    procesos y devuelve las prioridades en el mismo orden que `tareas`.
+
+    Los procesos solo ayudan con estrategias costosas en CPU; los hilos, con
+    estrategias que esperan E/S o liberan el GIL. Si la estrategia no se puede
+    serializar para enviarla a otro proceso se avisa y se usan hilos.
+    """
+    if modo not in MODOS_EJECUCION:
+        raise ValueError(f"Modo de ejecucion no soportado: {modo}")
+    trabajadores = trabajadores or os.cpu_count() or 1
+    if modo == 'serie' or trabajadores == 1 or len(tareas) < 2:
+        return estrategia.calcular_prioridades(tareas)
+    
+    if modo == 'procesos':
+        error = _es_serializable(estrategia)
+        if error is not None:
+            warnings.warn(f"La estrategia {estrategia.get_nombre()} no se puede enviar a otro "
+                          f"proceso ({error}); se calcula con hilos", RuntimeWarning, stacklevel=2)
+            modo = 'hilos'
+    
+    tamano_bloque = -(-len(tareas) // trabajadores)
+    bloques = [tareas[i:i + tamano_bloque] for i in range(0, len(tareas), tamano_bloque)]
+    pool = ProcessPoolExecutor if modo == 'procesos' else ThreadPoolExecutor
+    with pool(max_workers=len(bloques)) as ejecutor:
+        resultados = ejecutor.map(_calcular_lote, [estrategia] * len(bloques), bloques)
+        return [prioridad for bloque in resultados for prioridad in bloque]
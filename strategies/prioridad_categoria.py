@@ -1,19 +1,39 @@
+import re
 from .prioridad_strategy import PrioridadStrategy
 from models.tarea import Tarea, Prioridad
+from typing import Dict, List, Sequence
 
 class PrioridadCategoriaStrategy(PrioridadStrategy):
+    CATEGORIAS_ALTAS = ['universidad', 'trabajo', 'examen', 'urgente']
+    CATEGORIAS_MEDIAS = ['estudio', 'proyecto', 'personal']
+    
+    # Cualquier aparicion de una palabra clave dentro de la categoria
+    _PATRON_ALTA = re.compile('|'.join(map(re.escape, CATEGORIAS_ALTAS)))
+    _PATRON_MEDIA = re.compile('|'.join(map(re.escape, CATEGORIAS_MEDIAS)))
+    
+    def __init__(self):
+        # Hay pocas categorias distintas: cada una se evalua una sola vez
+        self._cache: Dict[str, Prioridad] = {}
+    
+    def _prioridad_de_categoria(self, categoria: str) -> Prioridad:
+        prioridad = self._cache.get(categoria)
+        if prioridad is None:
+            normalizada = categoria.lower()
+            if self._PATRON_ALTA.search(normalizada):
+                prioridad = Prioridad.ALTA
+            elif self._PATRON_MEDIA.search(normalizada):
+                prioridad = Prioridad.MEDIA
+            else:
+                prioridad = Prioridad.BAJA
+            self._cache[categoria] = prioridad
+        return prioridad
+    
     def calcular_prioridad(self, tarea: Tarea) -> Prioridad:
-        categorias_altas = ['universidad', 'trabajo', 'examen', 'urgente']
-        categorias_medias = ['estudio', 'proyecto', 'personal']
-        
-        categoria = tarea.categoria.lower()
-        
-        if any(cat in categoria for cat in categorias_altas):
-            return Prioridad.ALTA
-        elif any(cat in categoria for cat in categorias_medias):
-            return Prioridad.MEDIA
-        else:
-            return Prioridad.BAJA
+        return self._prioridad_de_categoria(tarea.categoria)
+    
+    def calcular_prioridades(self, tareas: Sequence[Tarea]) -> List[Prioridad]:
+        prioridad_de = self._prioridad_de_categoria
+        return [prioridad_de(tarea.categoria) for tarea in tareas]
     
     def get_nombre(self) -> str:  
         return "Estrategia por Categoría"
\ No newline at end of file
@@ -1,23 +1,35 @@
 from .prioridad_strategy import PrioridadStrategy
 from models.tarea import Tarea, Prioridad
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import List, Sequence
 
 class PrioridadFechaStrategy(PrioridadStrategy):
+    # Alta si vence en 24 horas o menos; media si quedan 2 dias o menos
+    # (diferencia.days <= 2, es decir, menos de 3 dias completos)
+    MARGEN_ALTA = timedelta(hours=24)
+    MARGEN_MEDIA = timedelta(days=3)
+    
     def calcular_prioridad(self, tarea: Tarea) -> Prioridad:
-        if not tarea.fecha_limite:
-            return Prioridad.BAJA
-            
+        return self.calcular_prioridades([tarea])[0]
+    
+    def calcular_prioridades(self, tareas: Sequence[Tarea]) -> List[Prioridad]:
+        # Una sola lectura del reloj por lote: cada tarea se compara con dos
+        # fechas umbral en lugar de calcular su diferencia
         ahora = datetime.now()
-        diferencia = tarea.fecha_limite - ahora
-        dias_restantes = diferencia.days
-        horas_restantes = diferencia.total_seconds() / 3600
-        
-        if horas_restantes <= 24:  
-            return Prioridad.ALTA
-        elif dias_restantes <= 2: 
-            return Prioridad.MEDIA
-        else:
-            return Prioridad.BAJA
+        limite_alta = ahora + self.MARGEN_ALTA
+        limite_media = ahora + self.MARGEN_MEDIA
+        prioridades = []
+        for tarea in tareas:
+            fecha_limite = tarea.fecha_limite
+            if not fecha_limite:
+                prioridades.append(Prioridad.BAJA)
+            elif fecha_limite <= limite_alta:
+                prioridades.append(Prioridad.ALTA)
+            elif fecha_limite < limite_media:
+                prioridades.append(Prioridad.MEDIA)
+            else:
+                prioridades.append(Prioridad.BAJA)
+        return prioridades
         
     def get_nombre(self) -> str:  
         return "Estrategia por Fecha"
\ No newline at end of file
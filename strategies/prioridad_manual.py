@@ -1,9 +1,13 @@
 from .prioridad_strategy import PrioridadStrategy
 from models.tarea import Tarea, Prioridad
+from typing import List, Sequence
 
 class PrioridadManualStrategy(PrioridadStrategy):
     def calcular_prioridad(self, tarea: Tarea) -> Prioridad:
         return tarea.prioridad if tarea.prioridad else Prioridad.MEDIA
     
+    def calcular_prioridades(self, tareas: Sequence[Tarea]) -> List[Prioridad]:
+        return [tarea.prioridad or Prioridad.MEDIA for tarea in tareas]
+    
     def get_nombre(self) -> str:  
         return "Estrategia Manual"
\ No newline at end of file
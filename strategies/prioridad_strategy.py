@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import List, Sequence
 from models.tarea import Tarea, Prioridad
 
 class PrioridadStrategy(ABC):
@@ -6,6 +7,11 @@ class PrioridadStrategy(ABC):
     def calcular_prioridad(self, tarea: Tarea) -> Prioridad:
         pass
     
+    def calcular_prioridades(self, tareas: Sequence[Tarea]) -> List[Prioridad]:
+        # Version por lotes; las estrategias propias pueden dejar esta, que
+        # delega en calcular_prioridad tarea a tarea
+        return [self.calcular_prioridad(tarea) for tarea in tareas]
+    
     @abstractmethod
     def get_nombre(self) -> str:
         pass
\ No newline at end of file
@@ -1,4 +1,5 @@
 import unittest, sys, os
+from contextlib import closing
 from datetime import datetime, timedelta
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -19,6 +20,14 @@ class TestTarea(unittest.TestCase):
         self.assertEqual(tarea.titulo, "Test")
         print("Tarea - Creacion: OK")
 
+    def test_representacion_compacta(self):
+        from models.tarea import Tarea
+        tarea = Tarea("Test", "Desc", "".join(["univer", "sidad"]))
+        self.assertFalse(hasattr(tarea, '__dict__'))
+        self.assertIs(tarea.categoria, "universidad")
+        self.assertEqual(tarea.fecha_creacion, tarea.fecha_actualizacion)
+        print("Tarea - Representacion compacta: OK")
+
 class TestGestorTareas(unittest.TestCase):
     def setUp(self):
         self.gestor = GestorTareas()
@@ -62,6 +71,1185 @@ class TestGestorTareas(unittest.TestCase):
         self.assertEqual(len(vencidas), 1)
         print("Gestor - Operaciones avanzadas: OK")
 
+    def test_indice_por_id(self):
+        t1 = self.gestor.crear_tarea("Uno", "Test", "general")
+        t2 = self.gestor.crear_tarea("Dos", "Test", "general")
+        t3 = self.gestor.crear_tarea("Tres", "Test", "general")
+        self.gestor.actualizar_tarea(t2.id, estado=EstadoTarea.COMPLETADA)
+
+        self.assertEqual(self.gestor.limpiar_tareas_completadas(), 1)
+        self.assertIsNone(self.gestor.obtener_tarea_por_id(t2.id))
+        self.assertTrue(self.gestor.eliminar_tarea(t1.id))
+        self.assertFalse(self.gestor.eliminar_tarea(t1.id))
+        self.assertEqual([t.id for t in self.gestor.obtener_todas_tareas()], [t3.id])
+
+        self.gestor.tareas = [t1, t3]
+        self.assertIs(self.gestor.obtener_tarea_por_id(t1.id), t1)
+        print("Gestor - Indice por id: OK")
+
+    def test_indices_secundarios(self):
+        t1 = self.gestor.crear_tarea("Uno", "Test", "Universidad", prioridad=Prioridad.ALTA)
+        t2 = self.gestor.crear_tarea("Dos", "Test", "personal")
+
+        t1.actualizar_estado(EstadoTarea.EN_PROGRESO)
+        t2.actualizar_prioridad(Prioridad.ALTA)
+        self.gestor.actualizar_tarea(t2.id, categoria="UNIVERSIDAD")
+
+        self.assertEqual(self.gestor.filtrar_por_estado(EstadoTarea.EN_PROGRESO), [t1])
+        self.assertEqual(self.gestor.filtrar_por_prioridad(Prioridad.ALTA), [t1, t2])
+        self.assertEqual(self.gestor.filtrar_por_categoria("universidad"), [t1, t2])
+        self.assertEqual(self.gestor.filtrar_por_categoria("personal"), [])
+
+        self.gestor.eliminar_tarea(t1.id)
+        t1.actualizar_estado(EstadoTarea.COMPLETADA)
+        estadisticas = self.gestor.obtener_estadisticas()
+        self.assertEqual(estadisticas['total'], 1)
+        self.assertEqual(estadisticas['pendientes'], 1)
+        self.assertEqual(estadisticas['completadas'], 0)
+        print("Gestor - Indices secundarios: OK")
+
+    def test_indice_fecha_limite(self):
+        ahora = datetime.now()
+        t1 = self.gestor.crear_tarea("Semana", "Test", "general", ahora + timedelta(days=7))
+        t2 = self.gestor.crear_tarea("Ayer", "Test", "general", ahora - timedelta(days=1))
+        t3 = self.gestor.crear_tarea("Sin fecha", "Test", "general")
+        t4 = self.gestor.crear_tarea("Manana", "Test", "general", ahora + timedelta(days=1))
+
+        self.assertEqual(self.gestor.ordenar_por_fecha_limite(), [t2, t4, t1, t3])
+        self.assertEqual(self.gestor.ordenar_por_fecha_limite(False), [t3, t1, t4, t2])
+        self.assertEqual(self.gestor.filtrar_por_fecha_limite(ahora, t1.fecha_limite), [t4, t1])
+        self.assertEqual(self.gestor.obtener_tareas_vencidas(), [t2])
+
+        t2.actualizar_estado(EstadoTarea.COMPLETADA)
+        self.gestor.actualizar_tarea(t3.id, fecha_limite=ahora - timedelta(days=2))
+        self.assertEqual(self.gestor.obtener_tareas_vencidas(), [t3])
+        print("Gestor - Indice fecha limite: OK")
+
+    def test_busqueda_indice_texto(self):
+        t1 = self.gestor.crear_tarea("Tarea de Física", "Campo eléctrico", "universidad")
+        t2 = self.gestor.crear_tarea("Pasear al perro", "Parque", "personal")
+
+        self.assertEqual(self.gestor.buscar_por_texto("FISICA"), [t1])
+        self.assertEqual(self.gestor.buscar_por_texto("camp electr"), [t1])
+        self.assertEqual(self.gestor.buscar_por_texto("pa"), [t2])
+        self.assertEqual(self.gestor.buscar_por_texto("ctric"), [])
+        self.assertEqual(self.gestor.buscar_por_texto("ctric", modo='subcadena'), [t1])
+
+        self.gestor.actualizar_tarea(t2.id, titulo="Comprar pan")
+        self.assertEqual(self.gestor.buscar_por_texto("perro"), [])
+        self.assertEqual(self.gestor.buscar_por_texto("pan"), [t2])
+        print("Gestor - Busqueda con indice de texto: OK")
+
+    def test_consultar(self):
+        import random
+        from models.almacen import CLAVES_ORDEN
+        random.seed(3)
+        palabras = ["informe", "examen", "fisica", "compras", "lectura"]
+        base = datetime(2024, 1, 1)
+        for i in range(300):
+            tarea = self.gestor.crear_tarea(
+                f"{random.choice(palabras)} {i % 7}", random.choice(palabras),
+                random.choice(["Universidad", "personal", "trabajo"]),
+                random.choice([None, base + timedelta(days=random.randint(0, 30))]),
+                random.choice(list(Prioridad)))
+            tarea.actualizar_estado(random.choice(list(EstadoTarea)))
+        todas = self.gestor.obtener_todas_tareas()
+
+        def esperado(texto='', estado=None, categoria=None, prioridad=None,
+                     orden='id', ascendente=True, limite=None, desplazamiento=0):
+            encontradas = {t.id for t in self.gestor.buscar_por_texto(texto)} if texto else None
+            tareas = [t for t in todas
+                      if (encontradas is None or t.id in encontradas)
+                      and (estado is None or t.estado == estado)
+                      and (categoria is None or t.categoria.lower() == categoria.lower())
+                      and (prioridad is None or t.prioridad == prioridad)]
+            clave = CLAVES_ORDEN[orden]
+            # los empates van por id ascendente tambien en orden descendente
+            if ascendente:
+                tareas.sort(key=lambda t: (clave(t), t.id))
+            else:
+                tareas.sort(key=lambda t: (clave(t), -t.id), reverse=True)
+            fin = None if limite is None else desplazamiento + limite
+            return [t.id for t in tareas[desplazamiento:fin]]
+
+        casos = [
+            {},
+            {'texto': 'fisica'},
+            {'texto': 'exam 3', 'orden': 'titulo'},
+            {'estado': EstadoTarea.COMPLETADA, 'orden': 'fecha_limite'},
+            {'categoria': 'UNIVERSIDAD', 'prioridad': Prioridad.ALTA, 'orden': 'prioridad'},
+            {'texto': 'lectura', 'estado': EstadoTarea.PENDIENTE, 'orden': 'fecha_limite',
+             'ascendente': False},
+            {'orden': 'fecha_creacion', 'ascendente': False, 'limite': 10, 'desplazamiento': 5},
+            {'texto': 'info', 'orden': 'titulo', 'ascendente': False, 'limite': 7},
+            {'categoria': 'personal', 'orden': 'estado', 'limite': 20, 'desplazamiento': 290},
+            {'orden': 'fecha_limite', 'ascendente': False, 'limite': 15, 'desplazamiento': 3},
+            {'orden': 'fecha_limite', 'limite': 10, 'desplazamiento': 280},
+            {'orden': 'fecha_limite', 'ascendente': False},
+            {'prioridad': Prioridad.BAJA, 'orden': 'fecha_limite', 'ascendente': False},
+            {'categoria': 'trabajo', 'orden': 'fecha_limite', 'limite': 5},
+            {'texto': 'zzz'},
+            {'texto': '!!'},
+        ]
+        for caso in casos:
+            self.assertEqual([t.id for t in self.gestor.consultar(**caso)], esperado(**caso), caso)
+        # Paginas por cursor: cada una sigue detras de la ultima de la anterior
+        for orden in CLAVES_ORDEN:
+            for ascendente in (True, False):
+                for filtros in ({}, {'estado': EstadoTarea.PENDIENTE}, {'texto': 'lectura'}):
+                    ids, despues_de = [], None
+                    while True:
+                        pagina = self.gestor.consultar(orden=orden, ascendente=ascendente, limite=40,
+                                                       despues_de=despues_de, **filtros)
+                        ids.extend(t.id for t in pagina)
+                        if len(pagina) < 40:
+                            break
+                        despues_de = (CLAVES_ORDEN[orden](pagina[-1]), pagina[-1].id)
+                    self.assertEqual(ids, esperado(orden=orden, ascendente=ascendente, **filtros),
+                                     (orden, ascendente, filtros))
+        with self.assertRaises(ValueError):
+            self.gestor.consultar(orden='color')
+        print("Gestor - Consultas combinadas: OK")
+
+    def test_cache_consultas(self):
+        t1 = self.gestor.crear_tarea("Leer informe", "Test", "Trabajo")
+        t2 = self.gestor.crear_tarea("Escribir informe", "Test", "trabajo")
+
+        self.assertEqual(self.gestor.consultar(texto="informe", orden='titulo'), [t2, t1])
+        self.assertEqual(self.gestor.consultar(texto="informe", orden='titulo'), [t2, t1])
+        self.assertEqual(self.gestor.consultar(categoria="TRABAJO"), [t1, t2])
+        self.assertEqual(self.gestor.consultar(categoria="trabajo"), [t1, t2])
+        estadisticas = self.gestor.estadisticas_cache_consultas()
+        self.assertEqual((estadisticas['aciertos'], estadisticas['fallos']), (2, 2))
+        # el texto se normaliza en la clave: mayusculas y acentos no cuentan
+        self.assertEqual(self.gestor.consultar(texto="INFÓRME", orden='titulo'), [t2, t1])
+        self.assertEqual(self.gestor.estadisticas_cache_consultas()['aciertos'], 3)
+
+        # el resultado devuelto es una copia
+        self.gestor.consultar(categoria="trabajo").clear()
+        self.assertEqual(self.gestor.consultar(categoria="trabajo"), [t1, t2])
+
+        t1.actualizar_estado(EstadoTarea.COMPLETADA)
+        # un cambio suelta las entradas de la version anterior
+        self.assertEqual(self.gestor.estadisticas_cache_consultas()['entradas'], 0)
+        self.assertEqual(self.gestor.consultar(estado=EstadoTarea.COMPLETADA), [t1])
+        self.gestor.actualizar_tarea(t2.id, titulo="Archivar")
+        self.assertEqual(self.gestor.consultar(texto="informe", orden='titulo'), [t1])
+        t3 = self.gestor.crear_tarea("Otro informe", "Test", "trabajo")
+        self.assertEqual(self.gestor.consultar(texto="informe"), [t1, t3])
+        self.gestor.eliminar_tarea(t1.id)
+        self.assertEqual(self.gestor.consultar(texto="informe"), [t3])
+
+        self.gestor.configurar_cache_consultas(2)
+        for texto in ("a", "b", "c"):
+            self.gestor.consultar(texto=texto)
+        self.assertEqual(self.gestor.estadisticas_cache_consultas()['entradas'], 2)
+
+        self.gestor.configurar_cache_consultas(0)
+        antes = self.gestor.estadisticas_cache_consultas()
+        self.gestor.consultar(texto="informe")
+        self.gestor.consultar(texto="informe")
+        self.assertEqual(self.gestor.estadisticas_cache_consultas(), antes)
+        self.assertEqual(antes['entradas'], 0)
+        print("Gestor - Cache de consultas: OK")
+
+    def test_operaciones_lote(self):
+        ahora = datetime.now()
+        previa = self.gestor.crear_tarea("Previa", "Test", "general")
+        with self.assertRaises(ValueError):
+            self.gestor.crear_tareas_lote([{'titulo': "Bien"}, {'titulo': "Mal", 'color': "rojo"}])
+        self.assertEqual(len(self.gestor.obtener_todas_tareas()), 1)
+
+        datos = [{'titulo': f"Lote {i}", 'descripcion': "importada", 'categoria': "Trabajo",
+                  'fecha_limite': ahora + timedelta(days=i - 10, hours=1), 'prioridad': Prioridad.BAJA}
+                 for i in range(20)]
+        tareas = self.gestor.crear_tareas_lote(datos)
+        self.assertEqual([t.id for t in tareas], list(range(previa.id + 1, previa.id + 21)))
+        self.assertEqual(self.gestor.crear_tarea("Despues").id, previa.id + 21)
+        self.assertEqual(len(self.gestor.filtrar_por_categoria("trabajo")), 20)
+        self.assertEqual(len(self.gestor.buscar_por_texto("importada")), 20)
+        self.assertEqual(len(self.gestor.obtener_tareas_vencidas()), 10)
+
+        archivo = "test_lotes.json"
+        try:
+            self.assertTrue(self.gestor.guardar_tareas(archivo))
+        finally:
+            os.remove(archivo)
+        self.assertFalse(self.gestor.tiene_cambios_sin_guardar())
+
+        ids = [t.id for t in tareas]
+        self.assertEqual(self.gestor.actualizar_lote(
+            [(id_tarea, {'estado': EstadoTarea.COMPLETADA}) for id_tarea in ids[:12]] +
+            [(ids[15], {'titulo': "Revisada", 'prioridad': Prioridad.ALTA, 'otro': 1}), (999, {})]), 13)
+        self.assertTrue(self.gestor.tiene_cambios_sin_guardar())
+        self.assertEqual(len(self.gestor.filtrar_por_estado(EstadoTarea.COMPLETADA)), 12)
+        self.assertEqual([t.id for t in self.gestor.obtener_tareas_vencidas()], [])
+        self.assertEqual([t.id for t in self.gestor.buscar_por_texto("revisada")], [ids[15]])
+        self.assertEqual([t.id for t in self.gestor.filtrar_por_prioridad(Prioridad.ALTA)], [ids[15]])
+        self.assertGreaterEqual(self.gestor.obtener_tarea_por_id(ids[0]).fecha_actualizacion, ahora)
+        self.assertEqual(self.gestor.actualizar_lote({ids[12]: {'fecha_limite': None}}), 1)
+        self.assertEqual([t.id for t in self.gestor.filtrar_por_fecha_limite(ahora, ahora + timedelta(days=30))],
+                         ids[10:12] + ids[13:])
+
+        self.assertEqual(self.gestor.eliminar_lote([ids[0], ids[1], ids[1], 999]), 2)
+        self.assertIsNone(self.gestor.obtener_tarea_por_id(ids[0]))
+        self.assertEqual(self.gestor.limpiar_tareas_completadas(), 10)
+        self.assertEqual(len(self.gestor.filtrar_por_categoria("trabajo")), 8)
+        self.assertEqual(len(self.gestor.buscar_por_texto("importada")), 8)
+        self.assertEqual(self.gestor.obtener_estadisticas()['total'], 10)
+        print("Gestor - Operaciones por lotes: OK")
+
+    def test_carga_fallida_conserva_tareas(self):
+        t1 = self.gestor.crear_tarea("Uno", "Test", "general")
+        archivo = "test_carga_fallida.json"
+        try:
+            with open(archivo, "w", encoding="utf-8") as f:
+                f.write('[{"id": 7, "titulo": "Otra", "descripcion": "", "categoria": "general", '
+                        '"fecha_limite": null, "estado": "pendiente", "prioridad": "media", '
+                        '"fecha_creacion": "2024-01-01T00:00:00", '
+                        '"fecha_actualizacion": "2024-01-01T00:00:00"}, {"id": ')
+            self.assertFalse(self.gestor.cargar_tareas(archivo))
+        finally:
+            os.remove(archivo)
+        self.assertEqual(self.gestor.obtener_todas_tareas(), [t1])
+        t1.actualizar_estado(EstadoTarea.COMPLETADA)
+        self.assertEqual(self.gestor.filtrar_por_estado(EstadoTarea.COMPLETADA), [t1])
+        print("Gestor - Carga fallida conserva tareas: OK")
+
+    def test_carga_ids_repetidos(self):
+        def fila(id_tarea, titulo):
+            return ('{"id": %d, "titulo": "%s", "descripcion": "repetida", "categoria": "general", '
+                    '"fecha_limite": "2030-01-01T00:00:00", "estado": "pendiente", "prioridad": "media", '
+                    '"fecha_creacion": "2024-01-01T00:00:00", '
+                    '"fecha_actualizacion": "2024-01-01T00:00:00"}' % (id_tarea, titulo))
+        archivo = "test_ids_repetidos.json"
+        try:
+            with open(archivo, "w", encoding="utf-8") as f:
+                f.write("[%s]" % ", ".join([fila(7, "Primera"), fila(8, "Otra"), fila(7, "Segunda")]))
+            self.assertTrue(self.gestor.cargar_tareas(archivo))
+        finally:
+            os.remove(archivo)
+        # la ultima tarea con un id sustituye a las anteriores
+        self.assertEqual(sorted(t.titulo for t in self.gestor.obtener_todas_tareas()), ["Otra", "Segunda"])
+        self.assertEqual(self.gestor.obtener_tarea_por_id(7).titulo, "Segunda")
+        self.assertEqual(self.gestor.obtener_estadisticas()['total'], 2)
+        self.assertEqual(len(self.gestor.buscar_por_texto("repetida")), 2)
+        self.assertEqual(len(self.gestor.filtrar_por_fecha_limite(datetime(2029, 1, 1), datetime(2031, 1, 1))), 2)
+        self.assertEqual(self.gestor.crear_tarea("Nueva").id, 9)
+
+        # igual al agregar un lote con ids ya guardados o repetidos en el lote
+        from models.tarea import Tarea
+        lote = [Tarea(titulo, "repetida") for titulo in ("Tercera", "Cuarta", "Quinta")]
+        for tarea, id_tarea in zip(lote, (7, 10, 10)):
+            tarea.id = id_tarea
+        self.gestor.almacen.agregar_lote(lote)
+        self.assertEqual(self.gestor.obtener_tarea_por_id(7).titulo, "Tercera")
+        self.assertEqual(self.gestor.obtener_tarea_por_id(10).titulo, "Quinta")
+        self.assertEqual(len(self.gestor.obtener_todas_tareas()), 4)
+        self.assertEqual(self.gestor.obtener_estadisticas()['total'], 4)
+        self.assertEqual(len(self.gestor.buscar_por_texto("repetida")), 3)
+        print("Gestor - Carga con ids repetidos: OK")
+
+class TestGestorTareasColumnar(TestGestorTareas):
+    def setUp(self):
+        self.gestor = GestorTareas(almacen='columnar')
+
+    def test_vistas_perezosas(self):
+        tarea = self.gestor.crear_tarea("Test", "Desc", "Universidad", prioridad=Prioridad.ALTA)
+        id_tarea = tarea.id
+        del tarea
+
+        vista = self.gestor.obtener_tarea_por_id(id_tarea)
+        self.assertEqual((vista.titulo, vista.categoria, vista.prioridad),
+                         ("Test", "Universidad", Prioridad.ALTA))
+        self.assertIs(self.gestor.obtener_tarea_por_id(id_tarea), vista)
+
+        vista.actualizar_estado(EstadoTarea.COMPLETADA)
+        fecha_actualizacion = vista.fecha_actualizacion
+        del vista
+        vista = self.gestor.obtener_tarea_por_id(id_tarea)
+        self.assertEqual(vista.estado, EstadoTarea.COMPLETADA)
+        self.assertEqual(vista.fecha_actualizacion, fecha_actualizacion)
+        self.assertEqual(self.gestor.obtener_estadisticas()['completadas'], 1)
+        print("Gestor columnar - Vistas perezosas: OK")
+
+    def test_lotes_por_columna(self):
+        import models.almacen_columnar as almacen_columnar
+        datos = [{'titulo': f"tarea {i}", 'categoria': ["casa", "trabajo"][i % 2],
+                  'fecha_limite': datetime(2024, 1, 1) + timedelta(days=i % 30) if i % 3 else None}
+                 for i in range(3000)]
+
+        def aplicar(gestor, lotes):
+            ids = [t.id for t in (gestor.crear_tareas_lote(datos) if lotes
+                                  else [gestor.crear_tarea(**campos) for campos in datos])]
+            cambios = {id_tarea: {'estado': EstadoTarea.COMPLETADA, 'categoria': "Ocio",
+                                  'fecha_limite': None} for id_tarea in ids[::3]}
+            cambios[ids[1]] = {'titulo': "renombrada", 'prioridad': Prioridad.ALTA}
+            # Quedan menos vivas que borradas: se compacta
+            eliminar = ids[4::3] + ids[2::3]
+            if lotes:
+                gestor.actualizar_lote(cambios)
+                gestor.eliminar_lote(eliminar)
+            else:
+                for id_tarea, campos in cambios.items():
+                    gestor.actualizar_tarea(id_tarea, **campos)
+                for id_tarea in eliminar:
+                    gestor.eliminar_tarea(id_tarea)
+            return sorted((t.id, t.titulo, t.categoria, t.fecha_limite, t.estado, t.prioridad)
+                          for t in gestor.obtener_todas_tareas())
+
+        esperado = aplicar(GestorTareas(), False)
+        numpy = almacen_columnar.np
+        for almacen_columnar.np in (numpy, None):
+            try:
+                gestor = GestorTareas(almacen='columnar')
+                self.assertEqual(aplicar(gestor, True), esperado)
+                self.assertEqual(gestor.almacen._borradas, 0)
+                # Una vista viva se pone al dia con el lote
+                vista = gestor.obtener_tarea_por_id(4)
+                self.assertEqual(gestor.actualizar_lote({4: {'categoria': "Casa"},
+                                                         9999: {'titulo': "no existe"}}), 1)
+                self.assertEqual(vista.categoria, "Casa")
+                self.assertEqual([t.id for t in gestor.filtrar_por_categoria("casa")], [4])
+                self.assertEqual([t.titulo for t in gestor.buscar_por_texto("renombr")], ["renombrada"])
+                self.assertEqual(len(gestor.filtrar_por_estado(EstadoTarea.COMPLETADA)), 1000)
+            finally:
+                almacen_columnar.np = numpy
+        print("Gestor columnar - Lotes por columna: OK")
+
+class TestGestorTareasSQLite(TestGestorTareas):
+    def setUp(self):
+        from models.almacen_sqlite import AlmacenSQLite
+        self.gestor = GestorTareas(almacen=AlmacenSQLite())
+
+    def test_consultas_en_base(self):
+        from models.almacen_sqlite import AlmacenSQLite
+        archivo = "test_consultas.db"
+        try:
+            gestor = GestorTareas(almacen=AlmacenSQLite(archivo))
+            t1 = gestor.crear_tarea("Estudiar", "Examen", "Universidad", prioridad=Prioridad.ALTA)
+            t2 = gestor.crear_tarea("Comprar", "Pan", "personal")
+            t1.actualizar_estado(EstadoTarea.EN_PROGRESO)
+            self.assertTrue(gestor.guardar_tareas(archivo))
+            self.assertFalse(gestor.tiene_cambios_sin_guardar())
+            gestor.almacen.cerrar()
+            del t1, t2
+
+            otro = GestorTareas(almacen=AlmacenSQLite(archivo))
+            self.assertEqual(len(otro.almacen), 2)
+            self.assertEqual(otro.contador_id, 3)
+            self.assertEqual([t.titulo for t in otro.filtrar_por_estado(EstadoTarea.EN_PROGRESO)],
+                             ["Estudiar"])
+            self.assertEqual([t.titulo for t in otro.buscar_por_texto("exam")], ["Estudiar"])
+            self.assertIs(otro.obtener_tarea_por_id(1), otro.filtrar_por_categoria("universidad")[0])
+            otro.almacen.cerrar()
+        finally:
+            for sufijo in ("", "-wal", "-shm"):
+                if os.path.exists(archivo + sufijo):
+                    os.remove(archivo + sufijo)
+        print("Gestor SQLite - Consultas en la base: OK")
+
+    def test_carga_fallida_conserva_indice_texto(self):
+        import sqlite3
+        from persistence.sqlite_persistence import conectar
+        self.test_carga_fallida_conserva_tareas()
+        self.gestor.crear_tarea("gamma nueva")
+        self.assertEqual([t.titulo for t in self.gestor.buscar_por_texto("gamma")], ["gamma nueva"])
+
+        # una base a la que un fallo anterior dejo sin triggers se repara al abrirla
+        archivo = "test_triggers.db"
+        try:
+            with closing(conectar(archivo)) as conexion, conexion:
+                conexion.execute("DROP TRIGGER tareas_fts_ai")
+            with closing(sqlite3.connect(archivo)) as conexion:
+                conexion.execute("INSERT INTO tareas VALUES (1, 'delta', '', 'general', NULL, "
+                                 "3, 2, 0, 0, 'general', 'delta')")
+                conexion.commit()
+            from models.almacen_sqlite import AlmacenSQLite
+            almacen = AlmacenSQLite(archivo)
+            self.assertEqual([t.titulo for t in almacen.buscar_por_texto("delta")], ["delta"])
+            almacen.cerrar()
+        finally:
+            for sufijo in ("", "-wal", "-shm"):
+                if os.path.exists(archivo + sufijo):
+                    os.remove(archivo + sufijo)
+        print("Gestor SQLite - Carga fallida conserva indice de texto: OK")
+
+class TestGestorTareasConcurrente(TestGestorTareas):
+    def setUp(self):
+        from models.gestor_concurrente import GestorTareasConcurrente
+        self.gestor = GestorTareasConcurrente()
+
+    def test_cerrojo_lectores_escritor(self):
+        import threading
+        from models.gestor_concurrente import CerrojoLectoresEscritor
+        cerrojo = CerrojoLectoresEscritor()
+        dentro = threading.Barrier(3, timeout=5)
+
+        def leer():
+            with cerrojo.lectura():
+                # Los tres lectores tienen que estar dentro a la vez
+                dentro.wait()
+
+        hilos = [threading.Thread(target=leer) for _ in range(2)]
+        for hilo in hilos:
+            hilo.start()
+        with cerrojo.lectura():
+            with cerrojo.lectura():
+                dentro.wait()
+        for hilo in hilos:
+            hilo.join(5)
+
+        escrito = threading.Event()
+        def escribir():
+            with cerrojo.escritura():
+                escrito.set()
+        with cerrojo.lectura():
+            self.assertRaises(RuntimeError, cerrojo.adquirir_escritura)
+            hilo = threading.Thread(target=escribir)
+            hilo.start()
+            self.assertFalse(escrito.wait(0.1))
+        self.assertTrue(escrito.wait(5))
+        hilo.join(5)
+        with cerrojo.escritura():
+            with cerrojo.escritura():
+                with cerrojo.lectura():
+                    pass
+        print("Concurrente - Cerrojo lectores/escritor: OK")
+
+    def test_hilos_simultaneos(self):
+        import threading
+        errores = []
+        estados = list(EstadoTarea)
+
+        def escritor(numero):
+            try:
+                for i in range(200):
+                    tarea = self.gestor.crear_tarea(f"Tarea {numero}-{i}", "Desc", "general")
+                    self.gestor.actualizar_tarea(tarea.id, estado=estados[i % 3])
+                    if i % 4 == 0:
+                        self.gestor.eliminar_tarea(tarea.id)
+            except Exception as e:
+                errores.append(e)
+
+        def lector():
+            try:
+                for _ in range(200):
+                    estadisticas = self.gestor.obtener_estadisticas()
+                    self.assertEqual(estadisticas['total'], estadisticas['completadas'] +
+                                     estadisticas['pendientes'] + estadisticas['en_progreso'])
+                    foto = self.gestor.instantanea()
+                    self.assertEqual(len({t.id for t in foto}), len(foto))
+                    self.gestor.consultar(texto="tarea", orden='titulo', limite=10)
+            except Exception as e:
+                errores.append(e)
+
+        hilos = ([threading.Thread(target=escritor, args=(n,)) for n in range(3)] +
+                 [threading.Thread(target=lector) for _ in range(3)])
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join(30)
+        self.assertEqual(errores, [])
+        self.assertEqual(len(self.gestor.obtener_todas_tareas()), 3 * 150)
+        for estado in estados:
+            self.assertEqual(len(self.gestor.filtrar_por_estado(estado)), 150)
+        self.assertEqual(len(self.gestor.buscar_por_texto("tarea")), 3 * 150)
+        print("Concurrente - Hilos simultaneos: OK")
+
+    def test_instantanea(self):
+        t1 = self.gestor.crear_tarea("Uno")
+        foto = self.gestor.instantanea()
+        self.assertIs(self.gestor.instantanea(), foto)
+        t2 = self.gestor.crear_tarea("Dos")
+        self.assertEqual(foto, (t1,))
+        self.assertEqual(self.gestor.instantanea(), (t1, t2))
+        print("Concurrente - Instantanea: OK")
+
+    def test_vista_unica_entre_lectores(self):
+        import threading
+        from models.tarea import Tarea
+        from models.almacen_sqlite import AlmacenSQLite
+        from models.gestor_concurrente import GestorTareasConcurrente
+        desde_campos = Tarea.__dict__['desde_campos']
+        for almacen in ('columnar', AlmacenSQLite()):
+            gestor = GestorTareasConcurrente(almacen=almacen)
+            id_tarea = gestor.crear_tarea("Compartida").id
+            construidas = threading.Barrier(2, timeout=5)
+
+            def construir(cls, *campos):
+                # Los dos lectores construyen su vista antes de guardarla
+                tarea = desde_campos.__func__(cls, *campos)
+                construidas.wait()
+                return tarea
+
+            vistas = []
+            hilos = [threading.Thread(target=lambda: vistas.append(gestor.obtener_tarea_por_id(id_tarea)))
+                     for _ in range(2)]
+            Tarea.desde_campos = classmethod(construir)
+            try:
+                for hilo in hilos:
+                    hilo.start()
+                for hilo in hilos:
+                    hilo.join(5)
+            finally:
+                Tarea.desde_campos = desde_campos
+            self.assertEqual(len(vistas), 2)
+            self.assertIs(vistas[0], vistas[1])
+            self.assertIs(gestor.obtener_tarea_por_id(id_tarea), vistas[0])
+        print("Concurrente - Vista unica entre lectores: OK")
+
+    def test_guardado_no_bloquea_escritores(self):
+        import threading
+        from persistence.jsonl_persistence import JSONLPersistence
+
+        class JSONLLenta(JSONLPersistence):
+            def __init__(self):
+                super().__init__()
+                self.escribiendo = threading.Event()
+                self.puede_escribir = threading.Event()
+            def guardar_tareas(self, tareas, archivo):
+                self.escribiendo.set()
+                self.puede_escribir.wait(5)
+                return super().guardar_tareas(tareas, archivo)
+
+        archivo = "test_concurrente.jsonl"
+        lenta = JSONLLenta()
+        self.gestor.persistence_manager.establecer_estrategia(lenta)
+        t1 = self.gestor.crear_tarea("Uno")
+        resultado = []
+        hilo = threading.Thread(target=lambda: resultado.append(self.gestor.guardar_tareas(archivo)))
+        hilo.start()
+        try:
+            self.assertTrue(lenta.escribiendo.wait(5))
+            # Con el archivo a medio escribir se puede crear y modificar
+            self.gestor.crear_tarea("Dos")
+            self.gestor.actualizar_tarea(t1.id, titulo="Uno bis")
+            self.assertTrue(self.gestor.tiene_cambios_sin_guardar())
+            lenta.puede_escribir.set()
+            hilo.join(5)
+            self.assertEqual(resultado, [True])
+
+            otro = GestorTareas()
+            otro.establecer_persistencia('jsonl')
+            self.assertTrue(otro.cargar_tareas(archivo))
+            self.assertEqual([t.titulo for t in otro.obtener_todas_tareas()], ["Uno"])
+            # El siguiente guardado lleva los cambios hechos durante el anterior
+            self.assertTrue(self.gestor.tiene_cambios_sin_guardar())
+            self.assertTrue(self.gestor.guardar_tareas(archivo))
+            self.assertTrue(otro.cargar_tareas(archivo))
+            self.assertEqual([t.titulo for t in otro.obtener_todas_tareas()], ["Uno bis", "Dos"])
+        finally:
+            lenta.puede_escribir.set()
+            hilo.join(5)
+            os.remove(archivo)
+        print("Concurrente - Guardado sin bloquear escritores: OK")
+
+class TestGestorAsync(unittest.TestCase):
+    def test_operaciones(self):
+        import asyncio
+        from models.gestor_async import AsyncGestorTareas
+
+        async def probar():
+            async with AsyncGestorTareas() as gestor:
+                t1 = await gestor.crear_tarea("Estudiar", "Examen", "Universidad")
+                await gestor.crear_tareas_lote([{'titulo': "Comprar"}, {'titulo': "Leer"}])
+                self.assertTrue(await gestor.actualizar_tarea(t1.id, estado=EstadoTarea.COMPLETADA))
+                self.assertEqual(await gestor.eliminar_lote([3]), 1)
+                # Varias consultas a la vez en el ejecutor
+                resultados = await asyncio.gather(*(gestor.consultar(orden='titulo') for _ in range(5)))
+                for resultado in resultados:
+                    self.assertEqual([t.titulo for t in resultado], ["Comprar", "Estudiar"])
+                estadisticas = await gestor.obtener_estadisticas()
+                self.assertEqual((estadisticas['total'], estadisticas['completadas']), (2, 1))
+                self.assertEqual(await gestor.obtener_tarea_por_id(t1.id), t1)
+
+        asyncio.run(probar())
+        print("Async - Operaciones: OK")
+
+    def test_iteradores(self):
+        import asyncio
+        from models.gestor_async import AsyncGestorTareas
+
+        async def recorrer(iterador, maximo=None):
+            tareas = []
+            async for tarea in iterador:
+                tareas.append(tarea)
+                if maximo is not None and len(tareas) == maximo:
+                    break
+            return tareas
+
+        async def probar(tipo, archivo):
+            async with AsyncGestorTareas() as gestor:
+                await gestor.crear_tareas_lote({'titulo': f"Tarea {i}"} for i in range(25))
+                gestor.gestor.establecer_persistencia(tipo)
+                consulta = await recorrer(gestor.iterar_consulta(orden='titulo', ascendente=False, lote=7))
+                self.assertEqual(consulta, await gestor.consultar(orden='titulo', ascendente=False))
+                self.assertTrue(await gestor.guardar_tareas(archivo))
+                leidas = await recorrer(gestor.iterar_tareas_archivo(archivo, lote=10))
+                self.assertEqual([t.titulo for t in leidas], [f"Tarea {i}" for i in range(25)])
+                self.assertEqual(len(await recorrer(gestor.iterar_tareas_archivo(archivo), 3)), 3)
+                self.assertEqual(await recorrer(gestor.iterar_tareas_archivo("no_existe." + tipo)), [])
+
+        for tipo, archivo in (('jsonl', "test_async.jsonl"), ('sqlite', "test_async.db")):
+            try:
+                asyncio.run(probar(tipo, archivo))
+            finally:
+                for sufijo in ("", "-wal", "-shm"):
+                    if os.path.exists(archivo + sufijo):
+                        os.remove(archivo + sufijo)
+        print("Async - Iteradores: OK")
+
+    def test_bucle_no_se_bloquea(self):
+        import asyncio, time
+        from models.gestor_async import AsyncGestorTareas
+        from persistence.jsonl_persistence import JSONLPersistence
+
+        class JSONLLenta(JSONLPersistence):
+            def guardar_tareas(self, tareas, archivo):
+                time.sleep(0.3)
+                return super().guardar_tareas(tareas, archivo)
+
+        archivo = "test_async_lento.jsonl"
+
+        async def probar():
+            async with AsyncGestorTareas() as gestor:
+                await gestor.crear_tarea("Uno")
+                gestor.gestor.persistence_manager.establecer_estrategia(JSONLLenta())
+                huecos = []
+
+                async def latido():
+                    anterior = time.perf_counter()
+                    for _ in range(20):
+                        await asyncio.sleep(0.01)
+                        ahora = time.perf_counter()
+                        huecos.append(ahora - anterior)
+                        anterior = ahora
+
+                guardado, _ = await asyncio.gather(gestor.guardar_tareas(archivo), latido())
+                self.assertTrue(guardado)
+                self.assertLess(max(huecos), 0.2)
+
+        try:
+            asyncio.run(probar())
+        finally:
+            os.remove(archivo)
+        print("Async - Bucle sin bloqueos: OK")
+
+class RaizFalsa:
+    # Hace de ventana de Tk en las pruebas: guarda lo programado con after y
+    # lo ejecuta cuando la prueba avanza el reloj
+    def __init__(self):
+        import threading
+        self.ahora = 0
+        self.programadas = {}
+        self._numero = 0
+        self._cerrojo = threading.Lock()
+
+    def after(self, ms, funcion, *args):
+        with self._cerrojo:
+            self._numero += 1
+            identificador = f"after#{self._numero}"
+            self.programadas[identificador] = (self.ahora + ms, self._numero, funcion, args)
+            return identificador
+
+    def after_cancel(self, identificador):
+        with self._cerrojo:
+            self.programadas.pop(identificador, None)
+
+    def avanzar(self, ms):
+        self.ahora += ms
+        while True:
+            with self._cerrojo:
+                vencidas = sorted((momento, numero, identificador) for identificador, (momento, numero, _, _)
+                                  in self.programadas.items() if momento <= self.ahora)
+                if not vencidas:
+                    return
+                _, _, funcion, args = self.programadas.pop(vencidas[0][2])
+            funcion(*args)
+
+    def esperar_programada(self, tiempo_maximo=5):
+        # La entrega llega desde el hilo de consultas
+        import time
+        limite = time.monotonic() + tiempo_maximo
+        while not self.programadas:
+            if time.monotonic() > limite:
+                raise AssertionError("No llego ningun resultado")
+            time.sleep(0.001)
+
+
+class VariableFalsa:
+    def __init__(self, valor):
+        self.valor = valor
+
+    def get(self):
+        return self.valor
+
+
+class TestConsultasGUI(unittest.TestCase):
+    def test_solo_la_ultima_consulta(self):
+        import threading
+        from models.gui import ConsultasEnSegundoPlano
+        raiz = RaizFalsa()
+        entregados = []
+        consultas = ConsultasEnSegundoPlano(raiz, entregados.append)
+        empezada, seguir = threading.Event(), threading.Event()
+        canceladas = []
+
+        def lenta(cancelada, valor):
+            empezada.set()
+            seguir.wait(5)
+            canceladas.append(cancelada.is_set())
+            return valor
+
+        consultas.lanzar(lenta, "primera")
+        self.assertTrue(empezada.wait(5))
+        # la segunda descarta a la tercera, que aun no habia empezado
+        consultas.lanzar(lambda cancelada, valor: valor, "segunda")
+        consultas.lanzar(lambda cancelada, valor: valor, "tercera")
+        seguir.set()
+        raiz.esperar_programada()
+        raiz.avanzar(0)
+        self.assertEqual(entregados, ["tercera"])
+        self.assertEqual(canceladas, [True])
+
+        # un resultado ya programado se descarta si entretanto se lanzo otra
+        empezada.clear()
+        seguir.clear()
+        consultas.lanzar(lambda cancelada, valor: valor, "cuarta")
+        raiz.esperar_programada()
+        consultas.lanzar(lenta, "quinta")
+        self.assertTrue(empezada.wait(5))
+        raiz.avanzar(0)
+        self.assertEqual(entregados, ["tercera"])
+        seguir.set()
+        raiz.esperar_programada()
+        raiz.avanzar(0)
+        self.assertEqual(entregados, ["tercera", "quinta"])
+        consultas.cancelar()
+        print("GUI - Solo se entrega la ultima consulta: OK")
+
+    def test_busqueda_tras_pausa(self):
+        from models.gui import TareasApp, ConsultasEnSegundoPlano, RETARDO_BUSQUEDA_MS
+        from models.gestor_concurrente import GestorTareasConcurrente
+        raiz = RaizFalsa()
+        resultados = []
+        # Sin ventana: solo lo que usan la busqueda y el hilo de consultas
+        app = TareasApp.__new__(TareasApp)
+        app.root = raiz
+        app.gestor = GestorTareasConcurrente()
+        app._consultas = ConsultasEnSegundoPlano(raiz, resultados.append)
+        app._busqueda_pendiente = None
+        app.search_var = VariableFalsa("")
+        app.estado_var = VariableFalsa("Todos")
+        app.sort_var = VariableFalsa("titulo")
+        app.gestor.crear_tarea("Estudiar fisica")
+        app.gestor.crear_tarea("Comprar pan")
+
+        for texto in ("e", "es", "est"):
+            app.search_var.valor = texto
+            app._buscar_tras_pausa()
+            raiz.avanzar(RETARDO_BUSQUEDA_MS // 2)
+        self.assertEqual(len(raiz.programadas), 1)
+        self.assertEqual(app.gestor.fallos_cache, 0)
+        raiz.avanzar(RETARDO_BUSQUEDA_MS)
+        raiz.esperar_programada()
+        raiz.avanzar(0)
+        self.assertEqual([[t.titulo for t in tareas] for tareas in resultados], [["Estudiar fisica"]])
+        self.assertEqual(app.gestor.fallos_cache, 1)
+
+        # refrescar a mano anula la busqueda que esperaba la pausa
+        app.search_var.valor = "pan"
+        app._buscar_tras_pausa()
+        app.estado_var.valor = EstadoTarea.PENDIENTE.value
+        app.refresh_tree()
+        raiz.esperar_programada()
+        raiz.avanzar(RETARDO_BUSQUEDA_MS)
+        self.assertEqual([t.titulo for t in resultados[-1]], ["Comprar pan"])
+        self.assertEqual((len(resultados), app.gestor.fallos_cache), (2, 2))
+
+        # una consulta ya cancelada no llega al gestor
+        import threading
+        cancelada = threading.Event()
+        cancelada.set()
+        self.assertIsNone(app._consultar(cancelada, "fisica", "Todos", "id"))
+        self.assertEqual(app.gestor.fallos_cache, 2)
+        app._consultas.cancelar()
+        print("GUI - Busqueda tras pausa: OK")
+
+class TestServidor(unittest.TestCase):
+    def setUp(self):
+        import threading, http.client
+        from models.servidor import crear_servidor
+        self.servidor = crear_servidor(puerto=0)
+        self.hilo = threading.Thread(target=self.servidor.serve_forever)
+        self.hilo.start()
+        self.conexion = http.client.HTTPConnection('127.0.0.1', self.servidor.server_address[1], timeout=5)
+
+    def tearDown(self):
+        self.conexion.close()
+        self.servidor.shutdown()
+        self.servidor.server_close()
+        self.hilo.join(5)
+
+    def pedir(self, metodo, ruta, cuerpo=None, cabeceras=None):
+        import json
+        datos = None if cuerpo is None else json.dumps(cuerpo)
+        self.conexion.request(metodo, ruta, datos, cabeceras or {})
+        respuesta = self.conexion.getresponse()
+        contenido = respuesta.read()
+        return respuesta, json.loads(contenido) if contenido else None
+
+    def test_crud(self):
+        respuesta, tarea = self.pedir('POST', '/tareas', {'titulo': "Estudiar", 'categoria': "Universidad",
+                                                          'fecha_limite': "2030-01-01T10:00",
+                                                          'prioridad': "alta"})
+        self.assertEqual(respuesta.status, 201)
+        self.assertEqual(respuesta.getheader('Location'), f"/tareas/{tarea['id']}")
+        self.assertEqual((tarea['prioridad'], tarea['fecha_limite']), ("alta", "2030-01-01T10:00:00"))
+        socket = self.conexion.sock
+
+        respuesta, leida = self.pedir('GET', f"/tareas/{tarea['id']}")
+        self.assertEqual((respuesta.status, leida), (200, tarea))
+        respuesta, actualizada = self.pedir('PATCH', f"/tareas/{tarea['id']}", {'estado': "completada"})
+        self.assertEqual((respuesta.status, actualizada['estado']), (200, "completada"))
+        respuesta, estadisticas = self.pedir('GET', '/estadisticas')
+        self.assertEqual((estadisticas['total'], estadisticas['completadas']), (1, 1))
+        respuesta, _ = self.pedir('DELETE', f"/tareas/{tarea['id']}")
+        self.assertEqual(respuesta.status, 204)
+        # Todas las peticiones por la misma conexion
+        self.assertIs(self.conexion.sock, socket)
+
+        for metodo, ruta, cuerpo, estado in (('GET', f"/tareas/{tarea['id']}", None, 404),
+                                             ('DELETE', '/tareas/99', None, 404),
+                                             ('GET', '/otra', None, 404),
+                                             ('PUT', '/tareas/1', {}, 405),
+                                             ('POST', '/estadisticas', {'x': 1}, 405),
+                                             ('POST', '/tareas', {'descripcion': "Sin titulo"}, 400),
+                                             ('POST', '/tareas', {'titulo': "X", 'color': "rojo"}, 400),
+                                             ('PATCH', '/tareas/1', {'estado': "rara"}, 400),
+                                             ('GET', '/tareas?orden=color', None, 400),
+                                             ('GET', '/tareas?cursor=xyz', None, 400)):
+            respuesta, _ = self.pedir(metodo, ruta, cuerpo)
+            self.assertEqual(respuesta.status, estado, (metodo, ruta))
+        respuesta, estadisticas = self.pedir('GET', '/estadisticas')
+        self.assertEqual(estadisticas['total'], 0)
+
+        # Un cursor con filtros que no son texto es un error del cliente
+        import base64, json
+        cursor = base64.urlsafe_b64encode(json.dumps([{'texto': 5}, 1, 1]).encode()).decode()
+        respuesta, _ = self.pedir('GET', f"/tareas?cursor={cursor}")
+        self.assertEqual(respuesta.status, 400)
+
+        # Sin Content-Length valido no se sabe donde acaba el cuerpo: 400 y
+        # se cierra la conexion
+        self.conexion.putrequest('POST', '/tareas')
+        self.conexion.putheader('Content-Length', 'mucho')
+        self.conexion.endheaders()
+        respuesta = self.conexion.getresponse()
+        respuesta.read()
+        self.assertEqual((respuesta.status, respuesta.will_close), (400, True))
+        print("Servidor - CRUD: OK")
+
+    def test_escrituras_esperan_al_registro_sin_cerrojo(self):
+        # El servidor no envuelve las escrituras del gestor en otro cerrojo:
+        # la espera al registro de cada una deja escribir a los demas
+        gestor = self.servidor.gestor
+        archivos = ("test_servidor.wal", "test_servidor.json")
+        gestor.activar_registro(*archivos, politica='siempre')
+        try:
+            escritores = []
+            esperar = gestor.registro.esperar
+
+            def esperar_anotando(secuencia):
+                escritores.append(gestor.cerrojo._escritor)
+                esperar(secuencia)
+
+            gestor.registro.esperar = esperar_anotando
+            self.pedir('POST', '/tareas', {'titulo': "Uno"})
+            respuesta, actualizada = self.pedir('PATCH', '/tareas/1', {'titulo': "Uno bis"})
+            self.assertEqual((respuesta.status, actualizada['titulo']), (200, "Uno bis"))
+            respuesta, lote = self.pedir('POST', '/tareas/lote', {'crear': [{'titulo': "Dos"}],
+                                                                  'actualizar': {'1': {'estado': "completada"}},
+                                                                  'eliminar': [2]})
+            self.assertEqual((lote['actualizadas'], lote['eliminadas']), (1, 1))
+            self.assertEqual(lote['creadas'][0]['titulo'], "Dos")
+            self.assertEqual(escritores, [None] * 5)
+        finally:
+            gestor.desactivar_registro()
+            for archivo in archivos:
+                if os.path.exists(archivo):
+                    os.remove(archivo)
+        print("Servidor - Escrituras esperan al registro sin cerrojo: OK")
+
+    def test_paginas_y_etag(self):
+        respuesta, lote = self.pedir('POST', '/tareas/lote',
+                                     {'crear': [{'titulo': f"Tarea {i:02d}"} for i in range(25)]})
+        self.assertEqual(len(lote['creadas']), 25)
+
+        titulos, ruta = [], '/tareas?orden=titulo&ascendente=false&limite=10'
+        while ruta:
+            respuesta, pagina = self.pedir('GET', ruta)
+            self.assertLessEqual(len(pagina['tareas']), 10)
+            titulos.extend(tarea['titulo'] for tarea in pagina['tareas'])
+            ruta = pagina['siguiente'] and f"/tareas?cursor={pagina['siguiente']}&limite=10"
+        self.assertEqual(titulos, [f"Tarea {i:02d}" for i in reversed(range(25))])
+
+        respuesta, _ = self.pedir('GET', '/tareas?texto=tarea')
+        etiqueta = respuesta.getheader('ETag')
+        respuesta, cuerpo = self.pedir('GET', '/tareas?texto=tarea', cabeceras={'If-None-Match': etiqueta})
+        self.assertEqual((respuesta.status, cuerpo), (304, None))
+
+        respuesta, lote = self.pedir('POST', '/tareas/lote', {
+            'actualizar': {'1': {'estado': "completada"}, '2': {'titulo': "Cambiada"}},
+            'eliminar': [3, 4, 99]})
+        self.assertEqual((lote['creadas'], lote['actualizadas'], lote['eliminadas']), ([], 2, 2))
+        respuesta, pagina = self.pedir('GET', '/tareas?texto=tarea', cabeceras={'If-None-Match': etiqueta})
+        self.assertEqual(respuesta.status, 200)
+        self.assertNotEqual(respuesta.getheader('ETag'), etiqueta)
+        self.assertEqual(len(pagina['tareas']), 22)
+        respuesta, pagina = self.pedir('GET', '/tareas?estado=completada')
+        self.assertEqual([tarea['id'] for tarea in pagina['tareas']], [1])
+
+        # Un lote con un elemento no valido no aplica nada
+        respuesta, _ = self.pedir('POST', '/tareas/lote', {'crear': [{'titulo': "Nueva"}],
+                                                           'eliminar': ["x"]})
+        self.assertEqual(respuesta.status, 400)
+        self.assertEqual(len(self.servidor.gestor.obtener_todas_tareas()), 23)
+
+        # El cursor sigue detras de la ultima tarea enviada aunque se borren
+        # tareas entre paginas (las del lote comparten fecha de creacion)
+        respuesta, pagina = self.pedir('GET', '/tareas?orden=fecha_creacion&limite=5')
+        self.assertEqual([tarea['id'] for tarea in pagina['tareas']], [1, 2, 5, 6, 7])
+        for id_tarea in (1, 6):
+            self.pedir('DELETE', f"/tareas/{id_tarea}")
+        respuesta, pagina = self.pedir('GET', f"/tareas?cursor={pagina['siguiente']}&limite=5")
+        self.assertEqual([tarea['id'] for tarea in pagina['tareas']], [8, 9, 10, 11, 12])
+        respuesta, _ = self.pedir('GET', '/tareas?cursor=no-es-un-cursor')
+        self.assertEqual(respuesta.status, 400)
+        print("Servidor - Paginas y ETag: OK")
+
+class TestRegistroEscritura(unittest.TestCase):
+    def setUp(self):
+        self.registro = "test_registro.wal"
+        self.instantanea = "test_registro.json"
+
+    def tearDown(self):
+        for archivo in (self.registro, self.instantanea):
+            if os.path.exists(archivo):
+                os.remove(archivo)
+
+    def estado(self, gestor):
+        return [tarea.__getstate__() for tarea in gestor.obtener_todas_tareas()]
+
+    def recuperar(self, clase=GestorTareas):
+        gestor = clase()
+        reproducidos = gestor.activar_registro(self.registro, self.instantanea)
+        gestor.desactivar_registro()
+        return gestor, reproducidos
+
+    def modificar(self, gestor):
+        t1 = gestor.crear_tarea("Estudiar", "Examen", "Universidad", datetime.now() + timedelta(days=1))
+        t2 = gestor.crear_tarea("Comprar", "Pan", "personal")
+        gestor.crear_tareas_lote({'titulo': f"Lote {i}", 'prioridad': Prioridad.BAJA} for i in range(5))
+        gestor.actualizar_tarea(t1.id, estado=EstadoTarea.EN_PROGRESO, titulo="Estudiar mucho")
+        gestor.actualizar_lote({3: {'estado': EstadoTarea.COMPLETADA}, 4: {'descripcion': "Otra"}})
+        t2.actualizar_estado(EstadoTarea.COMPLETADA)
+        gestor.eliminar_lote([5, 6])
+        gestor.aplicar_prioridad_inteligente()
+        gestor.limpiar_tareas_completadas()
+        gestor.eliminar_tarea(7)
+
+    def test_recuperacion(self):
+        gestor = GestorTareas()
+        gestor.crear_tarea("Anterior al registro")
+        self.assertEqual(gestor.activar_registro(self.registro, self.instantanea, 'siempre'), 0)
+        self.modificar(gestor)
+        esperado = self.estado(gestor)
+        # Caida: el gestor no se guarda ni se cierra
+        otro, reproducidos = self.recuperar()
+        self.assertGreater(reproducidos, 0)
+        self.assertEqual(self.estado(otro), esperado)
+        self.assertEqual(otro.crear_tarea("Nueva").id, gestor.contador_id)
+
+        # Tras el punto de control solo se reproduce lo posterior
+        self.assertTrue(gestor.punto_control())
+        self.assertEqual(os.path.getsize(self.registro), 0)
+        gestor.actualizar_tarea(1, titulo="Cambiada")
+        gestor.tareas = gestor.obtener_todas_tareas()[:2]
+        esperado = self.estado(gestor)
+        otro, reproducidos = self.recuperar()
+        self.assertEqual(self.estado(otro), esperado)
+        gestor.desactivar_registro()
+        print("Registro - Recuperacion: OK")
+
+    def test_reproducir_sobre_instantanea_nueva(self):
+        # Caida entre guardar la instantanea y vaciar el registro
+        gestor = GestorTareas()
+        gestor.activar_registro(self.registro, self.instantanea, 'nunca')
+        self.modificar(gestor)
+        esperado = self.estado(gestor)
+        self.assertTrue(gestor.guardar_tareas(self.instantanea))
+        otro, _ = self.recuperar()
+        self.assertEqual(self.estado(otro), esperado)
+        gestor.desactivar_registro()
+        print("Registro - Reproducir sobre instantanea nueva: OK")
+
+    def test_linea_incompleta(self):
+        gestor = GestorTareas()
+        gestor.activar_registro(self.registro, self.instantanea, 'lote', intervalo=0.01)
+        gestor.crear_tarea("Uno")
+        gestor.crear_tarea("Dos")
+        esperado = self.estado(gestor)
+        gestor.desactivar_registro()
+        with open(self.registro, 'a') as f:
+            f.write('["c",{"id":3,"titu')
+        otro = GestorTareas()
+        self.assertEqual(otro.activar_registro(self.registro, self.instantanea, 'siempre'), 2)
+        self.assertEqual(self.estado(otro), esperado)
+        # Lo anotado tras recuperar no queda pegado a la linea cortada y
+        # sobrevive a una segunda caida
+        otro.crear_tarea("Tres")
+        esperado = self.estado(otro)
+        otro, reproducidos = self.recuperar()
+        self.assertEqual(reproducidos, 3)
+        self.assertEqual(self.estado(otro), esperado)
+        self.assertRaises(ValueError, GestorTareas().activar_registro, self.registro,
+                          self.instantanea, 'a veces')
+        print("Registro - Linea incompleta: OK")
+
+    def test_linea_corrupta(self):
+        gestor = GestorTareas()
+        gestor.activar_registro(self.registro, self.instantanea, 'siempre')
+        for titulo in ("Uno", "Dos", "Tres"):
+            gestor.crear_tarea(titulo)
+        gestor.desactivar_registro()
+        with open(self.registro, 'rb') as f:
+            lineas = f.readlines()
+        # una linea completa ilegible en medio no es una escritura cortada:
+        # no se descarta lo anotado detras
+        lineas[1] = b'["c",{"id":2,"ti' + b'\n'
+        contenido = b''.join(lineas)
+        with open(self.registro, 'wb') as f:
+            f.write(contenido)
+        with self.assertRaisesRegex(ValueError, "corrupto"):
+            GestorTareas().activar_registro(self.registro, self.instantanea)
+        with open(self.registro, 'rb') as f:
+            self.assertEqual(f.read(), contenido)
+        print("Registro - Linea corrupta: OK")
+
+    def test_asignar_tareas_concurrente(self):
+        from models.gestor_concurrente import GestorTareasConcurrente
+        gestor = GestorTareasConcurrente()
+        gestor.activar_registro(self.registro, self.instantanea, 'siempre')
+        try:
+            gestor.crear_tarea("Uno")
+            gestor.crear_tarea("Dos")
+            esperadas = []
+            esperar = gestor.registro.esperar
+
+            def esperar_anotando(secuencia):
+                esperadas.append(secuencia)
+                esperar(secuencia)
+
+            gestor.registro.esperar = esperar_anotando
+            # la asignacion vuelve con el reinicio ya escrito, sin dejar la
+            # espera pendiente para la siguiente escritura del hilo
+            gestor.tareas = gestor.tareas[1:]
+            self.assertEqual(len(esperadas), 1)
+            self.assertIsNone(gestor._local.secuencia)
+            esperado = self.estado(gestor)
+            otro, _ = self.recuperar()
+            self.assertEqual(self.estado(otro), esperado)
+        finally:
+            gestor.desactivar_registro()
+        print("Registro - Asignar tareas en el gestor concurrente: OK")
+
+    def test_error_de_escritura(self):
+        gestor = GestorTareas()
+        gestor.activar_registro(self.registro, self.instantanea, 'siempre')
+        gestor.crear_tarea("Uno")
+        registro = gestor.registro
+        escritura = registro._descriptor
+        registro._descriptor = os.open(self.registro, os.O_RDONLY)
+        try:
+            # Quien confirma se entera de que su cambio no llego al registro
+            self.assertRaises(OSError, gestor.crear_tarea, "Dos")
+        finally:
+            os.close(registro._descriptor)
+            registro._descriptor = escritura
+        # Lo que no se escribio sigue en la cola y sale con la siguiente confirmacion
+        gestor.crear_tarea("Tres")
+        esperado = self.estado(gestor)
+        otro, reproducidos = self.recuperar()
+        self.assertEqual(reproducidos, 3)
+        self.assertEqual(self.estado(otro), esperado)
+        gestor.desactivar_registro()
+        print("Registro - Error de escritura: OK")
+
+    def test_activar_mientras_se_guarda(self):
+        import threading
+        from models.gestor_concurrente import GestorTareasConcurrente
+        reproduciendo, seguir = threading.Event(), threading.Event()
+
+        class Pausado(GestorTareasConcurrente):
+            def _reproducir_registro(self, registros):
+                reproduciendo.set()
+                seguir.wait(5)
+                return super()._reproducir_registro(registros)
+
+        # activar_registro sin instantanea hace un punto de control mientras
+        # otro hilo empieza a guardar: ninguno puede quedar esperando al otro
+        gestor = Pausado()
+        gestor.crear_tarea("Uno")
+        archivo = "test_activar_guardando.json"
+        activar = threading.Thread(target=gestor.activar_registro,
+                                   args=(self.registro, self.instantanea), daemon=True)
+        guardar = threading.Thread(target=gestor.guardar_tareas, args=(archivo,), daemon=True)
+        try:
+            activar.start()
+            self.assertTrue(reproduciendo.wait(5))
+            guardar.start()
+            guardar.join(0.1)
+            seguir.set()
+            activar.join(5)
+            guardar.join(5)
+            self.assertFalse(activar.is_alive() or guardar.is_alive())
+            self.assertTrue(os.path.exists(self.instantanea) and os.path.exists(archivo))
+        finally:
+            seguir.set()
+            if not activar.is_alive():
+                gestor.desactivar_registro()
+            if os.path.exists(archivo):
+                os.remove(archivo)
+        print("Registro - Activar mientras se guarda: OK")
+
+    def test_escritores_concurrentes(self):
+        import threading
+        from models.gestor_concurrente import GestorTareasConcurrente
+        gestor = GestorTareasConcurrente()
+        gestor.activar_registro(self.registro, self.instantanea, 'siempre')
+
+        def escribir(numero):
+            for i in range(50):
+                tarea = gestor.crear_tarea(f"Tarea {numero}-{i}")
+                gestor.actualizar_tarea(tarea.id, estado=EstadoTarea.EN_PROGRESO)
+
+        hilos = [threading.Thread(target=escribir, args=(n,)) for n in range(4)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join(30)
+        self.assertTrue(gestor.punto_control())
+        gestor.eliminar_lote(range(1, 101))
+        esperado = self.estado(gestor)
+        otro, reproducidos = self.recuperar(GestorTareasConcurrente)
+        self.assertEqual(reproducidos, 1)
+        self.assertEqual(self.estado(otro), esperado)
+        self.assertEqual(len(otro.filtrar_por_estado(EstadoTarea.EN_PROGRESO)), 100)
+        gestor.desactivar_registro()
+        print("Registro - Escritores concurrentes: OK")
+
 class TestEstrategias(unittest.TestCase):
     def setUp(self):
         from models.tarea import Tarea
@@ -98,6 +1286,52 @@ class TestEstrategias(unittest.TestCase):
         self.assertEqual(estrategia.calcular_prioridad(self.tarea), Prioridad.ALTA)
         print("Estrategia Manual: OK")
 
+    def test_prioridades_por_lotes(self):
+        from models.tarea import Tarea
+        ahora = datetime.now()
+        tareas = [Tarea("Sin fecha", categoria="Examen final"),
+                  Tarea("Hoy", categoria="proyecto", fecha_limite=ahora + timedelta(hours=3)),
+                  Tarea("Pronto", categoria="otros", fecha_limite=ahora + timedelta(days=2, hours=12)),
+                  Tarea("Lejos", categoria="personal", fecha_limite=ahora + timedelta(days=30))]
+        for estrategia in (PrioridadFechaStrategy(), PrioridadCategoriaStrategy(), PrioridadManualStrategy()):
+            self.assertEqual(estrategia.calcular_prioridades(tareas),
+                             [estrategia.calcular_prioridad(t) for t in tareas])
+        self.assertEqual(PrioridadFechaStrategy().calcular_prioridades(tareas),
+                         [Prioridad.BAJA, Prioridad.ALTA, Prioridad.MEDIA, Prioridad.BAJA])
+
+        gestor = GestorTareas()
+        gestor.crear_tarea("Examen", categoria="universidad", prioridad=Prioridad.BAJA)
+        gestor.establecer_estrategia_prioridad(PrioridadCategoriaStrategy())
+        self.assertTrue(gestor.aplicar_prioridad_inteligente())
+        self.assertEqual(len(gestor.filtrar_por_prioridad(Prioridad.ALTA)), 1)
+        print("Estrategias - Calculo por lotes: OK")
+
+    def test_prioridades_en_paralelo(self):
+        import pickle, warnings
+        from models.tarea import Tarea
+        from strategies.ejecucion_paralela import calcular_prioridades_en_paralelo
+        categorias = ["universidad", "estudio", "otros"]
+        tareas = [Tarea(f"T{i}", categoria=categorias[i % 3]) for i in range(30)]
+        estrategia = PrioridadCategoriaStrategy()
+        esperado = estrategia.calcular_prioridades(tareas)
+
+        for modo in ('hilos', 'procesos'):
+            self.assertEqual(calcular_prioridades_en_paralelo(estrategia, tareas, modo, 3), esperado)
+
+        estrategia.no_serializable = lambda: None
+        with warnings.catch_warnings(record=True) as avisos:
+            warnings.simplefilter('always')
+            resultado = calcular_prioridades_en_paralelo(estrategia, tareas, 'procesos', 3)
+        self.assertEqual(resultado, esperado)
+        self.assertEqual(len(avisos), 1)
+
+        gestor = GestorTareas()
+        tarea = gestor.crear_tarea("Copia", categoria="universidad")
+        copia = pickle.loads(pickle.dumps(tarea))
+        self.assertEqual((copia.id, copia.categoria), (tarea.id, tarea.categoria))
+        self.assertIsNone(copia._observador)
+        print("Estrategias - Calculo en paralelo: OK")
+
 class TestPersistencia(unittest.TestCase):
     def test_json(self):
         gestor = GestorTareas()
@@ -112,6 +1346,391 @@ class TestPersistencia(unittest.TestCase):
             os.remove("test.json")
         print("Persistencia JSON: OK")
 
+    def test_csv(self):
+        archivo = "test_tareas.csv"
+        gestor = GestorTareas()
+        gestor.establecer_persistencia('csv')
+        try:
+            t1 = gestor.crear_tarea("Uno, con coma", "Línea 1\nLínea 2", "universidad",
+                                    fecha_limite=datetime(2030, 1, 1, 12, 30))
+            t1.fecha_actualizacion = t1.fecha_creacion + timedelta(seconds=5)
+            gestor.crear_tarea("Dos", prioridad=Prioridad.ALTA)
+            self.assertTrue(gestor.guardar_tareas(archivo))
+            otro = GestorTareas()
+            otro.establecer_persistencia('csv')
+            self.assertTrue(otro.cargar_tareas(archivo))
+            cargada = otro.obtener_tarea_por_id(t1.id)
+            self.assertEqual((cargada.titulo, cargada.descripcion, cargada.fecha_limite,
+                              cargada.fecha_actualizacion),
+                             (t1.titulo, t1.descripcion, t1.fecha_limite, t1.fecha_actualizacion))
+            self.assertEqual(otro.obtener_tarea_por_id(2).prioridad, Prioridad.ALTA)
+
+            # las columnas se leen por nombre, no por posicion
+            with open(archivo, "w", encoding="utf-8", newline="") as f:
+                f.write("estado,prioridad,id,titulo,descripcion,categoria,fecha_limite,"
+                        "fecha_creacion,fecha_actualizacion\r\n"
+                        "completada,baja,5,Vieja,,general,,2024-01-01T10:00:00,2024-01-02T10:00:00\r\n")
+            self.assertTrue(otro.cargar_tareas(archivo))
+            vieja = otro.obtener_tarea_por_id(5)
+            self.assertEqual((vieja.estado, vieja.prioridad, vieja.fecha_actualizacion),
+                             (EstadoTarea.COMPLETADA, Prioridad.BAJA, datetime(2024, 1, 2, 10)))
+        finally:
+            os.remove(archivo)
+        print("Persistencia CSV: OK")
+
+    def test_compresion(self):
+        from persistence.json_persistence import JSONPersistence
+        from persistence.csv_persistence import CSVPersistence
+        gestor = GestorTareas()
+        for i in range(50):
+            gestor.crear_tarea(f"Tarea {i}", "Descripción repetida", "universidad")
+        casos = [("test_comp.json.gz", JSONPersistence(), b"\x1f\x8b"),
+                 ("test_comp.csv.xz", CSVPersistence(), b"\xfd7zXZ"),
+                 ("test_comp.dat", CSVPersistence(compresion='bz2'), b"BZh")]
+        try:
+            for archivo, estrategia, cabecera in casos:
+                gestor.persistence_manager.establecer_estrategia(estrategia)
+                self.assertTrue(gestor.guardar_tareas(archivo))
+                with open(archivo, "rb") as f:
+                    self.assertEqual(f.read(len(cabecera)), cabecera)
+                otro = GestorTareas()
+                otro.persistence_manager.establecer_estrategia(estrategia)
+                self.assertTrue(otro.cargar_tareas(archivo))
+                self.assertEqual([t.titulo for t in otro.obtener_todas_tareas()],
+                                 [t.titulo for t in gestor.obtener_todas_tareas()])
+                self.assertEqual(otro.obtener_tarea_por_id(1).descripcion, "Descripción repetida")
+        finally:
+            for archivo, _, _ in casos:
+                if os.path.exists(archivo):
+                    os.remove(archivo)
+        with self.assertRaises(ValueError):
+            JSONPersistence(compresion='rar')
+        print("Persistencia - Compresion: OK")
+
+    def test_json_incremental(self):
+        import io, json
+        from persistence.json_persistence import iterar_array_json
+        datos = [{"n": i, "texto": "x" * (i % 7), "lista": [i, "]"]} for i in range(50)]
+        texto = json.dumps(datos, indent=2)
+        for tamano_bloque in (1, 7, 64, 1 << 16):
+            self.assertEqual(list(iterar_array_json(io.StringIO(texto), tamano_bloque)), datos)
+        self.assertEqual(list(iterar_array_json(io.StringIO(" [ ] "))), [])
+
+        gestor = GestorTareas()
+        t1 = gestor.crear_tarea("Uno", "Desc", "general", datetime(2025, 1, 1))
+        gestor.crear_tarea("Dos", "Desc", "universidad")
+        self.assertTrue(gestor.guardar_tareas("test_incremental.json"))
+        try:
+            tareas = list(gestor.iterar_tareas_archivo("test_incremental.json"))
+            self.assertEqual([t.titulo for t in tareas], ["Uno", "Dos"])
+            self.assertEqual(tareas[0].fecha_limite, t1.fecha_limite)
+            self.assertEqual(tareas[0].fecha_creacion, t1.fecha_creacion)
+
+            with open("test_incremental.json", "a", encoding="utf-8") as f:
+                f.write("{")
+            self.assertFalse(gestor.cargar_tareas("test_incremental.json"))
+            self.assertEqual(len(gestor.obtener_todas_tareas()), 2)
+        finally:
+            os.remove("test_incremental.json")
+        print("Persistencia JSON incremental: OK")
+
+    def test_jsonl_anexado_y_compactacion(self):
+        from persistence.jsonl_persistence import JSONLPersistence
+        archivo = "test_registro.jsonl"
+        gestor = GestorTareas()
+        persistencia = JSONLPersistence(minimo_compactacion=3)
+        gestor.persistence_manager.establecer_estrategia(persistencia)
+
+        def lineas():
+            with open(archivo, encoding="utf-8") as f:
+                return f.read().splitlines()
+        try:
+            tareas = [gestor.crear_tarea(f"Tarea {i}") for i in range(3)]
+            self.assertTrue(gestor.guardar_tareas(archivo))
+            self.assertEqual(len(lineas()), 3)
+
+            self.assertTrue(gestor.guardar_tareas(archivo))
+            self.assertEqual(len(lineas()), 3)
+
+            gestor.actualizar_tarea(tareas[0].id, estado=EstadoTarea.COMPLETADA)
+            gestor.eliminar_tarea(tareas[1].id)
+            self.assertTrue(gestor.guardar_tareas(archivo))
+            self.assertEqual(len(lineas()), 5)
+            self.assertIn('"eliminada":true', lineas()[-1])
+
+            with open(archivo, "a", encoding="utf-8") as f:
+                f.write('{"id": 9, "titu')
+            otro = GestorTareas()
+            otro.establecer_persistencia('jsonl')
+            self.assertTrue(otro.cargar_tareas(archivo))
+            self.assertEqual([t.titulo for t in otro.obtener_todas_tareas()], ["Tarea 0", "Tarea 2"])
+            self.assertEqual(otro.obtener_tarea_por_id(tareas[0].id).estado, EstadoTarea.COMPLETADA)
+            # la linea cortada se descarta al cargar y lo anexado despues se lee
+            otro.crear_tarea("Tarea 3")
+            self.assertTrue(otro.guardar_tareas(archivo))
+            self.assertEqual(len(lineas()), 6)
+            releido = GestorTareas()
+            releido.establecer_persistencia('jsonl')
+            self.assertTrue(releido.cargar_tareas(archivo))
+            self.assertEqual([t.titulo for t in releido.obtener_todas_tareas()],
+                             ["Tarea 0", "Tarea 2", "Tarea 3"])
+
+            # se anexa hasta que las lineas obsoletas superan el umbral y se compacta
+            for _ in range(5):
+                tareas[2].actualizar_prioridad(Prioridad.ALTA if tareas[2].prioridad != Prioridad.ALTA
+                                               else Prioridad.BAJA)
+                self.assertTrue(gestor.guardar_tareas(archivo))
+            self.assertEqual(len(lineas()), 3)
+        finally:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+        print("Persistencia JSONL: OK")
+
+    def test_sqlite(self):
+        import sqlite3
+        archivo = "test_tareas.db"
+        gestor = GestorTareas()
+        gestor.establecer_persistencia('sqlite')
+        try:
+            t1 = gestor.crear_tarea("Uno", "Física", fecha_limite=datetime(2030, 1, 1, 12, 30))
+            t2 = gestor.crear_tarea("Dos")
+            self.assertTrue(gestor.guardar_tareas(archivo))
+            t1.actualizar_estado(EstadoTarea.COMPLETADA)
+            gestor.eliminar_tarea(t2.id)
+            gestor.crear_tarea("Tres")
+            self.assertTrue(gestor.guardar_tareas(archivo))
+
+            otro = GestorTareas()
+            otro.establecer_persistencia('sqlite')
+            self.assertTrue(otro.cargar_tareas(archivo))
+            cargadas = otro.obtener_todas_tareas()
+            self.assertEqual([t.titulo for t in cargadas], ["Uno", "Tres"])
+            self.assertEqual(cargadas[0].estado, EstadoTarea.COMPLETADA)
+            self.assertEqual(cargadas[0].fecha_limite, t1.fecha_limite)
+            self.assertEqual(cargadas[0].fecha_creacion, t1.fecha_creacion)
+            self.assertEqual(otro.contador_id, 4)
+
+            # un guardado que falla no deja el indice de texto sin triggers
+            self.assertFalse(otro.persistence_manager.guardar_tareas(cargadas + cargadas, archivo))
+            with closing(sqlite3.connect(archivo)) as conexion:
+                self.assertEqual(conexion.execute(
+                    "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'").fetchone()[0], 3)
+        finally:
+            for sufijo in ("", "-wal", "-shm"):
+                if os.path.exists(archivo + sufijo):
+                    os.remove(archivo + sufijo)
+        print("Persistencia SQLite: OK")
+
+    def test_binaria(self):
+        from models.tarea import Tarea
+        from persistence.binaria_persistence import LectorInstantanea
+        archivo = "test_tareas.bin"
+        gestor = GestorTareas()
+        gestor.establecer_persistencia('binaria')
+        try:
+            t1 = gestor.crear_tarea("Física", "Campo eléctrico", "universidad",
+                                    fecha_limite=datetime(2030, 1, 1, 12, 30), prioridad=Prioridad.ALTA)
+            t2 = gestor.crear_tarea("Dos", "Campo eléctrico", "universidad")
+            t2.actualizar_estado(EstadoTarea.EN_PROGRESO)
+            self.assertTrue(gestor.guardar_tareas(archivo))
+
+            otro = GestorTareas()
+            otro.establecer_persistencia('binaria')
+            self.assertTrue(otro.cargar_tareas(archivo))
+            for original, cargada in zip([t1, t2], otro.obtener_todas_tareas()):
+                self.assertEqual(
+                    [getattr(cargada, campo) for campo in Tarea.__slots__[:9]],
+                    [getattr(original, campo) for campo in Tarea.__slots__[:9]])
+
+            with LectorInstantanea(archivo) as lector:
+                self.assertEqual(len(lector), 2)
+                self.assertEqual(lector[-1].estado, EstadoTarea.EN_PROGRESO)
+                self.assertIs(lector[0].descripcion, lector[1].descripcion)
+
+            with open(archivo, "r+b") as f:
+                f.truncate(os.path.getsize(archivo) - 1)
+            self.assertFalse(otro.cargar_tareas(archivo))
+            # cortes en la tabla de cadenas, en los desplazamientos y archivo vacio
+            for tamano in (os.path.getsize(archivo) - 3, os.path.getsize(archivo) - 40, 0):
+                with open(archivo, "r+b") as f:
+                    f.truncate(tamano)
+                with self.assertRaisesRegex(ValueError, "Instantanea truncada"):
+                    LectorInstantanea(archivo)
+                self.assertFalse(otro.cargar_tareas(archivo))
+        finally:
+            os.remove(archivo)
+        print("Persistencia binaria: OK")
+
+    def test_guardado_atomico(self):
+        archivo = "test_atomico.json"
+        gestor = GestorTareas()
+        gestor.crear_tarea("Uno")
+        try:
+            self.assertTrue(gestor.guardar_tareas(archivo))
+            with open(archivo, encoding="utf-8") as f:
+                contenido = f.read()
+            # una tarea que no se puede serializar hace fallar el guardado a mitad
+            gestor.crear_tarea("Dos").fecha_creacion = None
+            self.assertFalse(gestor.guardar_tareas(archivo))
+            with open(archivo, encoding="utf-8") as f:
+                self.assertEqual(f.read(), contenido)
+            self.assertEqual([nombre for nombre in os.listdir(".") if nombre.startswith(archivo + ".")], [])
+        finally:
+            os.remove(archivo)
+        print("Persistencia - Guardado atomico: OK")
+
+    def test_guardado_asincrono(self):
+        import threading
+        from persistence.jsonl_persistence import JSONLPersistence
+
+        class JSONLLenta(JSONLPersistence):
+            def __init__(self):
+                super().__init__()
+                self.escribiendo = threading.Event()
+                self.puede_escribir = threading.Event()
+                self.llamadas = []
+            def guardar_tareas(self, tareas, archivo):
+                self.escribiendo.set()
+                self.puede_escribir.wait(5)
+                self.llamadas.append(('completo', [t.titulo for t in tareas]))
+                return super().guardar_tareas(tareas, archivo)
+            def guardar_cambios(self, modificadas, eliminadas, archivo):
+                self.llamadas.append(([t.titulo for t in modificadas], eliminadas))
+                return super().guardar_cambios(modificadas, eliminadas, archivo)
+
+        archivo = "test_asincrono.jsonl"
+        gestor = GestorTareas()
+        lenta = JSONLLenta()
+        gestor.persistence_manager.establecer_estrategia(lenta)
+        gestor.persistence_manager.establecer_asincrono(True)
+        try:
+            t1 = gestor.crear_tarea("Uno")
+            self.assertTrue(gestor.guardar_tareas(archivo))
+            self.assertTrue(lenta.escribiendo.wait(5))
+            # la escritura esta bloqueada; estas peticiones se funden en una sola
+            t1.titulo = "Uno bis"
+            self.assertTrue(gestor.guardar_tareas(archivo))
+            gestor.crear_tarea("Dos")
+            self.assertTrue(gestor.guardar_tareas(archivo))
+            t1.titulo = "No guardado"
+            self.assertTrue(gestor.tiene_cambios_sin_guardar())
+            lenta.puede_escribir.set()
+            self.assertTrue(gestor.persistence_manager.esperar_guardados(5))
+            self.assertEqual(lenta.llamadas[0], ('completo', ["Uno"]))
+            self.assertEqual(lenta.llamadas[1:], [('completo', ["Uno bis", "Dos"])])
+
+            self.assertTrue(gestor.guardar_tareas(archivo))
+            gestor.persistence_manager.esperar_guardados(5)
+            self.assertEqual(lenta.llamadas[-1], (["No guardado"], []))
+            otro = GestorTareas()
+            otro.establecer_persistencia('jsonl')
+            self.assertTrue(otro.cargar_tareas(archivo))
+            self.assertEqual([t.titulo for t in otro.obtener_todas_tareas()], ["No guardado", "Dos"])
+        finally:
+            gestor.persistence_manager.esperar_guardados(5)
+            os.remove(archivo)
+        print("Persistencia - Guardado asincrono: OK")
+
+    def test_guardado_incremental(self):
+        from persistence.jsonl_persistence import JSONLPersistence
+
+        class JSONLEspia(JSONLPersistence):
+            def __init__(self):
+                super().__init__()
+                self.llamadas = []
+            def guardar_tareas(self, tareas, archivo):
+                self.llamadas.append(('completo', len(tareas)))
+                return super().guardar_tareas(tareas, archivo)
+            def guardar_cambios(self, modificadas, eliminadas, archivo):
+                self.llamadas.append(([t.id for t in modificadas], eliminadas))
+                return super().guardar_cambios(modificadas, eliminadas, archivo)
+
+        archivo = "test_incremental.jsonl"
+        gestor = GestorTareas()
+        espia = JSONLEspia()
+        gestor.persistence_manager.establecer_estrategia(espia)
+        try:
+            t1 = gestor.crear_tarea("Uno")
+            t2 = gestor.crear_tarea("Dos")
+            self.assertTrue(gestor.tiene_cambios_sin_guardar())
+            self.assertTrue(gestor.guardar_tareas(archivo))
+            self.assertFalse(gestor.tiene_cambios_sin_guardar())
+            self.assertTrue(gestor.guardar_tareas(archivo))
+
+            t1.actualizar_estado(EstadoTarea.EN_PROGRESO)
+            t3 = gestor.crear_tarea("Tres")
+            gestor.eliminar_tarea(t2.id)
+            self.assertTrue(gestor.guardar_tareas(archivo))
+            self.assertEqual(espia.llamadas, [('completo', 2), ([t1.id, t3.id], [t2.id])])
+
+            otro = GestorTareas()
+            otro.establecer_persistencia('jsonl')
+            self.assertTrue(otro.cargar_tareas(archivo))
+            self.assertEqual([(t.titulo, t.estado) for t in otro.obtener_todas_tareas()],
+                             [("Uno", EstadoTarea.EN_PROGRESO), ("Tres", EstadoTarea.PENDIENTE)])
+            self.assertFalse(otro.tiene_cambios_sin_guardar())
+        finally:
+            os.remove(archivo)
+        print("Persistencia - Guardado incremental: OK")
+
+    def test_guardado_asincrono_fallido(self):
+        import threading
+        from persistence.jsonl_persistence import JSONLPersistence
+
+        class JSONLFalla(JSONLPersistence):
+            def __init__(self):
+                super().__init__()
+                self.fallar = False
+                self.llamadas = []
+            def guardar_tareas(self, tareas, archivo):
+                self.llamadas.append('completo')
+                return super().guardar_tareas(tareas, archivo)
+            def guardar_cambios(self, modificadas, eliminadas, archivo):
+                self.llamadas.append([t.titulo for t in modificadas])
+                if self.fallar:
+                    self.fallar = False
+                    return False
+                return super().guardar_cambios(modificadas, eliminadas, archivo)
+
+        archivo = "test_asincrono_fallido.jsonl"
+        gestor = GestorTareas()
+        estrategia = JSONLFalla()
+        manager = gestor.persistence_manager
+        manager.establecer_estrategia(estrategia)
+        fallo = threading.Event()
+        terminado = manager.al_terminar_guardado
+        manager.al_terminar_guardado = lambda archivo, ok: (terminado(archivo, ok), fallo.set())
+        try:
+            t1 = gestor.crear_tarea("Uno")
+            t2 = gestor.crear_tarea("Dos")
+            self.assertTrue(gestor.guardar_tareas(archivo))
+            manager.establecer_asincrono(True)
+
+            estrategia.fallar = True
+            t1.titulo = "Uno bis"
+            self.assertTrue(gestor.guardar_tareas(archivo))
+            # el fallo llega mientras se encola el guardado siguiente
+            encolar = manager.guardar_cambios
+            manager.guardar_cambios = lambda *args: (fallo.wait(5), encolar(*args))[1]
+            t2.titulo = "Dos bis"
+            self.assertTrue(gestor.guardar_tareas(archivo))
+            del manager.guardar_cambios
+            self.assertTrue(manager.esperar_guardados(5))
+            self.assertTrue(gestor.tiene_cambios_sin_guardar())
+
+            self.assertTrue(gestor.guardar_tareas(archivo))
+            self.assertTrue(manager.esperar_guardados(5))
+            self.assertEqual(estrategia.llamadas, ['completo', ["Uno bis"], ["Dos bis"], 'completo'])
+            self.assertFalse(gestor.tiene_cambios_sin_guardar())
+            otro = GestorTareas()
+            otro.establecer_persistencia('jsonl')
+            self.assertTrue(otro.cargar_tareas(archivo))
+            self.assertEqual([t.titulo for t in otro.obtener_todas_tareas()], ["Uno bis", "Dos bis"])
+        finally:
+            manager.esperar_guardados(5)
+            os.remove(archivo)
+        print("Persistencia - Guardado asincrono fallido: OK")
+
 def main():
     print("\nEJECUTANDO PRUEBAS...")
     loader = unittest.TestLoader()
@@ -119,6 +1738,13 @@ def main():
     
     suite.addTests(loader.loadTestsFromTestCase(TestTarea))
     suite.addTests(loader.loadTestsFromTestCase(TestGestorTareas))
+    suite.addTests(loader.loadTestsFromTestCase(TestGestorTareasColumnar))
+    suite.addTests(loader.loadTestsFromTestCase(TestGestorTareasSQLite))
+    suite.addTests(loader.loadTestsFromTestCase(TestGestorTareasConcurrente))
+    suite.addTests(loader.loadTestsFromTestCase(TestGestorAsync))
+    suite.addTests(loader.loadTestsFromTestCase(TestConsultasGUI))
+    suite.addTests(loader.loadTestsFromTestCase(TestServidor))
+    suite.addTests(loader.loadTestsFromTestCase(TestRegistroEscritura))
     suite.addTests(loader.loadTestsFromTestCase(TestEstrategias))
     suite.addTests(loader.loadTestsFromTestCase(TestPersistencia))
     